@@ -3,11 +3,109 @@ Search Visualizer - Python Edition
 A beautiful GUI application to visualize search algorithms
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
 import time
-import math
-from threading import Thread
+
+# Taken before the heavier imports so --profile-startup can report them
+STARTED = time.perf_counter()
+
+import argparse
+import sys
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import os
+import queue
+from array import array
+from itertools import islice, repeat
+from threading import Lock, Thread
+
+import search_engine
+import datasets
+import prepare
+import ranges
+import tracefile
+from renderer import ArrayRenderer, value_bounds
+from race import RacePicker, RaceWindow
+from player import TracePlayer
+from perf import FrameMonitor, PerfHud
+
+IMPORTED = time.perf_counter()
+
+# Rows shown in the batch results table
+MAX_BATCH_ROWS = 5000
+
+# Unsorted datasets up to this size are sorted on screen, one merge pass per frame
+VISUAL_SORT_LIMIT = 1 << 16
+SORT_FRAME_MS = 700
+
+# The legend/pseudocode panels are built after the canvas is first painted,
+# or after this long at the latest
+DETAILS_FALLBACK_MS = 250
+
+# Palettes, built once at import; widgets map option -> palette key via themed()
+THEMES = {
+    'dark': {
+        'bg': '#1a1a2e',
+        'panel': '#2c3e50',
+        'default': '#3498db',
+        'current': '#f39c12',
+        'visited': '#95a5a6',
+        'found': '#2ecc71',
+        'hit': '#22d3ee',
+        'miss': '#f43f5e',
+        'text': '#ecf0f1',
+        'accent': '#e74c3c',
+        'muted_text': '#7f8c8d',
+        'separator': '#34495e',
+        'canvas_bg': '#0f172a',
+        'canvas_text': '#c9d1d9',
+        'index_text': '#7f8c8d',
+        'bar_outline': '#2980b9',
+        'code_bg': '#0d1117',
+        'code_fg': '#c9d1d9',
+        'entry_bg': '#1f2937',
+        'header_bg': '#0b1220',
+        'header_text': '#e5e7eb',
+        'card_bg': '#16233a',
+        'card_border': '#0f1b2d',
+        'primary': '#2563eb',
+        'danger': '#ef4444',
+        'success': '#10b981',
+        'warning': '#f59e0b',
+        'purple': '#8b5cf6',
+        'button_text': '#ffffff'
+    },
+    'light': {
+        'bg': '#f6f7fb',
+        'panel': '#ffffff',
+        'default': '#2b6cb0',
+        'current': '#d97706',
+        'visited': '#9ca3af',
+        'found': '#059669',
+        'hit': '#0891b2',
+        'miss': '#e11d48',
+        'text': '#111827',
+        'accent': '#dc2626',
+        'muted_text': '#6b7280',
+        'separator': '#d1d5db',
+        'canvas_bg': '#ffffff',
+        'canvas_text': '#111827',
+        'index_text': '#6b7280',
+        'bar_outline': '#2563eb',
+        'code_bg': '#f3f4f6',
+        'code_fg': '#111827',
+        'entry_bg': '#ffffff',
+        'header_bg': '#ffffff',
+        'header_text': '#1f2937',
+        'card_bg': '#ffffff',
+        'card_border': '#e5e7eb',
+        'primary': '#2563eb',
+        'danger': '#ef4444',
+        'success': '#10b981',
+        'warning': '#f59e0b',
+        'purple': '#8b5cf6',
+        'button_text': '#ffffff'
+    }
+}
 
 class SearchVisualizer:
     def __init__(self, root):
@@ -16,77 +114,58 @@ class SearchVisualizer:
         self.root.geometry("1400x900")
         self.theme = 'dark'
         # Initialize with dark theme; can be toggled to light
-        self.dark_colors = {
-            'bg': '#1a1a2e',
-            'panel': '#2c3e50',
-            'default': '#3498db',
-            'current': '#f39c12',
-            'visited': '#95a5a6',
-            'found': '#2ecc71',
-            'text': '#ecf0f1',
-            'accent': '#e74c3c',
-            'muted_text': '#7f8c8d',
-            'separator': '#34495e',
-            'canvas_bg': '#0f172a',
-            'canvas_text': '#c9d1d9',
-            'index_text': '#7f8c8d',
-            'bar_outline': '#2980b9',
-            'code_bg': '#0d1117',
-            'code_fg': '#c9d1d9',
-            'entry_bg': '#1f2937',
-            'header_bg': '#0b1220',
-            'header_text': '#e5e7eb',
-            'card_bg': '#16233a',
-            'card_border': '#0f1b2d',
-            'primary': '#2563eb',
-            'danger': '#ef4444',
-            'success': '#10b981',
-            'warning': '#f59e0b',
-            'purple': '#8b5cf6',
-            'button_text': '#ffffff'
-        }
-        self.light_colors = {
-            'bg': '#f6f7fb',
-            'panel': '#ffffff',
-            'default': '#2b6cb0',
-            'current': '#d97706',
-            'visited': '#9ca3af',
-            'found': '#059669',
-            'text': '#111827',
-            'accent': '#dc2626',
-            'muted_text': '#6b7280',
-            'separator': '#d1d5db',
-            'canvas_bg': '#ffffff',
-            'canvas_text': '#111827',
-            'index_text': '#6b7280',
-            'bar_outline': '#2563eb',
-            'code_bg': '#f3f4f6',
-            'code_fg': '#111827',
-            'entry_bg': '#ffffff',
-            'header_bg': '#ffffff',
-            'header_text': '#1f2937',
-            'card_bg': '#ffffff',
-            'card_border': '#e5e7eb',
-            'primary': '#2563eb',
-            'danger': '#ef4444',
-            'success': '#10b981',
-            'warning': '#f59e0b',
-            'purple': '#8b5cf6',
-            'button_text': '#ffffff'
-        }
+        self.dark_colors = THEMES['dark']
+        self.light_colors = THEMES['light']
         self.colors = self.dark_colors.copy()
         self.root.configure(bg=self.colors['bg'])
         self.root.resizable(False, False)
         
         # Data
-        self.array = [3, 7, 12, 18, 24, 31, 45, 52, 67, 89]
+        self.array = array('q', [3, 7, 12, 18, 24, 31, 45, 52, 67, 89])
+        self.array_name = "sample"
+        # value_bounds() of the array when a worker already worked it out
+        self.array_bounds = None
         self.comparisons = 0
         self.is_running = False
         self.animation_speed = 1.0
         
+        # Recorded runs for repeated targets; the version changes with the array
+        self.array_version = 0
+        self.result_cache = search_engine.ResultCache()
+        self.result_cache.invalidate(self.array_version)
+        
+        # Last run shown, as (algorithm, target, SearchResult), for Save Run
+        self.last_run = None
+        
+        # Generated datasets, persisted and prefetched in the background;
+        # created with the first generator dialog
+        self.dataset_cache = None
+        self.generator = None
+        
+        # Worker thread -> Tk thread hand-off; drained once per frame
+        self.render_queue = queue.Queue()
+        self.frame_interval = 16
+        
+        # Per-frame compute/render/idle samples behind the perf HUD
+        self.monitor = FrameMonitor()
+        
+        # Cache model fed with every run's probes; stays warm across runs
+        # on the same array, like a long-running service. Built when the
+        # cache view is first switched on
+        self.cache_sim = None
+        self.cache_view = False
+        
+        # Every run is queued for the SQLite history, opened on the first
+        # record or history view; the GUI works without it
+        self.history = None
+        self.history_failed = False
+        self.history_lock = Lock()
+        # (array_version, fingerprint) of the array the history refers to
+        self.fingerprint = None
+        
         self.setup_ui()
         self.draw_array()
-        self.update_pseudocode()
+        self.root.after(self.frame_interval, self.drain_render_queue)
     
     def set_theme(self, theme: str):
         """Apply theme colors based on selection"""
@@ -101,136 +180,232 @@ class SearchVisualizer:
         if self.is_running:
             messagebox.showinfo("Busy", "Please wait until the visualization completes to change theme.")
             return
-        # Save current UI state
-        selected_algo = self.algorithm_var.get() if hasattr(self, 'algorithm_var') else "Binary Search"
-        current_speed = self.speed_var.get() if hasattr(self, 'speed_var') else 1.0
-        target_text = self.target_entry.get() if hasattr(self, 'target_entry') else ""
         
         # Switch theme
         self.set_theme('light' if self.theme == 'dark' else 'dark')
         
-        # Rebuild UI to apply colors uniformly
-        for child in self.root.winfo_children():
-            child.destroy()
+        # Recolor the existing widgets in place instead of rebuilding them
         self.root.configure(bg=self.colors['bg'])
-        self.setup_ui()
-        
-        # Restore state
-        self.algorithm_var.set(selected_algo)
-        self.speed_var.set(current_speed)
-        self.update_speed(current_speed)
-        self.target_entry.delete(0, tk.END)
-        if target_text:
-            self.target_entry.insert(0, target_text)
-        
-        # Redraw visualization and pseudocode with new theme
-        self.draw_array()
-        self.update_pseudocode()
-        
+        for widget, roles in self.themed_widgets:
+            widget.config(**{option: self.colors[key] for option, key in roles.items()})
+        self.configure_styles()
+        self.theme_btn.config(text="☀️" if self.theme == 'dark' else "🌙")
+        if self.details_built:
+            self.pseudocode_text.tag_configure('active', background=self.colors['separator'])
+        self.renderer.set_colors(self.colors)
+        self.hud.set_colors(self.colors)
+    
+    def themed(self, widget, **roles):
+        """Color widget options from the palette and remember them for theme switches"""
+        widget.config(**{option: self.colors[key] for option, key in roles.items()})
+        self.themed_widgets.append((widget, roles))
+        return widget
+    
+    def configure_styles(self):
+        """Configure ttk styles for the current palette"""
+        style = ttk.Style(self.root)
+        # Switching the ttk theme restyles every ttk widget; only do it once
+        if style.theme_use() != 'clam':
+            try:
+                style.theme_use('clam')
+            except Exception:
+                pass
+        style.configure('TCombobox', 
+                       fieldbackground=self.colors['entry_bg'], 
+                       background=self.colors['panel'],
+                       foreground=self.colors['text'],
+                       arrowcolor=self.colors['text'])
+        style.map('TCombobox', fieldbackground=[('readonly', self.colors['entry_bg'])])
+    
+    def section_label(self, parent, text, size=9):
+        """Small bold caption above a control group"""
+        return self.themed(
+            tk.Label(parent, text=text, font=("Segoe UI", size, "bold")),
+            bg='bg', fg='muted_text'
+        )
+    
     def setup_ui(self):
+        self.themed_widgets = []
+        
         # Header/Navbar with theme toggle
-        header = tk.Frame(self.root, bg=self.colors['header_bg'], height=60)
+        header = self.themed(tk.Frame(self.root, height=60), bg='header_bg')
         header.pack(fill=tk.X)
         header.pack_propagate(False)
         
         # Left side: App icon + title
-        left_header = tk.Frame(header, bg=self.colors['header_bg'])
+        left_header = self.themed(tk.Frame(header), bg='header_bg')
         left_header.pack(side=tk.LEFT, padx=20, pady=10)
         
-        title_label = tk.Label(
-            left_header,
-            text="🔍 Search Visualizer",
-            font=("Segoe UI", 18, "bold"),
-            bg=self.colors['header_bg'],
-            fg=self.colors['header_text']
+        title_label = self.themed(
+            tk.Label(
+                left_header,
+                text="🔍 Search Visualizer",
+                font=("Segoe UI", 18, "bold")
+            ),
+            bg='header_bg', fg='header_text'
         )
         title_label.pack(side=tk.LEFT)
         
-        subtitle_label = tk.Label(
-            left_header,
-            text="Interactive Algorithm Visualizer",
-            font=("Segoe UI", 9),
-            bg=self.colors['header_bg'],
-            fg=self.colors['muted_text']
+        subtitle_label = self.themed(
+            tk.Label(
+                left_header,
+                text="Interactive Algorithm Visualizer",
+                font=("Segoe UI", 9)
+            ),
+            bg='header_bg', fg='muted_text'
         )
         subtitle_label.pack(side=tk.LEFT, padx=(10, 0))
         
         # Right side: Theme toggle
         toggle_text = "☀️" if self.theme == 'dark' else "🌙"
-        theme_btn = tk.Button(
-            header,
-            text=toggle_text,
-            font=("Segoe UI", 16),
-            bg=self.colors['header_bg'],
-            fg=self.colors['header_text'],
-            activebackground=self.colors['header_bg'],
-            activeforeground=self.colors['header_text'],
-            relief=tk.FLAT,
-            bd=0,
-            command=self.toggle_theme,
-            cursor="hand2",
-            padx=10,
-            pady=5
+        self.theme_btn = self.themed(
+            tk.Button(
+                header,
+                text=toggle_text,
+                font=("Segoe UI", 16),
+                relief=tk.FLAT,
+                bd=0,
+                command=self.toggle_theme,
+                cursor="hand2",
+                padx=10,
+                pady=5
+            ),
+            bg='header_bg', fg='header_text',
+            activebackground='header_bg', activeforeground='header_text'
         )
-        theme_btn.pack(side=tk.RIGHT, padx=20)
+        self.theme_btn.pack(side=tk.RIGHT, padx=20)
+        
+        # Perf HUD toggle (also F3); clicking the HUD exports its samples
+        hud_btn = self.themed(
+            tk.Button(
+                header,
+                text="📈",
+                font=("Segoe UI", 16),
+                relief=tk.FLAT,
+                bd=0,
+                command=self.toggle_hud,
+                cursor="hand2",
+                padx=10,
+                pady=5
+            ),
+            bg='header_bg', fg='header_text',
+            activebackground='header_bg', activeforeground='header_text'
+        )
+        hud_btn.pack(side=tk.RIGHT)
+        self.root.bind("<F3>", lambda e: self.toggle_hud())
+        
+        # Cache view toggle (also F4): color probes by simulated L1 hit/miss
+        cache_btn = self.themed(
+            tk.Button(
+                header,
+                text="🧠",
+                font=("Segoe UI", 16),
+                relief=tk.FLAT,
+                bd=0,
+                command=self.toggle_cache_view,
+                cursor="hand2",
+                padx=10,
+                pady=5
+            ),
+            bg='header_bg', fg='header_text',
+            activebackground='header_bg', activeforeground='header_text'
+        )
+        cache_btn.pack(side=tk.RIGHT)
+        self.root.bind("<F4>", lambda e: self.toggle_cache_view())
         
         # Separator line
-        separator = tk.Frame(self.root, bg=self.colors['separator'], height=1)
+        separator = self.themed(tk.Frame(self.root, height=1), bg='separator')
         separator.pack(fill=tk.X)
         
         # Title section (kept for compatibility)
-        title_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        title_frame = self.themed(tk.Frame(self.root), bg='bg')
         title_frame.pack(pady=15)
         
         # Visualization Canvas
-        canvas_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        canvas_frame = self.themed(tk.Frame(self.root), bg='bg')
         canvas_frame.pack(pady=10)
         
-        self.canvas = tk.Canvas(
-            canvas_frame,
-            width=1160,
-            height=200,
-            bg=self.colors['canvas_bg'],
-            highlightthickness=2,
-            highlightbackground=self.colors['card_border']
+        self.canvas = self.themed(
+            tk.Canvas(
+                canvas_frame,
+                width=1160,
+                height=200,
+                highlightthickness=2
+            ),
+            bg='canvas_bg', highlightbackground='card_border'
         )
         self.canvas.pack()
         
+        # Playback bar: transport buttons and a scrubber over the step trace
+        playback_frame = self.themed(tk.Frame(self.root), bg='bg')
+        playback_frame.pack()
+        
+        transport = [
+            ("⏮", "step_back"),
+            ("⏯", "toggle"),
+            ("⏭", "step_forward"),
+            ("⏩", "skip_to_end")
+        ]
+        for column, (symbol, action) in enumerate(transport):
+            self.themed(
+                tk.Button(
+                    playback_frame,
+                    text=symbol,
+                    font=("Segoe UI", 12),
+                    width=3,
+                    relief=tk.FLAT,
+                    cursor="hand2",
+                    command=lambda action=action: getattr(self.player, action)()
+                ),
+                bg='panel', fg='text', activebackground='separator', activeforeground='text'
+            ).grid(row=0, column=column, padx=2)
+        
+        self.scrub_scale = self.themed(
+            tk.Scale(
+                playback_frame,
+                from_=0,
+                to=0,
+                orient=tk.HORIZONTAL,
+                showvalue=False,
+                highlightthickness=0,
+                length=700,
+                command=self.scrub
+            ),
+            bg='bg', troughcolor='panel'
+        )
+        self.scrub_scale.grid(row=0, column=4, padx=(12, 8))
+        
+        self.step_label = self.themed(
+            tk.Label(
+                playback_frame,
+                text="Step 0 / 0",
+                font=("Segoe UI", 10),
+                width=16,
+                anchor="w"
+            ),
+            bg='bg', fg='muted_text'
+        )
+        self.step_label.grid(row=0, column=5)
+        
         # Controls Frame
-        controls_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        controls_frame = self.themed(tk.Frame(self.root), bg='bg')
         controls_frame.pack(pady=20)
         
         # Algorithm Selection
-        algo_frame = tk.Frame(controls_frame, bg=self.colors['bg'])
+        algo_frame = self.themed(tk.Frame(controls_frame), bg='bg')
         algo_frame.grid(row=0, column=0, padx=15)
         
-        tk.Label(
-            algo_frame,
-            text="ALGORITHM",
-            font=("Segoe UI", 9, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack()
+        self.section_label(algo_frame, "ALGORITHM").pack()
         
         self.algorithm_var = tk.StringVar(value="Binary Search")
         
         # Configure ttk style for combobox
-        style = ttk.Style(self.root)
-        try:
-            style.theme_use('clam')
-        except Exception:
-            pass
-        style.configure('TCombobox', 
-                       fieldbackground=self.colors['entry_bg'], 
-                       background=self.colors['panel'],
-                       foreground=self.colors['text'],
-                       arrowcolor=self.colors['text'])
-        style.map('TCombobox', fieldbackground=[('readonly', self.colors['entry_bg'])])
+        self.configure_styles()
         
         self.algorithm_combo = ttk.Combobox(
             algo_frame,
             textvariable=self.algorithm_var,
-            values=["Binary Search", "Linear Search"],
+            values=list(search_engine.ALGORITHMS),
             state="readonly",
             width=18,
             font=("Segoe UI", 11)
@@ -239,310 +414,437 @@ class SearchVisualizer:
         self.algorithm_combo.bind("<<ComboboxSelected>>", lambda e: self.update_pseudocode())
         
         # Target Input
-        target_frame = tk.Frame(controls_frame, bg=self.colors['bg'])
+        target_frame = self.themed(tk.Frame(controls_frame), bg='bg')
         target_frame.grid(row=0, column=1, padx=15)
         
-        tk.Label(
-            target_frame,
-            text="SEARCH TARGET",
-            font=("Segoe UI", 9, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack()
-        
-        self.target_entry = tk.Entry(
-            target_frame,
-            font=("Segoe UI", 11),
-            width=15,
-            bg=self.colors['entry_bg'],
-            fg=self.colors['text'],
-            insertbackground=self.colors['text'],
-            relief=tk.FLAT,
-            bd=2
+        self.section_label(target_frame, "SEARCH TARGET").pack()
+        
+        self.target_entry = self.themed(
+            tk.Entry(
+                target_frame,
+                font=("Segoe UI", 11),
+                width=15,
+                relief=tk.FLAT,
+                bd=2
+            ),
+            bg='entry_bg', fg='text', insertbackground='text'
         )
         self.target_entry.pack(pady=8)
         
         # Control Buttons
-        button_frame = tk.Frame(controls_frame, bg=self.colors['bg'])
+        button_frame = self.themed(tk.Frame(controls_frame), bg='bg')
         button_frame.grid(row=0, column=2, padx=15)
         
-        tk.Label(
-            button_frame,
-            text="CONTROLS",
-            font=("Segoe UI", 9, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack()
+        self.section_label(button_frame, "CONTROLS").pack()
         
-        btn_container = tk.Frame(button_frame, bg=self.colors['bg'])
+        btn_container = self.themed(tk.Frame(button_frame), bg='bg')
         btn_container.pack(pady=8)
         
-        self.start_btn = tk.Button(
-            btn_container,
-            text="▶ Start",
-            font=("Segoe UI", 10, "bold"),
-            bg=self.colors['success'],
-            fg=self.colors['button_text'],
-            command=self.start_visualization,
-            width=10,
-            cursor="hand2",
-            relief=tk.FLAT,
-            activebackground=self.colors['success']
+        self.start_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="▶ Start",
+                font=("Segoe UI", 10, "bold"),
+                command=self.start_visualization,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='success', fg='button_text', activebackground='success'
         )
         self.start_btn.grid(row=0, column=0, padx=4)
         
-        self.reset_btn = tk.Button(
-            btn_container,
-            text="↻ Reset",
-            font=("Segoe UI", 10, "bold"),
-            bg=self.colors['danger'],
-            fg=self.colors['button_text'],
-            command=self.reset_visualization,
-            width=10,
-            cursor="hand2",
-            relief=tk.FLAT,
-            activebackground=self.colors['danger']
+        self.reset_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="↻ Reset",
+                font=("Segoe UI", 10, "bold"),
+                command=self.reset_visualization,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='danger', fg='button_text', activebackground='danger'
         )
         self.reset_btn.grid(row=0, column=1, padx=4)
         
+        self.load_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="📂 Load",
+                font=("Segoe UI", 10, "bold"),
+                command=self.load_dataset,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='primary', fg='button_text', activebackground='primary'
+        )
+        self.load_btn.grid(row=0, column=2, padx=4)
+        
+        self.batch_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="📋 Batch",
+                font=("Segoe UI", 10, "bold"),
+                command=self.load_targets,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='purple', fg='button_text', activebackground='purple'
+        )
+        self.batch_btn.grid(row=0, column=3, padx=4)
+        
+        self.race_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="🏁 Race",
+                font=("Segoe UI", 10, "bold"),
+                command=self.setup_race,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='warning', fg='button_text', activebackground='warning'
+        )
+        self.race_btn.grid(row=0, column=4, padx=4)
+        
+        self.generate_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="🎲 Generate",
+                font=("Segoe UI", 10, "bold"),
+                command=self.open_generator,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='success', fg='button_text', activebackground='success'
+        )
+        self.generate_btn.grid(row=1, column=0, padx=4, pady=(6, 0))
+        
+        # Archive the last run to a trace file, or replay one from disk
+        self.save_run_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="💾 Save Run",
+                font=("Segoe UI", 10, "bold"),
+                command=self.save_trace,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='primary', fg='button_text', activebackground='primary'
+        )
+        self.save_run_btn.grid(row=1, column=1, padx=4, pady=(6, 0))
+        
+        self.replay_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="🎞 Replay",
+                font=("Segoe UI", 10, "bold"),
+                command=self.open_trace,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='purple', fg='button_text', activebackground='purple'
+        )
+        self.replay_btn.grid(row=1, column=2, padx=4, pady=(6, 0))
+        
+        self.history_btn = self.themed(
+            tk.Button(
+                btn_container,
+                text="🕘 History",
+                font=("Segoe UI", 10, "bold"),
+                command=self.open_history,
+                width=10,
+                cursor="hand2",
+                relief=tk.FLAT
+            ),
+            bg='warning', fg='button_text', activebackground='warning'
+        )
+        self.history_btn.grid(row=1, column=3, padx=4, pady=(6, 0))
+        
         # Speed Control
-        speed_frame = tk.Frame(controls_frame, bg=self.colors['bg'])
+        speed_frame = self.themed(tk.Frame(controls_frame), bg='bg')
         speed_frame.grid(row=0, column=3, padx=15)
         
-        tk.Label(
-            speed_frame,
-            text="SPEED",
-            font=("Segoe UI", 9, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack()
+        self.section_label(speed_frame, "SPEED").pack()
         
-        speed_container = tk.Frame(speed_frame, bg=self.colors['bg'])
+        speed_container = self.themed(tk.Frame(speed_frame), bg='bg')
         speed_container.pack(pady=8)
         
-        self.speed_var = tk.DoubleVar(value=1.0)
-        self.speed_scale = tk.Scale(
-            speed_container,
-            from_=0.5,
-            to=3.0,
-            resolution=0.1,
-            orient=tk.HORIZONTAL,
-            variable=self.speed_var,
-            bg=self.colors['bg'],
-            fg=self.colors['text'],
-            highlightthickness=0,
-            length=130,
-            command=self.update_speed,
-            troughcolor=self.colors['panel']
+        # The slider picks a power of two: 0.25x ... 128x
+        self.speed_var = tk.DoubleVar(value=0)
+        self.speed_scale = self.themed(
+            tk.Scale(
+                speed_container,
+                from_=-2,
+                to=7,
+                resolution=1,
+                orient=tk.HORIZONTAL,
+                variable=self.speed_var,
+                showvalue=False,
+                highlightthickness=0,
+                length=130,
+                command=self.update_speed
+            ),
+            bg='bg', fg='text', troughcolor='panel'
         )
         self.speed_scale.grid(row=0, column=0, padx=5)
         
-        self.speed_label = tk.Label(
-            speed_container,
-            text="1.0x",
-            font=("Segoe UI", 10, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['text'],
-            width=4
+        self.speed_label = self.themed(
+            tk.Label(
+                speed_container,
+                text="1x",
+                font=("Segoe UI", 10, "bold"),
+                width=5
+            ),
+            bg='bg', fg='text'
         )
         self.speed_label.grid(row=0, column=1)
         
+        # Legend and pseudocode wait until the canvas has been painted
+        self.details_built = False
+        self.canvas.bind('<Expose>', lambda e: self.root.after_idle(self.setup_details), add='+')
+        self.root.after(DETAILS_FALLBACK_MS, self.setup_details)
+    
+    def setup_details(self):
+        """Legend, stats and pseudocode panels, built after the first paint"""
+        if self.details_built:
+            return
+        self.details_built = True
+        
         # Bottom Section: Legend and Pseudocode side by side
-        bottom_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        bottom_frame = self.themed(tk.Frame(self.root), bg='bg')
         bottom_frame.pack(pady=15, fill=tk.BOTH, expand=True, padx=20)
         
         # Legend (Left side)
-        legend_frame = tk.Frame(bottom_frame, bg=self.colors['bg'])
+        legend_frame = self.themed(tk.Frame(bottom_frame), bg='bg')
         legend_frame.grid(row=0, column=0, padx=20, sticky="nw")
         
-        tk.Label(
-            legend_frame,
-            text="LEGEND",
-            font=("Segoe UI", 10, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack(anchor="w", pady=(0, 12))
+        self.section_label(legend_frame, "LEGEND", size=10).pack(anchor="w", pady=(0, 12))
         
         legends = [
-            ("■", self.colors['current'], "Current"),
-            ("■", self.colors['visited'], "Visited"),
-            ("■", self.colors['found'], "Found"),
-            ("■", self.colors['default'], "Default")
+            ("■", 'current', "Current"),
+            ("■", 'visited', "Visited"),
+            ("■", 'found', "Found"),
+            ("■", 'default', "Default")
         ]
         
         for symbol, color, text in legends:
-            frame = tk.Frame(legend_frame, bg=self.colors['bg'])
+            frame = self.themed(tk.Frame(legend_frame), bg='bg')
             frame.pack(anchor="w", pady=4)
             
-            tk.Label(
-                frame,
-                text=symbol,
-                font=("Segoe UI", 20),
-                bg=self.colors['bg'],
-                fg=color
+            self.themed(
+                tk.Label(frame, text=symbol, font=("Segoe UI", 20)),
+                bg='bg', fg=color
             ).pack(side=tk.LEFT, padx=(0, 12))
             
-            tk.Label(
-                frame,
-                text=text,
-                font=("Segoe UI", 11),
-                bg=self.colors['bg'],
-                fg=self.colors['text']
+            self.themed(
+                tk.Label(frame, text=text, font=("Segoe UI", 11)),
+                bg='bg', fg='text'
             ).pack(side=tk.LEFT)
         
+        # Cache view: visited probes split into L1 hits and misses, on one row
+        frame = self.themed(tk.Frame(legend_frame), bg='bg')
+        frame.pack(anchor="w", pady=4)
+        for color, text in (('hit', "L1 Hit"), ('miss', "Miss")):
+            self.themed(
+                tk.Label(frame, text="■", font=("Segoe UI", 20)),
+                bg='bg', fg=color
+            ).pack(side=tk.LEFT, padx=(0, 12))
+            self.themed(
+                tk.Label(frame, text=text, font=("Segoe UI", 11)),
+                bg='bg', fg='text'
+            ).pack(side=tk.LEFT, padx=(0, 16))
+        
         # Comparisons
-        tk.Label(
-            legend_frame,
-            text="─" * 22,
-            bg=self.colors['bg'],
-            fg=self.colors['separator']
+        self.themed(
+            tk.Label(legend_frame, text="─" * 22),
+            bg='bg', fg='separator'
         ).pack(pady=12)
         
-        self.comparisons_label = tk.Label(
-            legend_frame,
-            text="Comparisons: 0",
-            font=("Segoe UI", 14, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['text']
+        self.comparisons_label = self.themed(
+            tk.Label(
+                legend_frame,
+                text="Comparisons: 0",
+                font=("Segoe UI", 14, "bold")
+            ),
+            bg='bg', fg='text'
         )
         self.comparisons_label.pack(anchor="w")
         
+        self.cache_label = self.themed(
+            tk.Label(
+                legend_frame,
+                text="Cache: 0 hits / 0 misses",
+                font=("Segoe UI", 10)
+            ),
+            bg='bg', fg='muted_text'
+        )
+        self.cache_label.pack(anchor="w", pady=(4, 0))
+        
+        self.range_label = self.themed(
+            tk.Label(
+                legend_frame,
+                text="",
+                font=("Segoe UI", 11)
+            ),
+            bg='bg', fg='text'
+        )
+        self.range_label.pack(anchor="w", pady=(4, 0))
+        
+        # Simulated cache misses and latency of the last run (cache view)
+        self.memory_label = self.themed(
+            tk.Label(
+                legend_frame,
+                text="",
+                font=("Segoe UI", 10)
+            ),
+            bg='bg', fg='muted_text'
+        )
+        self.memory_label.pack(anchor="w", pady=(4, 0))
+        
         # Pseudocode (Right side)
-        code_frame = tk.Frame(bottom_frame, bg=self.colors['bg'])
+        code_frame = self.themed(tk.Frame(bottom_frame), bg='bg')
         code_frame.grid(row=0, column=1, padx=20, sticky="nsew")
         
-        tk.Label(
-            code_frame,
-            text="PSEUDOCODE",
-            font=("Segoe UI", 10, "bold"),
-            bg=self.colors['bg'],
-            fg=self.colors['muted_text']
-        ).pack(anchor="w", pady=(0, 8))
+        self.section_label(code_frame, "PSEUDOCODE", size=10).pack(anchor="w", pady=(0, 8))
         
         # Pseudocode text with border
-        code_container = tk.Frame(code_frame, bg=self.colors['card_border'], bd=1)
+        code_container = self.themed(tk.Frame(code_frame, bd=1), bg='card_border')
         code_container.pack(fill=tk.BOTH, expand=True)
         
-        self.pseudocode_text = tk.Text(
-            code_container,
-            width=60,
-            height=12,
-            font=("Consolas", 10),
-            bg=self.colors['code_bg'],
-            fg=self.colors['code_fg'],
-            wrap=tk.NONE,
-            state=tk.DISABLED,
-            relief=tk.FLAT,
-            padx=10,
-            pady=10
+        self.pseudocode_text = self.themed(
+            tk.Text(
+                code_container,
+                width=60,
+                height=12,
+                font=("Consolas", 10),
+                wrap=tk.NONE,
+                state=tk.DISABLED,
+                relief=tk.FLAT,
+                padx=10,
+                pady=10
+            ),
+            bg='code_bg', fg='code_fg'
         )
         self.pseudocode_text.pack(fill=tk.BOTH, expand=True)
         
         bottom_frame.grid_columnconfigure(1, weight=1)
+        self.update_comparisons(self.comparisons)
+        self.update_cache_label()
+        self.update_pseudocode()
         
     def draw_array(self):
         """Draw array visualization"""
-        self.canvas.delete("all")
-        self.bars = []
-        
-        bar_width = 80
-        bar_height = 60
-        spacing = 20
-        start_x = 50
-        start_y = 100
-        
-        for i, value in enumerate(self.array):
-            x = start_x + i * (bar_width + spacing)
-            y = start_y
-            
-            # Bar
-            bar = self.canvas.create_rectangle(
-                x, y, x + bar_width, y + bar_height,
-                fill=self.colors['default'],
-                outline=self.colors['bar_outline'],
-                width=2
-            )
-            
-            # Value
-            self.canvas.create_text(
-                x + bar_width // 2, y + bar_height // 2,
-                text=str(value),
-                font=("Segoe UI", 16, "bold"),
-                fill=self.colors['canvas_text']
-            )
-            
-            # Index
-            self.canvas.create_text(
-                x + bar_width // 2, y - 15,
-                text=str(i),
-                font=("Segoe UI", 11),
-                fill=self.colors['index_text']
-            )
-            
-            self.bars.append(bar)
-    
-    def update_bar_color(self, index, state):
-        """Update bar color based on state"""
-        color_map = {
-            'current': self.colors['current'],
-            'visited': self.colors['visited'],
-            'found': self.colors['found'],
-            'default': self.colors['default']
-        }
-        self.canvas.itemconfig(self.bars[index], fill=color_map.get(state, self.colors['default']))
-        self.canvas.update()
+        if getattr(self, 'renderer', None) is None:
+            self.renderer = ArrayRenderer(self.canvas, self.colors)
+            self.player = TracePlayer(self.root, self.renderer,
+                                      on_update=self.show_step,
+                                      on_finish=self.finish_run,
+                                      monitor=self.monitor)
+            self.player.speed = self.animation_speed
+            self.hud = PerfHud(self.root, self.canvas, self.monitor, self.colors)
+            self.canvas.tag_bind('hud', '<Button-1>', lambda e: self.export_perf())
+        if self.renderer.array is not self.array:
+            self.renderer.set_array(self.array, self.array_bounds)
+        else:
+            self.renderer.reset()
     
     def update_speed(self, value):
-        """Update animation speed"""
-        self.animation_speed = float(value)
-        self.speed_label.config(text=f"{self.animation_speed:.1f}x")
+        """Update animation speed; takes effect on the next frame"""
+        self.animation_speed = 2 ** float(value)
+        self.speed_label.config(text=f"{self.animation_speed:g}x")
+        if getattr(self, 'player', None) is not None:
+            self.player.speed = self.animation_speed
+    
+    def toggle_hud(self):
+        self.hud.toggle()
+    
+    def toggle_cache_view(self):
+        if self.cache_sim is None:
+            # Imported here, like the other optional panels, to keep startup lean
+            import cachesim
+            self.cache_sim = cachesim.CacheHierarchy()
+        self.cache_view = not self.cache_view
+        self.update_memory_label("Cache view on: probes show L1 hits and misses"
+                                 if self.cache_view else "")
+    
+    def update_memory_label(self, text):
+        if not self.details_built:
+            return
+        self.memory_label.config(text=text)
     
-    def sleep(self, milliseconds):
-        """Sleep with speed adjustment"""
-        time.sleep((milliseconds / 1000) / self.animation_speed)
+    def simulate_cache(self, algorithm, result):
+        """Worker: run a trace's probes through the warm cache model; returns
+        the result with hit/miss-colored probes, and a summary of the misses"""
+        import cachesim
+        report = cachesim.simulate(algorithm, self.array, result.trace, self.cache_sim)
+        shown = result._replace(trace=cachesim.annotate(result.trace, report.served))
+        return shown, cachesim.describe(report, self.cache_sim.levels)
     
-    def update_comparisons(self):
-        """Increment comparison counter"""
-        self.comparisons += 1
+    def export_perf(self):
+        """Save the recorded frame samples as JSON"""
+        path = filedialog.asksaveasfilename(
+            title="Export performance samples",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            self.monitor.export(path, array_size=len(self.array),
+                                algorithm=self.algorithm_var.get(),
+                                speed=self.animation_speed)
+        except OSError as e:
+            messagebox.showerror("Export Failed", str(e))
+    
+    def scrub(self, value):
+        """Seek the player when the scrubber is dragged"""
+        position = int(float(value))
+        if position != self.player.position:
+            self.player.pause()
+            self.player.seek(position)
+    
+    def show_step(self, position, step):
+        """Player callback: reflect the step just shown in the side panels"""
+        self.update_comparisons(step.comparisons if step else 0)
+        self.highlight_line(step.line if step else 0)
+        self.scrub_scale.set(position)
+        self.step_label.config(text=f"Step {position:,} / {len(self.player):,}")
+    
+    def update_comparisons(self, count):
+        """Show the comparison count reported by the engine"""
+        self.comparisons = count
+        if not self.details_built:
+            return
         self.comparisons_label.config(text=f"Comparisons: {self.comparisons}")
     
     def update_pseudocode(self):
         """Update pseudocode display based on selected algorithm"""
+        if not self.details_built:
+            return
         algorithm = self.algorithm_var.get()
         
-        pseudocodes = {
-            "Binary Search": """function binarySearch(arr, target):
-    left = 0
-    right = arr.length - 1
-
-    while left <= right:
-        mid = floor((left + right) / 2)
-
-        if arr[mid] == target:
-            return mid // Found!
-
-        else if arr[mid] < target:
-            left = mid + 1 // Search right
-
-        else:
-            right = mid - 1 // Search left
-
-    return -1 // Not found""",
-            
-            "Linear Search": """function linearSearch(arr, target):
-    for i = 0 to arr.length - 1:
-
-        if arr[i] == target:
-            return i // Found!
-
-    return -1 // Not found"""
-        }
-        
         self.pseudocode_text.config(state=tk.NORMAL)
         self.pseudocode_text.delete(1.0, tk.END)
-        self.pseudocode_text.insert(1.0, pseudocodes.get(algorithm, ""))
+        self.pseudocode_text.insert(1.0, search_engine.PSEUDOCODE.get(algorithm, ""))
+        self.pseudocode_text.tag_configure('active', background=self.colors['separator'])
         self.pseudocode_text.config(state=tk.DISABLED)
     
+    def highlight_line(self, line):
+        """Highlight the pseudocode line executed by the current step"""
+        if not self.details_built:
+            return
+        self.pseudocode_text.tag_remove('active', 1.0, tk.END)
+        if line:
+            self.pseudocode_text.tag_add('active', f"{line}.0", f"{line}.end+1c")
+            self.pseudocode_text.see(f"{line}.0")
+    
     def start_visualization(self):
         """Start the search visualization"""
         if self.is_running:
@@ -553,85 +855,672 @@ class SearchVisualizer:
             messagebox.showwarning("Input Required", "Please enter a target number")
             return
         
+        # Several targets ("31, 45 89") run as a batch instead of an animation;
+        # "low..high" counts the values in a range
+        parts = target_str.replace(',', ' ').split()
         try:
-            target = int(target_str)
+            if not parts:
+                # Only separators, e.g. ","
+                raise ValueError(target_str)
+            spans = [ranges.parse_range(part) for part in parts]
+            if any(spans):
+                spans = [span or (int(part), int(part)) for span, part in zip(spans, parts)]
+            else:
+                targets = [int(part) for part in parts]
         except ValueError:
-            messagebox.showerror("Invalid Input", "Please enter a valid number")
+            messagebox.showerror("Invalid Input", "Please enter a valid number or range (low..high)")
+            return
+        if any(spans):
+            if len(spans) > 1:
+                self.start_range_batch(spans)
+            else:
+                self.start_range(*spans[0])
+            return
+        if len(targets) > 1:
+            self.start_batch(targets)
             return
+        target = targets[0]
         
         self.reset_visualization()
         self.is_running = True
         self.start_btn.config(state=tk.DISABLED)
         
-        # Run in thread to prevent UI freeze
+        # A repeated target replays its cached run, jumping to the final state
+        algorithm = self.algorithm_var.get()
+        cached = self.result_cache.lookup(algorithm, target)
+        self.update_cache_label()
+        if cached is not None and not self.cache_view:
+            self.last_run = (algorithm, target, cached)
+            # Record off the Tk thread, like uncached runs: opening the store
+            # or fingerprinting a big array must not stall the UI
+            thread = Thread(target=self.record_history,
+                            args=("cache", algorithm, [(target, cached.index, cached.comparisons, None)]))
+            thread.daemon = True
+            thread.start()
+            self.play_trace(cached, instant=True)
+            return
+        
+        # Run in thread to prevent UI freeze (the cache model runs there too)
+        thread = Thread(target=self.run_algorithm, args=(algorithm, target, cached))
+        thread.daemon = True
+        thread.start()
+    
+    def run_algorithm(self, algorithm, target, result=None):
+        """Worker: record the step trace (unless cached) and hand it to the player"""
+        version = self.array_version
+        elapsed = None
+        try:
+            if result is None:
+                started = time.perf_counter()
+                result = search_engine.run(algorithm, self.array, target)
+                elapsed = time.perf_counter() - started
+                self.monitor.record_run(algorithm, len(self.array), elapsed, len(result.trace))
+                self.result_cache.store(version, algorithm, target, result)
+            shown, misses = self.simulate_cache(algorithm, result) if self.cache_view else (result, None)
+        except Exception as e:
+            self.render_queue.put(('error', ("Search Failed", str(e))))
+            return
+        self.render_queue.put(('trace', (algorithm, target, result, shown, misses)))
+        # After the hand-off: the first run on an array hashes all of it
+        self.record_history("run" if elapsed is not None else "cache", algorithm,
+                            [(target, result.index, result.comparisons, elapsed)])
+    
+    def start_range(self, low, high):
+        """Animate a range count as two converging frontiers"""
+        self.reset_visualization()
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
+        self.algorithm_var.set("Equal Range")
+        self.update_pseudocode()
+        thread = Thread(target=self.run_range, args=(low, high))
+        thread.daemon = True
+        thread.start()
+    
+    def run_range(self, low, high):
+        """Worker: record both frontiers of a range count"""
+        try:
+            result = ranges.run_range(self.array, low, high)
+            if self.cache_view:
+                result, misses = self.simulate_cache("Equal Range", result)
+                self.render_queue.put(('memory', misses))
+        except Exception as e:
+            self.render_queue.put(('error', ("Search Failed", str(e))))
+        else:
+            self.render_queue.put(('range', (low, high, result)))
+    
+    def show_range(self, low, high, result):
+        """Summarize a range count next to the comparison counter"""
+        text = f"[{low}, {high}]: {result.count:,} values"
+        if result.count:
+            text += f" from index {result.start:,}"
+        self.update_range_label(text)
+        self.play_trace(result)
+    
+    def update_range_label(self, text):
+        if not self.details_built:
+            return
+        self.range_label.config(text=text)
+    
+    def play_trace(self, result, instant=False, starts=None):
+        """Start replaying a recorded trace on the Tk event loop"""
+        self.player.load(result.trace, starts)
+        self.scrub_scale.config(to=len(result.trace))
+        self.show_step(0, None)
+        if instant:
+            self.player.skip_to_end()
+        else:
+            self.player.play()
+    
+    def save_trace(self):
+        """Write the last run to a trace file"""
+        if self.last_run is None:
+            messagebox.showinfo("Nothing to Save", "Run a search first")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save run",
+            defaultextension=".svt",
+            filetypes=[("Search traces", "*.svt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        algorithm, target, result = self.last_run
+        try:
+            tracefile.save(path, result, self.array, algorithm, target)
+        except OSError as e:
+            messagebox.showerror("Save Failed", str(e))
+    
+    def open_trace(self):
+        """Ask for a trace file and replay it without re-running the search"""
+        if self.is_running:
+            return
+        path = filedialog.askopenfilename(
+            title="Replay run",
+            filetypes=[("Search traces", "*.svt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
+        thread = Thread(target=self.read_trace, args=(path,))
+        thread.daemon = True
+        thread.start()
+    
+    def read_trace(self, path):
+        """Worker: map a trace file and work out which array to draw it on"""
+        try:
+            run = tracefile.load(path)
+            # Without the original dataset, draw on the values the run recorded
+            values = None if run.matches(self.array) else run.values()
+        except (OSError, ValueError) as e:
+            self.render_queue.put(('error', ("Replay Failed", f"Could not read {os.path.basename(path)}: {e}")))
+        else:
+            self.render_queue.put(('replay', (run, values, os.path.basename(path))))
+    
+    def start_replay(self, run, values, name):
+        """Play a loaded trace file through the normal player"""
+        header = run.header
+        if values is not None:
+            self.set_array(values, f"{name} (replay)")
+        else:
+            self.reset_visualization()
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
+        if header['algorithm'] in search_engine.ALGORITHMS:
+            self.algorithm_var.set(header['algorithm'])
+            self.update_pseudocode()
+        self.target_entry.delete(0, tk.END)
+        self.target_entry.insert(0, str(header['target']))
+        result = search_engine.SearchResult(header['index'], header['comparisons'], run.trace)
+        self.last_run = (header['algorithm'], header['target'], result)
+        self.play_trace(result, starts=run.starts)
+    
+    def dataset_fingerprint(self):
+        """Content fingerprint of the current array, hashed once per array"""
+        version = self.array_version
+        if self.fingerprint is None or self.fingerprint[0] != version:
+            self.fingerprint = (version, tracefile.fingerprint(self.array))
+        return self.fingerprint[1]
+    
+    def result_store(self):
+        """The run history, opened on first use; None if it cannot be opened"""
+        with self.history_lock:
+            if self.history is None and not self.history_failed:
+                # Imported here: sqlite3 and the store's writer thread are
+                # not needed before the first run
+                import sqlite3
+                import history
+                try:
+                    self.history = history.ResultStore()
+                except (sqlite3.Error, OSError):
+                    self.history_failed = True
+            return self.history
+    
+    def record_history(self, source, algorithm, rows):
+        """Queue (target, index, comparisons, seconds) rows for the run history"""
+        store = self.result_store()
+        if store is None:
+            return
+        import history
+        fingerprint = self.dataset_fingerprint()
+        name, size = self.array_name, len(self.array)
+        store.record_many(
+            history.Run(fingerprint, name, size, algorithm, target, index, comparisons, seconds, source)
+            for target, index, comparisons, seconds in rows
+        )
+    
+    def open_history(self):
+        """Aggregated past runs, queried off the Tk thread"""
+        import history
+        from history_panel import HistoryWindow
+        store = self.result_store()
+        if store is None:
+            messagebox.showinfo("Run History", f"The history database could not be opened:\n{history.default_path()}")
+            return
+        HistoryWindow(self.root, self.colors, store, self.dataset_fingerprint)
+    
+    def update_cache_label(self):
+        if not self.details_built:
+            return
+        cache = self.result_cache
+        self.cache_label.config(text=f"Cache: {cache.hits:,} hits / {cache.misses:,} misses")
+    
+    def finish_run(self):
+        """Re-enable controls once a run (or its playback) is over"""
+        self.is_running = False
+        self.start_btn.config(state=tk.NORMAL)
+    
+    def read_target(self):
+        """Parse a single integer target from the entry, or warn and return None"""
+        target_str = self.target_entry.get().strip()
+        if not target_str:
+            messagebox.showwarning("Input Required", "Please enter a target number")
+            return None
+        try:
+            return int(target_str)
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter a valid number")
+            return None
+    
+    def setup_race(self):
+        """Pick algorithms to race against each other on the current array"""
+        if self.is_running or self.read_target() is None:
+            return
+        RacePicker(self.root, self.colors, list(search_engine.ALGORITHMS), self.start_race)
+    
+    def start_race(self, algorithms):
+        if self.is_running:
+            return
+        target = self.read_target()
+        if target is None:
+            return
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
+        thread = Thread(target=self.run_race, args=(algorithms, target))
+        thread.daemon = True
+        thread.start()
+    
+    def run_race(self, algorithms, target):
+        """Worker: record every contestant's trace, then hand them to the Tk thread"""
+        array = self.array
+        try:
+            results = [(name, search_engine.run(name, array, target)) for name in algorithms]
+            bounds = value_bounds(array)
+        except Exception as e:
+            self.render_queue.put(('error', ("Race Failed", str(e))))
+            return
+        self.render_queue.put(('race', (array, target, results, bounds)))
+        for name, result in results:
+            self.record_history("race", name, [(target, result.index, result.comparisons, None)])
+    
+    def load_targets(self):
+        """Ask for a file of targets and run them all as a batch"""
+        if self.is_running:
+            return
+        path = filedialog.askopenfilename(
+            title="Open batch targets",
+            filetypes=[("Target lists", "*.csv *.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            targets = datasets.load_text(path)
+        except OSError as e:
+            messagebox.showerror("Load Failed", f"Could not read {os.path.basename(path)}: {e}")
+            return
+        if not targets:
+            messagebox.showwarning("No Targets", "The file does not contain any integers")
+            return
+        self.start_batch(targets)
+    
+    def start_batch(self, targets):
+        """Evaluate many targets on a worker thread without animating"""
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
         algorithm = self.algorithm_var.get()
-        thread = Thread(target=self.run_algorithm, args=(algorithm, target))
+        thread = Thread(target=self.run_batch, args=(algorithm, targets))
         thread.daemon = True
         thread.start()
     
-    def run_algorithm(self, algorithm, target):
-        """Execute the selected algorithm"""
+    def run_batch(self, algorithm, targets):
+        """Worker: vectorized batch evaluation, results handed to the Tk thread"""
         try:
-            if algorithm == "Binary Search":
-                self.binary_search(target)
-            elif algorithm == "Linear Search":
-                self.linear_search(target)
+            started = time.perf_counter()
+            result = search_engine.batch(algorithm, self.array, targets)
+            # Only the batch as a whole is timed; each target gets its share
+            per_target = (time.perf_counter() - started) / max(1, len(result.targets))
+            self.render_queue.put(('batch', (algorithm, result)))
+            self.record_history("batch", algorithm, zip(result.targets, result.indices,
+                                                        result.comparisons, repeat(per_target)))
+        except Exception as e:
+            self.render_queue.put(('error', ("Batch Failed", str(e))))
         finally:
-            self.is_running = False
-            self.start_btn.config(state=tk.NORMAL)
+            self.render_queue.put(('done', None))
+    
+    def start_range_batch(self, spans):
+        """Count the values in many ranges on a worker thread"""
+        self.is_running = True
+        self.start_btn.config(state=tk.DISABLED)
+        thread = Thread(target=self.run_range_batch, args=(spans,))
+        thread.daemon = True
+        thread.start()
+    
+    def run_range_batch(self, spans):
+        """Worker: lockstep range counts, results handed to the Tk thread"""
+        try:
+            lows, highs = zip(*spans)
+            result = ranges.batch_range(self.array, lows, highs)
+            self.render_queue.put(('range_batch', result))
+        except Exception as e:
+            self.render_queue.put(('error', ("Batch Failed", str(e))))
+        finally:
+            self.render_queue.put(('done', None))
+    
+    def show_batch_results(self, algorithm, result):
+        """Per-target table of result index and comparison count"""
+        total = len(result.targets)
+        hits = sum(1 for i in result.indices if i >= 0)
+        comparisons = sum(int(c) for c in result.comparisons)
+        self.show_table(
+            f"Batch Results — {algorithm}",
+            (f"{total:,} targets  •  {hits:,} found  •  "
+             f"{comparisons:,} comparisons ({comparisons / total:.2f} per target)"),
+            (("target", "Target"), ("index", "Index"), ("comparisons", "Comparisons")),
+            lambda: zip(result.targets, result.indices, result.comparisons),
+            total
+        )
+    
+    def show_range_results(self, result):
+        """Per-range table of first index, count and comparison count"""
+        total = len(result.lows)
+        matched = sum(int(c) for c in result.counts)
+        comparisons = sum(int(c) for c in result.comparisons)
+        self.show_table(
+            "Range Counts",
+            (f"{total:,} ranges  •  {matched:,} values in range  •  "
+             f"{comparisons:,} comparisons ({comparisons / total:.2f} per range)"),
+            (("low", "Low"), ("high", "High"), ("start", "Start"), ("count", "Count"),
+             ("comparisons", "Comparisons")),
+            lambda: zip(result.lows, result.highs, result.starts, result.counts, result.comparisons),
+            total
+        )
     
-    def binary_search(self, target):
-        """Binary Search Algorithm"""
-        left = 0
-        right = len(self.array) - 1
+    def show_table(self, title, summary, columns, rows, total):
+        """Results window: a summary line and the first rows of a table;
+        rows() yields every row again for the CSV"""
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.configure(bg=self.colors['bg'])
         
-        while left <= right:
-            mid = (left + right) // 2
-            
-            self.update_bar_color(mid, 'current')
-            self.update_comparisons()
-            self.sleep(800)
-            
-            if self.array[mid] == target:
-                self.update_bar_color(mid, 'found')
-                return
-            elif self.array[mid] < target:
-                self.update_bar_color(mid, 'visited')
-                self.sleep(400)
-                left = mid + 1
+        tk.Label(
+            window,
+            text=summary,
+            font=("Segoe UI", 11, "bold"),
+            bg=self.colors['bg'],
+            fg=self.colors['text']
+        ).pack(anchor="w", padx=12, pady=(12, 6))
+        
+        table = ttk.Treeview(window, columns=[key for key, _ in columns], show="headings", height=20)
+        for column, heading in columns:
+            table.heading(column, text=heading)
+            table.column(column, width=140, anchor="e")
+        # A Treeview with a million rows is unusable; the CSV has everything
+        shown = min(total, MAX_BATCH_ROWS)
+        for row in islice(rows(), shown):
+            table.insert("", tk.END, values=[int(value) for value in row])
+        table.pack(fill=tk.BOTH, expand=True, padx=12)
+        
+        footer = tk.Frame(window, bg=self.colors['bg'])
+        footer.pack(fill=tk.X, padx=12, pady=10)
+        if shown < total:
+            tk.Label(
+                footer,
+                text=f"Showing first {shown:,} rows",
+                font=("Segoe UI", 9),
+                bg=self.colors['bg'],
+                fg=self.colors['muted_text']
+            ).pack(side=tk.LEFT)
+        tk.Button(
+            footer,
+            text="💾 Save CSV",
+            font=("Segoe UI", 10, "bold"),
+            bg=self.colors['primary'],
+            fg=self.colors['button_text'],
+            activebackground=self.colors['primary'],
+            relief=tk.FLAT,
+            cursor="hand2",
+            command=lambda: self.save_table(columns, rows)
+        ).pack(side=tk.RIGHT)
+    
+    def save_table(self, columns, rows):
+        """Write a full results table to CSV"""
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not path:
+            return
+        with open(path, 'w') as f:
+            f.write(",".join(key for key, _ in columns) + "\n")
+            for row in rows():
+                f.write(",".join(str(int(value)) for value in row) + "\n")
+    
+    def drain_render_queue(self):
+        """Handle queued worker results on the Tk thread"""
+        try:
+            while True:
+                kind, payload = self.render_queue.get_nowait()
+                if kind == 'trace':
+                    algorithm, target, result, shown, misses = payload
+                    self.last_run = (algorithm, target, result)
+                    if misses is not None:
+                        self.update_memory_label(misses)
+                    self.play_trace(shown)
+                elif kind == 'memory':
+                    self.update_memory_label(payload)
+                elif kind == 'replay':
+                    self.start_replay(*payload)
+                elif kind == 'done':
+                    self.finish_run()
+                elif kind == 'race':
+                    array, target, results, bounds = payload
+                    self.finish_run()
+                    RaceWindow(self.root, self.colors, array, target, results,
+                               lambda: self.animation_speed, bounds)
+                elif kind == 'batch':
+                    self.show_batch_results(*payload)
+                elif kind == 'range':
+                    self.last_run = None
+                    self.show_range(*payload)
+                elif kind == 'range_batch':
+                    self.show_range_results(payload)
+                elif kind == 'dataset':
+                    self.set_array(*payload)
+                elif kind == 'unsorted':
+                    self.confirm_sort(*payload)
+                elif kind == 'sorting':
+                    self.animate_sort(*payload)
+                elif kind == 'progress':
+                    if self.generator is not None:
+                        self.generator.show_progress(*payload)
+                elif kind == 'generated':
+                    spec, values, name, runs, bounds = payload
+                    if self.generator is not None:
+                        self.generator.finished(spec)
+                    if runs > 1:
+                        self.confirm_sort(values, name, runs, bounds)
+                    else:
+                        self.set_array(values, name, bounds)
+                elif kind == 'error':
+                    self.finish_run()
+                    self.load_btn.config(state=tk.NORMAL)
+                    if self.generator is not None:
+                        self.generator.finished()
+                    messagebox.showerror(*payload)
+        except queue.Empty:
+            pass
+        
+        self.root.after(self.frame_interval, self.drain_render_queue)
+    
+    def load_dataset(self):
+        """Ask for a dataset file and load it off the Tk thread"""
+        if self.is_running:
+            return
+        path = filedialog.askopenfilename(
+            title="Open dataset",
+            filetypes=[
+                ("Datasets", "*.csv *.txt *.bin *.i32 *.i64 *.raw"),
+                ("All files", "*.*")
+            ]
+        )
+        if path:
+            self.open_dataset(path)
+    
+    def open_dataset(self, path):
+        """Load a dataset file in the background (also used for --data)"""
+        self.load_btn.config(state=tk.DISABLED)
+        thread = Thread(target=self.read_dataset, args=(path,))
+        thread.daemon = True
+        thread.start()
+    
+    def read_dataset(self, path):
+        """Worker: read a dataset and hand it to the Tk thread"""
+        try:
+            data = datasets.load(path)
+            runs = prepare.count_runs(data)
+            bounds = value_bounds(data)
+        except Exception as e:
+            # Anything else (e.g. MemoryError) would leave Load disabled for good
+            self.render_queue.put(('error', ("Load Failed", f"Could not load {os.path.basename(path)}: {e}")))
+        else:
+            if runs > 1:
+                self.render_queue.put(('unsorted', (data, os.path.basename(path), runs, bounds)))
             else:
-                self.update_bar_color(mid, 'visited')
-                self.sleep(400)
-                right = mid - 1
-        
-        self.sleep(500)
-    
-    def linear_search(self, target):
-        """Linear Search Algorithm"""
-        for i in range(len(self.array)):
-            self.update_bar_color(i, 'current')
-            self.update_comparisons()
-            self.sleep(800)
-            
-            if self.array[i] == target:
-                self.update_bar_color(i, 'found')
+                self.render_queue.put(('dataset', (data, os.path.basename(path), bounds)))
+    
+    def open_generator(self):
+        """Show the dataset generator dialog (one at a time)"""
+        if self.generator is not None and self.generator.window is not None:
+            self.generator.window.lift()
+            return
+        from generator import DatasetCache, GeneratorDialog
+        if self.dataset_cache is None:
+            self.dataset_cache = DatasetCache()
+        self.generator = GeneratorDialog(self.root, self.colors, self.dataset_cache, self.generate_dataset)
+    
+    def generate_dataset(self, spec):
+        """Build the configured dataset in the background"""
+        if self.is_running:
+            self.generator.finished()
+            return
+        self.load_btn.config(state=tk.DISABLED)
+        thread = Thread(target=self.build_dataset, args=(spec,))
+        thread.daemon = True
+        thread.start()
+    
+    def build_dataset(self, spec):
+        """Worker: fetch a generated dataset from the cache, generating it if needed"""
+        from generator import describe
+        try:
+            values = self.dataset_cache.get(
+                spec, lambda fraction, text: self.render_queue.put(('progress', (fraction, text)))
+            )
+            # Unsorted specs get the same sortedness check as loaded files
+            runs = 1 if spec.sorted else prepare.count_runs(values)
+            bounds = value_bounds(values)
+        except (OSError, ValueError, MemoryError) as e:
+            self.render_queue.put(('error', ("Generate Failed", f"Could not generate {describe(spec)}: {e}")))
+        else:
+            self.render_queue.put(('generated', (spec, values, describe(spec), runs, bounds)))
+    
+    def confirm_sort(self, data, name, runs, bounds):
+        """Offer to sort an unsorted dataset instead of searching it wrongly"""
+        answer = messagebox.askyesnocancel(
+            "Unsorted Data",
+            f"{name} is not sorted ({runs:,} ascending runs).\n\n"
+            "Sort it before searching? Choose No to keep the original order; "
+            "then only the linear searches give correct results."
+        )
+        if answer is None:
+            self.load_btn.config(state=tk.NORMAL)
+        elif not answer:
+            self.set_array(data, name, bounds)
+        else:
+            self.is_running = True
+            self.start_btn.config(state=tk.DISABLED)
+            thread = Thread(target=self.sort_dataset, args=(data, name))
+            thread.daemon = True
+            thread.start()
+    
+    def sort_dataset(self, data, name):
+        """Worker: sort with the cheapest strategy, or record merge passes to animate"""
+        try:
+            if len(data) <= VISUAL_SORT_LIMIT:
+                passes = [data] + list(prepare.merge_passes(data))
+                self.render_queue.put(('sorting', (passes, name)))
                 return
-            else:
-                self.update_bar_color(i, 'visited')
-                self.sleep(300)
-        
-        self.sleep(500)
+            prepared = prepare.prepare(data)
+        except (OSError, ValueError, MemoryError) as e:
+            self.render_queue.put(('error', ("Sort Failed", f"Could not sort {name}: {e}")))
+        else:
+            values = prepared.values
+            self.render_queue.put(('dataset', (values, f"{name} (sorted: {prepared.strategy})",
+                                               value_bounds(values))))
+    
+    def animate_sort(self, passes, name, i=0):
+        """Show one natural merge sort pass per frame, then search the result"""
+        if i < len(passes) - 1:
+            self.renderer.set_array(passes[i])
+            self.root.after(SORT_FRAME_MS, lambda: self.animate_sort(passes, name, i + 1))
+        else:
+            self.set_array(passes[-1], f"{name} (sorted)")
+    
+    def set_array(self, array, name=None, bounds=None):
+        """Replace the searched array and redraw from scratch; bounds is its
+        value_bounds() when a worker already computed it"""
+        self.array = array
+        self.array_bounds = bounds
+        self.array_name = name or "untitled"
+        self.array_version += 1
+        self.last_run = None
+        self.result_cache.invalidate(self.array_version)
+        if self.cache_sim is not None:
+            self.cache_sim.reset()
+        self.load_btn.config(state=tk.NORMAL)
+        if name:
+            self.root.title(f"🔍 Search Visualizer — {name} ({len(array):,} values)")
+        self.reset_visualization()
     
     def reset_visualization(self):
         """Reset visualization to initial state"""
-        self.comparisons = 0
-        self.comparisons_label.config(text="Comparisons: 0")
+        if getattr(self, 'player', None) is not None:
+            self.player.stop()
+            self.scrub_scale.config(to=0)
+            self.step_label.config(text="Step 0 / 0")
+        self.finish_run()
+        self.update_comparisons(0)
+        self.update_range_label("")
+        self.highlight_line(0)
         self.draw_array()
 
 
-def main():
+def profile_startup(app, built):
+    """Print import, window build and first-paint times to stderr"""
+    marks = {}
+    
+    def report():
+        now = time.perf_counter()
+        print(f"startup: imports {(IMPORTED - STARTED) * 1000:.1f} ms, "
+              f"window built {(built - IMPORTED) * 1000:.1f} ms, "
+              f"first paint {(marks['painted'] - built) * 1000:.1f} ms, "
+              f"panels done {(now - marks['painted']) * 1000:.1f} ms, "
+              f"total {(now - STARTED) * 1000:.1f} ms", file=sys.stderr)
+    
+    def painted(event):
+        if 'painted' not in marks:
+            marks['painted'] = time.perf_counter()
+            # Queued behind setup_details(), which the same event scheduled
+            app.root.after_idle(lambda: app.root.after_idle(report))
+    
+    app.canvas.bind('<Expose>', painted, add='+')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive search algorithm visualizer")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print import, build and first-paint times")
+    parser.add_argument('--data', help="dataset file to open on startup")
+    parser.add_argument('--algorithm', choices=list(search_engine.ALGORITHMS), metavar='ALGORITHM')
+    parser.add_argument('--target', type=int)
+    args = parser.parse_args(argv)
+    
     root = tk.Tk()
     app = SearchVisualizer(root)
+    if args.algorithm:
+        app.algorithm_var.set(args.algorithm)
+        app.update_pseudocode()
+    if args.target is not None:
+        app.target_entry.insert(0, str(args.target))
+    if args.data:
+        app.open_dataset(args.data)
+    if args.profile_startup:
+        profile_startup(app, time.perf_counter())
     root.mainloop()
 
 
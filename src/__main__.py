@@ -0,0 +1,7 @@
+"""Lets the source directory run as a whole: python src search ..."""
+
+import sys
+
+from cli import main
+
+sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Scripting API
+Headless entry points for scripts and pipelines: resolve algorithm
+names, load (and if needed sort) datasets, stream search results as
+plain dicts, count values in ranges, run benchmarks, query the run
+history and launch the GUI pre-loaded with a dataset. Nothing here imports Tk unless launch_gui() is called.
+
+    import api
+    values = api.load('data.i64')
+    for row in api.search(values, [31, 45, 89], 'binary'):
+        print(row['target'], row['index'], row['comparisons'])
+"""
+
+import importlib.util
+import os
+import re
+from itertools import islice
+
+import benchmark
+import datasets
+import history
+import parallel
+import prepare
+import ranges
+import search_engine
+import tracefile
+
+# Algorithms that give correct answers on unsorted data
+UNSORTED_OK = ('Linear Search', 'Block Linear Search', 'Parallel Linear Search')
+
+# Targets evaluated per vectorized batch while streaming
+CHUNK = 1 << 14
+
+GUI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Search-Visualizer.py')
+
+
+def _normalize(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower().replace('search', ''))
+
+
+def resolve(name):
+    """Registry name for a loose spelling such as 'binary' or 'b-tree'"""
+    if name in search_engine.ALGORITHMS:
+        return name
+    key = _normalize(name)
+    matches = [n for n in search_engine.ALGORITHMS if _normalize(n) == key]
+    if not matches:
+        matches = [n for n in search_engine.ALGORITHMS if _normalize(n).startswith(key)]
+    if len(matches) != 1:
+        choices = ", ".join(search_engine.ALGORITHMS)
+        raise ValueError(f"{'Ambiguous' if matches else 'Unknown'} algorithm: {name} (choose from {choices})")
+    return matches[0]
+
+
+def algorithms():
+    return list(search_engine.ALGORITHMS)
+
+
+def load(path, sort=False):
+    """Load a dataset file; with sort=True make it searchable if it is not sorted"""
+    values = datasets.load(path)
+    if sort:
+        values = prepare.prepare(values).values
+    return values
+
+
+def search(values, targets, algorithm="Binary Search", record=False, check_sorted=True, workers=None):
+    """Yield {'algorithm', 'target', 'index', 'comparisons'} per target, in order
+
+    targets may be any iterable, including a lazy stream. With record=True
+    each row also carries the full list of step events. workers > 1 runs
+    Parallel Linear Search in that many processes over shared memory; its
+    comparison counts then depend on how the workers were scheduled.
+    """
+    algorithm = resolve(algorithm)
+    if check_sorted and algorithm not in UNSORTED_OK and not prepare.is_sorted(values):
+        raise ValueError(f"{algorithm} needs sorted data (load with sort=True, or pass --sort)")
+    # Validated eagerly above; the rows themselves are produced lazily
+    if workers and workers > 1 and algorithm == 'Parallel Linear Search' and not record:
+        return _scanner_rows(values, targets, workers)
+    return _rows(values, targets, algorithm, record)
+
+
+def _scanner_rows(values, targets, workers):
+    with parallel.ParallelScanner(values, workers) as scanner:
+        for target in targets:
+            index, comparisons = scanner.search(target)
+            yield {
+                'algorithm': 'Parallel Linear Search',
+                'target': int(target),
+                'index': int(index),
+                'comparisons': int(comparisons)
+            }
+
+
+def _rows(values, targets, algorithm, record):
+    if record:
+        for target in targets:
+            result = search_engine.run(algorithm, values, target)
+            yield {
+                'algorithm': algorithm,
+                'target': int(target),
+                'index': int(result.index),
+                'comparisons': int(result.comparisons),
+                'steps': [step._asdict() for step in result.trace]
+            }
+        return
+    targets = iter(targets)
+    # Built on the first chunk: any index over values is shared by all chunks
+    evaluate = None
+    while True:
+        chunk = list(islice(targets, CHUNK))
+        if not chunk:
+            return
+        if evaluate is None:
+            evaluate = search_engine.batcher(algorithm, values)
+        result = evaluate(chunk)
+        for target, index, comparisons in zip(result.targets, result.indices, result.comparisons):
+            yield {
+                'algorithm': algorithm,
+                'target': int(target),
+                'index': int(index),
+                'comparisons': int(comparisons)
+            }
+
+
+def count(values, spans, record=False, check_sorted=True):
+    """Yield {'low', 'high', 'start', 'count', 'comparisons'} per (low, high) span
+
+    start is the first index with a value >= low; with record=True each row
+    also carries the step events of both converging frontiers.
+    """
+    if check_sorted and not prepare.is_sorted(values):
+        raise ValueError("Range counts need sorted data (load with sort=True, or pass --sort)")
+    return _range_rows(values, spans, record)
+
+
+def _range_rows(values, spans, record):
+    if record:
+        for low, high in spans:
+            result = ranges.run_range(values, low, high)
+            yield {
+                'low': int(low),
+                'high': int(high),
+                'start': int(result.start),
+                'count': int(result.count),
+                'comparisons': int(result.comparisons),
+                'steps': [step._asdict() for step in result.trace]
+            }
+        return
+    spans = iter(spans)
+    while True:
+        chunk = list(islice(spans, CHUNK))
+        if not chunk:
+            return
+        lows, highs = zip(*chunk)
+        result = ranges.batch_range(values, lows, highs)
+        for row in zip(*result):
+            yield dict(zip(('low', 'high', 'start', 'count', 'comparisons'), map(int, row)))
+
+
+def run_benchmark(**options):
+    """benchmark.run() with the same keyword options; returns the result rows"""
+    if 'algorithms' in options and options['algorithms']:
+        options['algorithms'] = [resolve(name) for name in options['algorithms']]
+    return benchmark.run(**options)
+
+
+def run_history(path=None, algorithm=None, values=None):
+    """Aggregated past runs, one dict per dataset and algorithm (see
+    history.Aggregate); values limits them to that dataset"""
+    store = history.ResultStore(path)
+    try:
+        fingerprint = tracefile.fingerprint(values) if values is not None else None
+        rows = store.summary(fingerprint, resolve(algorithm) if algorithm else None)
+    finally:
+        store.close()
+    return [row._asdict() for row in rows]
+
+
+def recent_runs(path=None, limit=100, values=None):
+    """The latest recorded runs, newest first, as dicts"""
+    store = history.ResultStore(path)
+    try:
+        return store.recent(limit, tracefile.fingerprint(values) if values is not None else None)
+    finally:
+        store.close()
+
+
+def launch_gui(data=None, algorithm=None, target=None, profile_startup=False):
+    """Open the visualizer (blocks until the window is closed)"""
+    import tkinter
+    spec = importlib.util.spec_from_file_location('search_visualizer', GUI_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    argv = []
+    if data:
+        argv += ['--data', data]
+    if algorithm:
+        argv += ['--algorithm', resolve(algorithm)]
+    if target is not None:
+        argv += ['--target', str(target)]
+    if profile_startup:
+        argv.append('--profile-startup')
+    try:
+        return module.main(argv)
+    except tkinter.TclError as e:
+        raise RuntimeError(f"Cannot open the visualizer: {e}") from None
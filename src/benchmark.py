@@ -0,0 +1,313 @@
+"""
+Benchmark Suite
+Sweeps array sizes, key distributions and hit ratios for every registered
+search algorithm and records wall time, comparisons and memory. With
+--cache, each algorithm's probes also run through the cache simulator for
+modelled misses and latency, and with --history every query is also
+appended to the SQLite run history. Results go to JSON and CSV plus a
+summary table on stdout.
+
+    python src/benchmark.py --sizes 10 1000 100000 --out results/bench
+    python src/benchmark.py --sizes 1000000 --cache --cache-level L1:48K:12:1 L2:2M:16:5
+    python src/benchmark.py --sizes 1000 100000 --history
+"""
+
+import argparse
+import csv
+import json
+import platform
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import cachesim
+import datasets
+import history
+import layouts
+import search_engine
+import tracefile
+
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_HIT_RATIOS = [1.0, 0.5, 0.0]
+DEFAULT_QUERIES = 200
+
+# Stop an algorithm's query loop once it has used this much wall time, so
+# linear search on 10^7 keys does not stall the whole sweep
+DEFAULT_TIME_BUDGET = 5.0
+
+# Full scans record one trace step per element, so above this size their
+# cache simulation is skipped (a single query would trace the whole array)
+CACHE_SCAN_LIMIT = 1 << 20
+SCAN_ALGORITHMS = ('Linear Search', 'Block Linear Search', 'Parallel Linear Search')
+
+FIELDS = [
+    'size', 'distribution', 'hit_ratio', 'algorithm', 'queries',
+    'hits', 'mean_comparisons', 'max_comparisons', 'mean_us', 'total_s', 'build_s',
+    'dataset_bytes', 'peak_rss_kb', 'cache_misses', 'memory_accesses', 'modelled_ns'
+]
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure(algorithm, values, targets, time_budget, record=None):
+    """Run targets one by one (no tracing) until done or out of time;
+    record(algorithm, runs) receives (target, index, comparisons, seconds)
+    for every query once the timed loop is over"""
+    search = search_engine.ALGORITHMS[algorithm]
+    total_comparisons = 0
+    max_comparisons = 0
+    hits = 0
+    queries = 0
+    runs = [] if record is not None else None
+    start = last = time.perf_counter()
+    for target in targets:
+        index, comparisons = search(values, target)
+        queries += 1
+        hits += index >= 0
+        total_comparisons += comparisons
+        max_comparisons = max(max_comparisons, comparisons)
+        now = time.perf_counter()
+        if runs is not None:
+            runs.append((target, index, comparisons, now - last))
+            last = now
+        if now - start > time_budget:
+            break
+    elapsed = time.perf_counter() - start
+    if record is not None:
+        record(algorithm, runs)
+    return {
+        'queries': queries,
+        'hits': hits,
+        'mean_comparisons': total_comparisons / queries,
+        'max_comparisons': max_comparisons,
+        'mean_us': elapsed / queries * 1e6,
+        'total_s': elapsed
+    }
+
+
+def measure_cache(algorithm, values, targets, cache, time_budget):
+    """Mean simulated first-level misses, memory accesses and latency per
+    query, with one warm hierarchy shared by all targets; None for full
+    scans of arrays above CACHE_SCAN_LIMIT"""
+    if algorithm in SCAN_ALGORITHMS and len(values) > CACHE_SCAN_LIMIT:
+        return {'cache_misses': None, 'memory_accesses': None, 'modelled_ns': None}
+    hierarchy = cachesim.CacheHierarchy(cache.levels, cache.line_size, cache.memory_latency)
+    misses = memory = latency = 0
+    queries = 0
+    start = time.perf_counter()
+    for target in targets:
+        # Checked before tracing the next query, which may be slow itself
+        if queries and time.perf_counter() - start > time_budget:
+            break
+        result = search_engine.run(algorithm, values, target)
+        report = cachesim.simulate(algorithm, values, result.trace, hierarchy)
+        queries += 1
+        misses += report.misses[0]
+        memory += report.misses[-1]
+        latency += report.latency
+    return {
+        'cache_misses': misses / queries,
+        'memory_accesses': memory / queries,
+        'modelled_ns': latency / queries
+    }
+
+
+def run(sizes=DEFAULT_SIZES, distributions=datasets.DISTRIBUTIONS,
+        hit_ratios=DEFAULT_HIT_RATIOS, algorithms=None, queries=DEFAULT_QUERIES,
+        seed=0, time_budget=DEFAULT_TIME_BUDGET, progress=None, cache=None, store=None):
+    """Run the sweep and return a list of result rows (dicts with FIELDS)
+
+    cache, a CacheHierarchy, adds simulated misses and latency for its
+    configuration (each algorithm starts from a cold copy). store, a
+    history.ResultStore, receives every timed query.
+    """
+    algorithms = algorithms or list(search_engine.ALGORITHMS)
+    rows = []
+    for size in sizes:
+        for distribution in distributions:
+            values = datasets.as_array(datasets.generate(distribution, size, seed))
+            dataset_bytes = len(values) * values.itemsize
+            record = None
+            if store is not None:
+                record = _recorder(store, tracefile.fingerprint(values),
+                                   f"{distribution} (seed {seed})", size)
+            for hit_ratio in hit_ratios:
+                targets = datasets.sample_targets(values, queries, hit_ratio, seed)
+                for algorithm in algorithms:
+                    row = {
+                        'size': size,
+                        'distribution': distribution,
+                        'hit_ratio': hit_ratio,
+                        'algorithm': algorithm
+                    }
+                    # Precomputed layouts are built once, outside the timed loop
+                    build_s = layouts.prepare(algorithm, values)
+                    row.update(measure(algorithm, values, targets, time_budget, record))
+                    row['build_s'] = build_s
+                    row['dataset_bytes'] = dataset_bytes
+                    row['peak_rss_kb'] = peak_rss_kb()
+                    if cache is not None:
+                        row.update(measure_cache(algorithm, values, targets, cache, time_budget))
+                    rows.append(row)
+                    if progress is not None:
+                        progress(row)
+            layouts.clear()
+            del values
+    return rows
+
+
+def _recorder(store, fingerprint, name, size):
+    def record(algorithm, runs):
+        store.record_many(
+            history.Run(fingerprint, name, size, algorithm, target, index, comparisons, seconds, 'bench')
+            for target, index, comparisons, seconds in runs
+        )
+    return record
+
+
+def metadata(seed, queries, time_budget):
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': getattr(datasets.np, '__version__', None),
+        'seed': seed,
+        'queries': queries,
+        'time_budget_s': time_budget,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def write_json(path, rows, meta):
+    with open(path, 'w') as f:
+        json.dump({'metadata': meta, 'results': rows}, f, indent=2)
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def summary(rows):
+    """Pivot of mean comparisons and µs/query: one block per distribution"""
+    algorithms = list(dict.fromkeys(row['algorithm'] for row in rows))
+    lines = []
+    for distribution in dict.fromkeys(row['distribution'] for row in rows):
+        lines.append(f"\n{distribution} — mean comparisons / µs per query (all hit ratios)")
+        header = f"{'size':>10}  " + "  ".join(f"{name.replace(' Search', ''):>20}" for name in algorithms)
+        lines.append(header)
+        lines.append("-" * len(header))
+        for size in dict.fromkeys(row['size'] for row in rows):
+            cells = []
+            for name in algorithms:
+                group = [row for row in rows
+                         if row['distribution'] == distribution
+                         and row['size'] == size and row['algorithm'] == name]
+                if not group:
+                    cells.append(f"{'-':>20}")
+                    continue
+                comparisons = sum(row['mean_comparisons'] for row in group) / len(group)
+                micros = sum(row['mean_us'] for row in group) / len(group)
+                cells.append(f"{comparisons:>10.1f} /{micros:>8.2f}")
+            lines.append(f"{size:>10,}  " + "  ".join(cells))
+    if any(row.get('modelled_ns') is not None for row in rows):
+        lines.append(cache_summary(rows, algorithms))
+    return "\n".join(lines)
+
+
+def cache_summary(rows, algorithms):
+    """Pivot of simulated memory accesses and modelled ns per query"""
+    lines = []
+    for distribution in dict.fromkeys(row['distribution'] for row in rows):
+        lines.append(f"\n{distribution} — simulated memory accesses / modelled ns per query")
+        header = f"{'size':>10}  " + "  ".join(f"{name.replace(' Search', ''):>20}" for name in algorithms)
+        lines.append(header)
+        lines.append("-" * len(header))
+        for size in dict.fromkeys(row['size'] for row in rows):
+            cells = []
+            for name in algorithms:
+                group = [row for row in rows
+                         if row['distribution'] == distribution and row['size'] == size
+                         and row['algorithm'] == name and row.get('modelled_ns') is not None]
+                if not group:
+                    cells.append(f"{'-':>20}")
+                    continue
+                memory = sum(row['memory_accesses'] for row in group) / len(group)
+                nanos = sum(row['modelled_ns'] for row in group) / len(group)
+                cells.append(f"{memory:>10.1f} /{nanos:>8.0f}")
+            lines.append(f"{size:>10,}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(description="Benchmark the search algorithms")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--distributions', nargs='+', default=list(datasets.DISTRIBUTIONS),
+                        choices=datasets.DISTRIBUTIONS)
+    parser.add_argument('--hit-ratios', type=float, nargs='+', default=DEFAULT_HIT_RATIOS)
+    parser.add_argument('--algorithms', nargs='+', choices=list(search_engine.ALGORITHMS),
+                        metavar='ALGORITHM', help="default: all registered algorithms")
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help="seconds per algorithm per configuration")
+    parser.add_argument('--out', default='benchmark',
+                        help="output path prefix for .json and .csv")
+    parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--cache', action='store_true',
+                        help="also simulate cache misses and modelled latency")
+    parser.add_argument('--cache-level', type=cachesim.parse_level, nargs='+',
+                        metavar='NAME:SIZE:WAYS:NS', help="cache levels, innermost first "
+                        "(default: L1:32K:8:1 L2:1M:16:4 LLC:32M:16:15)")
+    parser.add_argument('--line-size', type=int, default=cachesim.LINE_SIZE)
+    parser.add_argument('--memory-latency', type=float, default=cachesim.MEMORY_LATENCY,
+                        help="ns for an access that misses every level")
+    parser.add_argument('--history', nargs='?', const='', metavar='PATH',
+                        help="append every query to the run history "
+                        "(default database: $SEARCH_VISUALIZER_HISTORY or ~/.cache/search-visualizer)")
+    return parser
+
+
+def main(argv=None):
+    return command(build_parser().parse_args(argv))
+
+
+def command(args):
+    """Run the sweep described by parsed build_parser() arguments"""
+
+    def progress(row):
+        print(f"{row['size']:>10,} {row['distribution']:<10} hit={row['hit_ratio']:<4} "
+              f"{row['algorithm']:<22} {row['mean_comparisons']:>12.1f} cmp "
+              f"{row['mean_us']:>10.2f} µs", file=sys.stderr)
+
+    cache = None
+    if args.cache or args.cache_level:
+        cache = cachesim.CacheHierarchy(args.cache_level or cachesim.DEFAULT_LEVELS,
+                                        args.line_size, args.memory_latency)
+    store = history.ResultStore(args.history or None) if args.history is not None else None
+    rows = run(args.sizes, args.distributions, args.hit_ratios, args.algorithms,
+               args.queries, args.seed, args.time_budget,
+               progress=None if args.quiet else progress, cache=cache, store=store)
+    if store is not None:
+        store.flush()
+        store.close()
+    write_json(args.out + '.json', rows, metadata(args.seed, args.queries, args.time_budget))
+    write_csv(args.out + '.csv', rows)
+    print(summary(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Cache Simulator
+Feeds the memory addresses a search touches through a model of the
+cache hierarchy: set-associative levels with LRU replacement, a fixed
+line size and a load-to-use latency per level. Reports the misses at
+every level and the modelled latency of a run, and marks each probe of
+a trace as a hit or a miss so layouts can be compared without hardware
+counters.
+"""
+
+import re
+from collections import namedtuple
+
+import layouts
+from search_engine import CURRENT, VISITED, HIT, MISS, Trace
+
+# name, capacity in bytes, associativity, latency in ns
+Level = namedtuple('Level', 'name size ways latency')
+
+# A typical desktop core: 32 KiB L1d, 1 MiB L2, 32 MiB shared LLC
+DEFAULT_LEVELS = (
+    Level('L1', 32 << 10, 8, 1.0),
+    Level('L2', 1 << 20, 16, 4.0),
+    Level('LLC', 32 << 20, 16, 15.0)
+)
+LINE_SIZE = 64
+MEMORY_LATENCY = 80.0
+
+# Bytes per array element (the searched arrays are int64)
+ELEMENT_SIZE = 8
+
+# Separate structures (Eytzinger copy, inner B-tree nodes, model tables)
+# start this far apart so their addresses never share a line
+REGION = 1 << 40
+
+# accesses: probes simulated; misses: per level, aligned with the levels;
+# served: per probe, the level that answered it (len(levels) = memory)
+CacheReport = namedtuple('CacheReport', 'accesses misses latency served')
+
+_SIZE = re.compile(r'^\s*(\d+)\s*([kmg]?)i?b?\s*$', re.IGNORECASE)
+
+
+def parse_size(text):
+    """Bytes from '32K', '1M', '32MiB' or a plain number"""
+    match = _SIZE.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    number, unit = match.groups()
+    return int(number) << {'': 0, 'k': 10, 'm': 20, 'g': 30}[unit.lower()]
+
+
+def parse_level(text):
+    """Level from 'NAME:SIZE:WAYS:NS', e.g. 'L1:32K:8:1'"""
+    try:
+        name, size, ways, latency = text.split(':')
+        return Level(name, parse_size(size), int(ways), float(latency))
+    except ValueError:
+        raise ValueError(f"Invalid cache level (want NAME:SIZE:WAYS:NS): {text}") from None
+
+
+class CacheLevel:
+    """One set-associative level; each set lists its lines, LRU first"""
+
+    def __init__(self, level, line_size):
+        self.level = level
+        self.ways = max(1, level.ways)
+        self.count = max(1, level.size // (line_size * self.ways))
+        # Sets are created on first touch; a large LLC is mostly empty
+        self.sets = {}
+
+    def access(self, line):
+        """True on a hit; either way the line becomes most recently used"""
+        lines = self.sets.get(line % self.count)
+        if lines is None:
+            self.sets[line % self.count] = [line]
+            return False
+        if line in lines:
+            if lines[-1] != line:
+                lines.remove(line)
+                lines.append(line)
+            return True
+        lines.append(line)
+        if len(lines) > self.ways:
+            del lines[0]
+        return False
+
+
+class CacheHierarchy:
+    """Levels searched in order; a miss fills the line into every level it missed"""
+
+    def __init__(self, levels=DEFAULT_LEVELS, line_size=LINE_SIZE, memory_latency=MEMORY_LATENCY):
+        self.levels = tuple(levels)
+        self.line_size = line_size
+        self.memory_latency = memory_latency
+        self.reset()
+
+    def reset(self):
+        """Start cold"""
+        self.caches = [CacheLevel(level, self.line_size) for level in self.levels]
+
+    def access(self, address):
+        """Level index that served address (len(levels) for memory)"""
+        line = address // self.line_size
+        for depth, cache in enumerate(self.caches):
+            if cache.access(line):
+                return depth
+        return len(self.caches)
+
+    def latency(self, depth):
+        return self.levels[depth].latency if depth < len(self.levels) else self.memory_latency
+
+    def run(self, addresses):
+        """Simulate a sequence of byte addresses; the cache stays warm afterwards"""
+        served = bytearray()
+        misses = [0] * len(self.levels)
+        latency = 0.0
+        for address in addresses:
+            depth = self.access(address)
+            served.append(depth)
+            for level in range(depth):
+                misses[level] += 1
+            latency += self.latency(depth)
+        return CacheReport(len(served), tuple(misses), latency, served)
+
+
+def probe_addresses(algorithm, values, trace):
+    """Byte address of every probe (CURRENT step) of a trace, in order
+
+    Trace indices always refer to the sorted array, but layout searches
+    read their own structures; those map probes back to where the key
+    they compared actually lives.
+    """
+    if algorithm in layouts.LAYOUTS:
+        return layouts.get(algorithm, values).addresses(trace, ELEMENT_SIZE, REGION)
+    return [index * ELEMENT_SIZE
+            for index, state in zip(trace.indices, trace.states)
+            if state == CURRENT and index >= 0]
+
+
+def simulate(algorithm, values, trace, hierarchy=None):
+    """CacheReport of one recorded run (cold unless a warm hierarchy is passed)"""
+    hierarchy = hierarchy or CacheHierarchy()
+    return hierarchy.run(probe_addresses(algorithm, values, trace))
+
+
+def annotate(trace, served, hit_depth=1):
+    """Copy of a trace whose visited probes show HIT or MISS instead
+
+    A probe counts as a hit when a level above hit_depth served it
+    (by default: the L1).
+    """
+    states = bytearray(trace.states)
+    probes = iter(served)
+    outcome = {}
+    # Probed but not yet visited; a repeated probe (both range frontiers
+    # on one element) only hits if every probe did
+    pending = set()
+    for i, (index, state) in enumerate(zip(trace.indices, trace.states)):
+        if index < 0:
+            continue
+        if state == CURRENT:
+            hit = next(probes, hit_depth) < hit_depth
+            outcome[index] = hit and outcome[index] if index in pending else hit
+            pending.add(index)
+        elif state == VISITED and index in outcome:
+            pending.discard(index)
+            states[i] = HIT if outcome[index] else MISS
+    annotated = Trace()
+    annotated.indices = trace.indices
+    annotated.states = states
+    annotated.comparisons = trace.comparisons
+    annotated.lines = trace.lines
+    annotated.delays = trace.delays
+    return annotated
+
+
+def describe(report, levels=DEFAULT_LEVELS):
+    """One-line summary, e.g. 'L1 miss 12 · L2 miss 9 · LLC miss 3 · ≈ 310 ns'"""
+    parts = [f"{level.name} miss {count:,}" for level, count in zip(levels, report.misses)]
+    parts.append(f"≈ {report.latency:,.0f} ns")
+    return " · ".join(parts)
@@ -0,0 +1,163 @@
+"""
+Command Line
+Runs the engine without a display: searches stream one JSON line (or
+tab-separated row) per target, and the benchmark and export tools are
+available as subcommands. `history` summarizes the recorded runs and
+`gui` opens the visualizer pre-loaded.
+
+    python src/cli.py search --algo binary --data data.i64 --targets targets.txt --json
+    cat targets.txt | python src/cli.py search --algo jump --data data.csv --targets - --json
+    python src/cli.py search --data timestamps.i64 --range 1700000000 1700086400
+    python src/cli.py bench --sizes 1000 100000 --out results/bench
+    python src/cli.py history --algo binary
+    python src/cli.py gui --data data.i64 --algo binary --target 45
+
+The src directory also runs as a whole: `python src search ...`.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+import api
+import benchmark
+import datasets
+import export
+
+
+def read_targets(args):
+    """Targets from --target values, a file, or '-' for a lazy stdin stream"""
+    if args.target:
+        return args.target
+    if args.targets == '-':
+        return datasets.stream_text(sys.stdin.buffer)
+    return datasets.load_text(args.targets)
+
+
+def search_command(args):
+    values = api.load(args.data, sort=args.sort)
+    if args.range:
+        rows = api.count(values, args.range, record=args.trace)
+        columns = ('low', 'high', 'start', 'count', 'comparisons')
+    else:
+        rows = api.search(values, read_targets(args), args.algo, record=args.trace, workers=args.workers)
+        columns = ('target', 'index', 'comparisons')
+    out = sys.stdout
+    if not args.json:
+        out.write("\t".join(columns) + "\n")
+    try:
+        for count, row in enumerate(rows, 1):
+            if args.json:
+                out.write(json.dumps(row) + "\n")
+            else:
+                out.write("\t".join(str(row[column]) for column in columns) + "\n")
+            if count % api.CHUNK == 0:
+                out.flush()
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        sys.stdout = open(os.devnull, 'w')
+    return 0
+
+
+def algorithms_command(args):
+    names = api.algorithms()
+    print(json.dumps(names) if args.json else "\n".join(names))
+    return 0
+
+
+def history_command(args):
+    values = api.load(args.data, sort=args.sort) if args.data else None
+    if args.recent:
+        rows = api.recent_runs(args.db, args.recent, values)
+        columns = ('created', 'name', 'size', 'algorithm', 'target', 'result', 'comparisons', 'seconds', 'source')
+    else:
+        rows = api.run_history(args.db, args.algo, values)
+        columns = ('name', 'size', 'algorithm', 'runs', 'found', 'mean_comparisons',
+                   'min_comparisons', 'max_comparisons', 'mean_seconds')
+    try:
+        if not args.json:
+            print("\t".join(columns))
+        for row in rows:
+            print(json.dumps(row) if args.json else "\t".join(str(row[column]) for column in columns))
+        sys.stdout.flush()
+    except BrokenPipeError:
+        sys.stdout = open(os.devnull, 'w')
+    return 0
+
+
+def gui_command(args):
+    api.launch_gui(args.data, args.algo, args.target, args.profile_startup)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="search-visualizer",
+                                     description="Headless search engine and visualizer launcher")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search = commands.add_parser('search', help="search a dataset for many targets")
+    search.add_argument('--algo', '--algorithm', default='binary',
+                        help="algorithm name, e.g. binary, jump, 'Fibonacci Search'")
+    search.add_argument('--data', required=True, help="dataset file (see datasets.load)")
+    source = search.add_mutually_exclusive_group(required=True)
+    source.add_argument('--targets', help="file of targets, or - to stream them from stdin")
+    source.add_argument('--target', type=int, nargs='+')
+    source.add_argument('--range', type=int, nargs=2, action='append', metavar=('LOW', 'HIGH'),
+                        help="count the values in [LOW, HIGH] (repeatable)")
+    search.add_argument('--json', action='store_true', help="one JSON object per line")
+    search.add_argument('--trace', action='store_true', help="include every step (JSON only)")
+    search.add_argument('--sort', action='store_true', help="sort unsorted data first")
+    search.add_argument('--workers', type=int,
+                        help="processes for --algo parallel (default: one, simulated in lockstep)")
+    search.set_defaults(run=search_command)
+
+    bench = commands.add_parser('bench', help="run the benchmark suite")
+    benchmark.build_parser(bench)
+    bench.set_defaults(run=benchmark.command)
+
+    listing = commands.add_parser('algorithms', help="list the registered algorithms")
+    listing.add_argument('--json', action='store_true')
+    listing.set_defaults(run=algorithms_command)
+
+    past = commands.add_parser('history', help="summarize the recorded runs")
+    past.add_argument('--db', help="history database (default: $SEARCH_VISUALIZER_HISTORY "
+                      "or ~/.cache/search-visualizer/history.sqlite3)")
+    past.add_argument('--algo', '--algorithm', help="only this algorithm")
+    past.add_argument('--data', help="only runs on this dataset file")
+    past.add_argument('--sort', action='store_true', help="match --data as sorted in the GUI")
+    past.add_argument('--recent', type=int, metavar='N', help="list the last N runs instead")
+    past.add_argument('--json', action='store_true', help="one JSON object per line")
+    past.set_defaults(run=history_command)
+
+    gui = commands.add_parser('gui', help="open the visualizer")
+    gui.add_argument('--data')
+    gui.add_argument('--algo', '--algorithm')
+    gui.add_argument('--target', type=int)
+    gui.add_argument('--profile-startup', action='store_true')
+    gui.set_defaults(run=gui_command)
+
+    export_parser = commands.add_parser('export', help="render runs to GIF, MP4 or PNG frames")
+    export.build_parser(export_parser)
+    export_parser.set_defaults(run=export.command)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'search' and args.trace and not args.json:
+        parser.error("--trace needs --json")
+    if args.command == 'export' and args.data and not args.targets:
+        parser.error("--targets is required with --data")
+    try:
+        return args.run(args)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
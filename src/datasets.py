@@ -0,0 +1,261 @@
+"""
+Datasets
+Loads sorted integer datasets from disk for the search engine: raw
+little-endian binaries are memory-mapped without copying, text files
+(CSV or one value per line) are streamed in chunks. Also generates
+synthetic datasets with a few key distributions, in chunks so callers
+can show progress.
+"""
+
+import bisect
+import mmap
+import os
+import random
+import re
+import sys
+from array import array
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; memoryview covers the binary path
+    np = None
+
+# File extension -> element type of raw binary datasets
+BINARY_TYPES = {
+    '.i32': 'int32',
+    '.i64': 'int64',
+    '.bin': 'int64',
+    '.raw': 'int64'
+}
+
+# array/memoryview type codes with a guaranteed width
+TYPE_CODES = {
+    'int32': 'i',
+    'int64': 'q'
+}
+
+TEXT_CHUNK_SIZE = 1 << 20
+
+_SEPARATORS = re.compile(rb'[\s,;]+')
+# The single bytes _SEPARATORS matches, for finding a safe chunk boundary
+_SEPARATOR_BYTES = b' \t\n\r\f\v,;'
+
+
+def load_binary(path, dtype='int64'):
+    """Memory-map a raw little-endian int32/int64 file (zero copy)"""
+    if dtype not in TYPE_CODES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    if os.path.getsize(path) == 0:
+        return array(TYPE_CODES[dtype])
+
+    if np is not None:
+        return np.memmap(path, dtype=np.dtype(dtype).newbyteorder('<'), mode='r')
+
+    if sys.byteorder != 'little':
+        # A memoryview cast is native-endian only, so fall back to a copy
+        data = array(TYPE_CODES[dtype])
+        with open(path, 'rb') as f:
+            data.frombytes(f.read())
+        data.byteswap()
+        return data
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    usable = len(view) - len(view) % array(TYPE_CODES[dtype]).itemsize
+    return view[:usable].cast(TYPE_CODES[dtype])
+
+
+def load_text(path, chunk_size=TEXT_CHUNK_SIZE):
+    """Stream integers from a CSV/newline/whitespace separated text file"""
+    data = array('q')
+    tail = b''
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk = tail + chunk
+            # The last token may continue in the next chunk
+            cut = max(chunk.rfind(sep) for sep in _SEPARATOR_BYTES)
+            if cut < 0:
+                tail = chunk
+                continue
+            tail = chunk[cut + 1:]
+            data.extend(_parse_ints(chunk[:cut]))
+    data.extend(_parse_ints(tail))
+    return data
+
+
+def stream_text(f):
+    """Yield integers from an open binary text stream (e.g. stdin) line by line"""
+    for line in f:
+        yield from _parse_ints(line)
+
+
+def _parse_ints(buffer):
+    for token in _SEPARATORS.split(buffer):
+        if token:
+            try:
+                yield int(token)
+            except ValueError:
+                # Tolerate a header row or stray labels
+                continue
+
+
+def load(path, dtype=None):
+    """Load a dataset, picking the reader from dtype or the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if dtype is None and ext in BINARY_TYPES:
+        dtype = BINARY_TYPES[ext]
+    if dtype is not None:
+        return load_binary(path, dtype)
+    return load_text(path)
+
+
+def save_binary(path, values, dtype='int64'):
+    """Write values as a raw little-endian binary dataset"""
+    if np is not None and isinstance(values, np.ndarray):
+        with open(path, 'wb') as f:
+            np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<')).tofile(f)
+        return
+    data = array(TYPE_CODES[dtype], values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(path, 'wb') as f:
+        data.tofile(f)
+
+
+# Synthetic key distributions
+DISTRIBUTIONS = ('uniform', 'skewed', 'clustered', 'duplicates', 'zipf')
+
+# Keys drawn per chunk, so progress can be reported while generating
+GENERATE_CHUNK = 1 << 20
+
+# Share of the progress bar spent drawing keys when they are sorted afterwards
+DRAW_SHARE = 0.8
+
+# Zipf keys: rank r is drawn with probability proportional to 1 / r**ZIPF_EXPONENT,
+# over at most ZIPF_RANKS distinct keys
+ZIPF_EXPONENT = 1.2
+ZIPF_RANKS = 1 << 16
+
+
+def generate(distribution, n, seed=0, sort=True, progress=None):
+    """Synthetic integer dataset of n keys, sorted unless sort=False
+
+    The same seed gives the same data for a given backend (numpy or the
+    pure-Python fallback); the two backends draw different numbers.
+    progress, if given, is called with the fraction done after every chunk.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    share = DRAW_SHARE if sort else 1.0
+    if np is not None:
+        draw = _numpy_sampler(distribution, n, np.random.default_rng(seed))
+        values = np.empty(n, dtype=np.int64)
+        for lo in range(0, n, GENERATE_CHUNK):
+            hi = min(n, lo + GENERATE_CHUNK)
+            values[lo:hi] = draw(hi - lo)
+            if progress is not None:
+                progress(share * hi / n)
+        if sort:
+            values.sort()
+    else:
+        draw = _python_sampler(distribution, n, random.Random(seed))
+        values = array('q')
+        for lo in range(0, n, GENERATE_CHUNK):
+            hi = min(n, lo + GENERATE_CHUNK)
+            values.extend(draw(hi - lo))
+            if progress is not None:
+                progress(share * hi / n)
+        if sort:
+            values = array('q', sorted(values))
+    if progress is not None:
+        progress(1.0)
+    return values
+
+
+def _numpy_sampler(distribution, n, rng):
+    """Function drawing the next count keys of a distribution"""
+    span = 10 * max(n, 1)
+    if distribution == 'uniform':
+        return lambda count: rng.integers(0, span, count, dtype=np.int64)
+    if distribution == 'skewed':
+        # Most keys crowd near zero with a long sparse tail
+        return lambda count: (rng.random(count) ** 4 * span).astype(np.int64)
+    if distribution == 'clustered':
+        k = max(1, min(16, n // 8))
+        centers = rng.integers(0, span, k)
+        spread = max(1, n // (4 * k))
+
+        def draw(count):
+            values = centers[rng.integers(0, k, count)] + rng.normal(0, spread, count).astype(np.int64)
+            return np.maximum(values, 0)
+        return draw
+    if distribution == 'zipf':
+        ranks = max(1, min(n, ZIPF_RANKS))
+        # Popular keys are scattered over the value range, not bunched at zero
+        keys = rng.permutation(ranks).astype(np.int64) * (span // ranks)
+        cdf = np.cumsum(1.0 / np.arange(1, ranks + 1) ** ZIPF_EXPONENT)
+        cdf /= cdf[-1]
+        return lambda count: keys[np.minimum(np.searchsorted(cdf, rng.random(count), side='right'), ranks - 1)]
+    # duplicates: about 100 copies of each key, keys 10 apart
+    distinct = max(1, n // 100)
+    return lambda count: rng.integers(0, distinct, count, dtype=np.int64) * 10
+
+
+def _python_sampler(distribution, n, rng):
+    span = 10 * max(n, 1)
+    if distribution == 'uniform':
+        return lambda count: [rng.randrange(span) for _ in range(count)]
+    if distribution == 'skewed':
+        return lambda count: [int(rng.random() ** 4 * span) for _ in range(count)]
+    if distribution == 'clustered':
+        k = max(1, min(16, n // 8))
+        centers = [rng.randrange(span) for _ in range(k)]
+        spread = max(1, n // (4 * k))
+        return lambda count: [max(0, int(rng.choice(centers) + rng.gauss(0, spread))) for _ in range(count)]
+    if distribution == 'zipf':
+        ranks = max(1, min(n, ZIPF_RANKS))
+        step = span // ranks
+        keys = [rank * step for rank in rng.sample(range(ranks), ranks)]
+        weights = list(accumulate(1.0 / r ** ZIPF_EXPONENT for r in range(1, ranks + 1)))
+        return lambda count: rng.choices(keys, cum_weights=weights, k=count)
+    distinct = max(1, n // 100)
+    return lambda count: [rng.randrange(distinct) * 10 for _ in range(count)]
+
+
+def as_array(values):
+    """Copy any integer sequence into a compact array('q')"""
+    if isinstance(values, array) and values.typecode == 'q':
+        return values
+    if np is not None and isinstance(values, np.ndarray):
+        data = array('q')
+        data.frombytes(values.astype(np.int64).tobytes())
+        return data
+    return array('q', values)
+
+
+def sample_targets(values, count, hit_ratio, seed=0):
+    """Targets drawn from a sorted dataset: hit_ratio of them present, the rest absent"""
+    rng = random.Random(seed)
+    n = len(values)
+    targets = []
+    if not n:
+        return [rng.randrange(100) for _ in range(count)]
+    low, high = int(values[0]), int(values[-1])
+    for _ in range(count):
+        if rng.random() < hit_ratio:
+            targets.append(int(values[rng.randrange(n)]))
+            continue
+        for _ in range(32):
+            guess = rng.randint(low - 1, high + 1)
+            i = bisect.bisect_left(values, guess)
+            if i == n or values[i] != guess:
+                break
+        else:
+            guess = high + 1
+        targets.append(guess)
+    return targets
@@ -0,0 +1,385 @@
+"""
+Offscreen Export
+Renders a run's step trace to frames without Tk and without the
+animation's real-time waits: the normal ArrayRenderer draws onto an
+in-memory stand-in for the canvas, rasterized with Pillow. Frames are
+written as a GIF, as an MP4 when ffmpeg is on the PATH, or otherwise as a
+PNG sequence. Batch exports run across a process pool.
+
+    python src/export.py --data data.i64 --targets 31 45 89 --out demo.gif
+    python src/export.py --trace run.svt --out run.mp4
+"""
+
+import argparse
+import bisect
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # Pillow is optional; only needed for exporting
+    Image = None
+
+import api
+import datasets
+import prepare
+import search_engine
+import tracefile
+from renderer import ArrayRenderer
+
+# Canvas colors of the GUI's two themes
+PALETTES = {
+    'dark': {
+        'canvas_bg': '#0f172a',
+        'default': '#3498db',
+        'current': '#f39c12',
+        'visited': '#95a5a6',
+        'found': '#2ecc71',
+        'hit': '#22d3ee',
+        'miss': '#f43f5e',
+        'bar_outline': '#2980b9',
+        'canvas_text': '#c9d1d9',
+        'index_text': '#7f8c8d'
+    },
+    'light': {
+        'canvas_bg': '#ffffff',
+        'default': '#2b6cb0',
+        'current': '#d97706',
+        'visited': '#9ca3af',
+        'found': '#059669',
+        'hit': '#0891b2',
+        'miss': '#e11d48',
+        'bar_outline': '#2563eb',
+        'canvas_text': '#111827',
+        'index_text': '#6b7280'
+    }
+}
+
+DEFAULT_FPS = 30
+
+# Longer runs are sped up so the video stays under this many frames
+DEFAULT_MAX_FRAMES = 900
+
+# How long the final state stays on screen
+HOLD_MS = 1500
+
+FORMATS = ('gif', 'mp4', 'png')
+
+
+class ImageCanvas:
+    """Just enough of the tk.Canvas API for ArrayRenderer, drawn with Pillow"""
+
+    def __init__(self, width, height, background):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.items = {}
+        self.next_id = 1
+        self.fonts = {}
+
+    def bind(self, *args):
+        pass
+
+    def tag_bind(self, *args):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+    def create(self, kind, coords, options):
+        tags = options.get('tags', ())
+        options['tags'] = (tags,) if isinstance(tags, str) else tuple(tags)
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = [kind, coords, options]
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self.create('rect', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create('text', coords, options)
+
+    def find(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        return [item for item, (_, _, options) in self.items.items() if tag_or_id in options['tags']]
+
+    def find_all(self):
+        return list(self.items)
+
+    def coords(self, item, *coords):
+        if coords:
+            self.items[item][1] = coords
+        return self.items[item][1]
+
+    def itemconfig(self, tag_or_id, **options):
+        if 'tags' in options:
+            tags = options['tags']
+            options['tags'] = (tags,) if isinstance(tags, str) else tuple(tags)
+        for item in self.find(tag_or_id):
+            self.items[item][2].update(options)
+
+    itemconfigure = itemconfig
+
+    def dtag(self, tag_or_id, tag):
+        for item in self.find(tag_or_id):
+            options = self.items[item][2]
+            options['tags'] = tuple(t for t in options['tags'] if t != tag)
+
+    def addtag_withtag(self, new, tag_or_id):
+        for item in self.find(tag_or_id):
+            options = self.items[item][2]
+            if new not in options['tags']:
+                options['tags'] += (new,)
+
+    def font(self, spec):
+        """Pillow font for a Tk font tuple like ("Segoe UI", 16, "bold")"""
+        spec = tuple(spec) if spec else ("", 10)
+        if spec not in self.fonts:
+            size = spec[1] if len(spec) > 1 else 10
+            name = "DejaVuSans-Bold.ttf" if "bold" in spec[2:] else "DejaVuSans.ttf"
+            try:
+                self.fonts[spec] = ImageFont.truetype(name, size)
+            except OSError:
+                self.fonts[spec] = ImageFont.load_default()
+        return self.fonts[spec]
+
+    def render(self):
+        """Rasterize every visible item, in creation order, to an RGB image"""
+        image = Image.new('RGB', (self.width, self.height), self.background)
+        draw = ImageDraw.Draw(image)
+        for kind, coords, options in self.items.values():
+            if options.get('state') == 'hidden':
+                continue
+            if kind == 'rect':
+                x0, y0, x1, y1 = coords
+                outline = options.get('outline') if options.get('width', 1) else None
+                draw.rectangle((x0, y0, max(x0, x1 - 1), max(y0, y1 - 1)),
+                               fill=options.get('fill'), outline=outline,
+                               width=options.get('width', 1) or 0)
+            else:
+                draw.text(coords[:2], str(options.get('text', '')), fill=options.get('fill'),
+                          font=self.font(options.get('font')), anchor='mm')
+        return image
+
+
+def frames(values, trace, algorithm, target, theme='dark', width=1160, height=200,
+           fps=DEFAULT_FPS, speed=1.0, max_frames=DEFAULT_MAX_FRAMES):
+    """Yield (image, duration_ms) frames of a trace played at speed
+
+    Frames are sampled from the animation timeline at fps; a frame where
+    nothing changed just extends the previous frame's duration.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to export frames (pip install pillow)")
+    colors = PALETTES[theme]
+    canvas = ImageCanvas(width, height, colors['canvas_bg'])
+    renderer = ArrayRenderer(canvas, colors, width, height)
+    renderer.set_array(values)
+    caption = canvas.create_text(0, 0, text="", font=("Segoe UI", 9), fill=colors['index_text'])
+
+    starts = [0] * len(trace)
+    elapsed = 0
+    for i, delay in enumerate(trace.delays):
+        starts[i] = elapsed
+        elapsed += delay
+    frame_ms = 1000 / fps
+    # Speed up long runs so they fit in max_frames
+    speed = max(speed, elapsed / (frame_ms * max(1, max_frames - 1)))
+
+    def snapshot(position):
+        comparisons = trace.comparisons[position - 1] if position else 0
+        label = f"{algorithm} · target {target} · step {position:,}/{len(trace):,} · {comparisons:,} comparisons"
+        canvas.itemconfig(caption, text=label)
+        # Left-aligned caption along the bottom edge
+        text_width = canvas.font(("Segoe UI", 9)).getlength(label)
+        canvas.coords(caption, 8 + text_width / 2, height - 8)
+        return canvas.render()
+
+    position = 0
+    pending = snapshot(0)
+    duration = 0.0
+    k = 1
+    while position < len(trace):
+        clock = k * frame_ms * speed
+        target_position = bisect.bisect_right(starts, clock)
+        duration += frame_ms
+        if target_position > position:
+            yield pending, round(duration)
+            renderer.sync(renderer.model.apply(trace, position, target_position))
+            position = target_position
+            pending = snapshot(position)
+            duration = 0.0
+        k += 1
+    yield pending, round(duration + HOLD_MS)
+
+
+def write_gif(path, frame_iter):
+    images = []
+    durations = []
+    for image, duration in frame_iter:
+        # Palette images keep a long GIF's memory use down
+        images.append(image.convert('P', palette=Image.ADAPTIVE, colors=64))
+        durations.append(max(20, duration))
+    images[0].save(path, save_all=True, append_images=images[1:], duration=durations, loop=0)
+
+
+def write_mp4(path, frame_iter, fps=DEFAULT_FPS, encoder=None):
+    """Pipe frames to ffmpeg at a constant fps, repeating held frames"""
+    encoder = encoder or shutil.which('ffmpeg')
+    process = None
+    owed = 0.0
+    for image, duration in frame_iter:
+        if process is None:
+            process = subprocess.Popen(
+                [encoder, '-y', '-loglevel', 'error',
+                 '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{image.width}x{image.height}",
+                 '-r', str(fps), '-i', '-',
+                 '-c:v', 'libx264', '-pix_fmt', 'yuv420p', path],
+                stdin=subprocess.PIPE
+            )
+        owed += duration * fps / 1000
+        data = image.tobytes()
+        while owed >= 1:
+            process.stdin.write(data)
+            owed -= 1
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed with exit code {process.returncode}")
+
+
+def write_png_sequence(directory, frame_iter):
+    """frame_00000.png ... plus an ffconcat list carrying each frame's duration"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'frames.ffconcat'), 'w') as listing:
+        listing.write("ffconcat version 1.0\n")
+        for i, (image, duration) in enumerate(frame_iter):
+            name = f"frame_{i:05d}.png"
+            image.save(os.path.join(directory, name))
+            listing.write(f"file '{name}'\nduration {duration / 1000:.3f}\n")
+
+
+def export_run(path, values, trace, algorithm, target, fmt=None, **options):
+    """Render one trace to path; returns (path written, format used)"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower() or 'png'
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'mp4' and shutil.which('ffmpeg') is None:
+        # No encoder available: leave frames that can be encoded later
+        fmt = 'png'
+        path = os.path.splitext(path)[0] + '_frames'
+    frame_iter = frames(values, trace, algorithm, target, **options)
+    if fmt == 'gif':
+        write_gif(path, frame_iter)
+    elif fmt == 'mp4':
+        write_mp4(path, frame_iter, options.get('fps', DEFAULT_FPS))
+    else:
+        if path.lower().endswith('.png'):
+            path = path[:-4]
+        write_png_sequence(path, frame_iter)
+    return path, fmt
+
+
+# Worker-process globals, set once by _attach()
+_worker = {}
+
+
+def _attach(values):
+    _worker['values'] = values
+
+
+def _export_job(path, algorithm, target, fmt, options):
+    values = _worker['values']
+    result = search_engine.run(algorithm, values, target)
+    return export_run(path, values, result.trace, algorithm, target, fmt, **options)
+
+
+def export_many(values, jobs, workers=None, fmt=None, **options):
+    """Export (path, algorithm, target) jobs in parallel; returns [(path, format)]"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        _attach(values)
+        return [_export_job(path, algorithm, target, fmt, options) for path, algorithm, target in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(values,)) as pool:
+        futures = [pool.submit(_export_job, path, algorithm, target, fmt, options)
+                   for path, algorithm, target in jobs]
+        return [future.result() for future in futures]
+
+
+def build_parser(parser=None):
+    parser = parser or argparse.ArgumentParser(description="Export search runs as GIF, MP4 or PNG frames")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data', help="dataset file to search (see datasets.load)")
+    source.add_argument('--trace', help="saved .svt run to export instead of searching")
+    parser.add_argument('--algorithm', default="Binary Search", choices=list(search_engine.ALGORITHMS),
+                        metavar='ALGORITHM')
+    parser.add_argument('--targets', type=int, nargs='+', default=[])
+    parser.add_argument('--sort', action='store_true', help="sort unsorted --data first")
+    parser.add_argument('--out', required=True,
+                        help="output file (.gif/.mp4) or directory; with several targets "
+                             "the target is appended to the name")
+    parser.add_argument('--format', choices=FORMATS, help="default: from the --out extension")
+    parser.add_argument('--theme', choices=list(PALETTES), default='dark')
+    parser.add_argument('--size', default='1160x200', help="WIDTHxHEIGHT in pixels")
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS)
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--max-frames', type=int, default=DEFAULT_MAX_FRAMES)
+    parser.add_argument('--workers', type=int, default=None)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.data and not args.targets:
+        parser.error("--targets is required with --data")
+    try:
+        return command(args)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+def command(args):
+    """Export the runs described by parsed build_parser() arguments"""
+    width, height = (int(part) for part in args.size.lower().split('x'))
+    options = {
+        'theme': args.theme,
+        'width': width,
+        'height': height,
+        'fps': args.fps,
+        'speed': args.speed,
+        'max_frames': args.max_frames
+    }
+
+    if args.trace:
+        run = tracefile.load(args.trace)
+        header = run.header
+        written = [export_run(args.out, run.values(), run.trace, header['algorithm'],
+                              header['target'], args.format, **options)]
+    else:
+        # A compact copy: memory maps cannot be sent to worker processes
+        values = datasets.as_array(api.load(args.data, sort=args.sort))
+        # Same guard as api.search: a sorted-only search on unsorted data
+        # would render a run that misses targets that are present
+        if args.algorithm not in api.UNSORTED_OK and not prepare.is_sorted(values):
+            raise ValueError(f"{args.algorithm} needs sorted data (pass --sort)")
+        root, ext = os.path.splitext(args.out)
+        jobs = [(args.out if len(args.targets) == 1 else f"{root}_{target}{ext}", args.algorithm, target)
+                for target in args.targets]
+        written = export_many(values, jobs, args.workers, args.format, **options)
+
+    for path, fmt in written:
+        print(f"{fmt}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
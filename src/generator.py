@@ -0,0 +1,314 @@
+"""
+Dataset Generator
+Builds synthetic datasets off the Tk thread and keeps them around: every
+generated array is written to a raw .i64 file in a cache directory and
+memory-mapped back, so asking for the same configuration again - or for
+one that was prefetched in the background - is instant.
+"""
+
+import os
+import tempfile
+import threading
+import tkinter as tk
+from collections import OrderedDict, namedtuple
+from tkinter import ttk, messagebox
+
+import datasets
+
+# Largest dataset the dialog will generate
+MAX_SIZE = 100_000_000
+
+# Generated arrays kept in memory (older ones are re-mapped from disk)
+MAX_CACHED = 4
+
+# Progress share of writing the finished array to the cache directory
+SAVE_SHARE = 0.1
+
+# Wait this long after the dialog's fields change before prefetching them
+PREFETCH_DELAY_MS = 600
+
+Spec = namedtuple('Spec', 'distribution size seed sorted')
+
+
+class Cancelled(Exception):
+    """Raised inside a generation that was superseded by a newer prefetch"""
+
+
+def cache_dir():
+    """Where generated datasets are stored; SEARCH_VISUALIZER_CACHE overrides it"""
+    return os.environ.get('SEARCH_VISUALIZER_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'search-visualizer', 'datasets')
+
+
+def describe(spec):
+    order = 'sorted' if spec.sorted else 'unsorted'
+    return f"{spec.distribution} ×{spec.size:,} (seed {spec.seed}, {order})"
+
+
+class Job:
+    """One generation running on a worker thread"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.done = threading.Event()
+        self.cancelled = False
+        self.progress = None
+        self.values = None
+        self.error = None
+
+    def report(self, fraction, text="Generating"):
+        if self.cancelled:
+            raise Cancelled(self.spec)
+        if self.progress is not None:
+            self.progress(fraction, text)
+
+
+class DatasetCache:
+    """Generated datasets by Spec: in memory, on disk, or being built"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or cache_dir()
+        self.memory = OrderedDict()
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def path(self, spec):
+        # The two generator backends draw different numbers for one seed
+        backend = 'np' if datasets.np is not None else 'py'
+        order = 'sorted' if spec.sorted else 'unsorted'
+        name = f"{spec.distribution}-{spec.size}-seed{spec.seed}-{order}-{backend}.i64"
+        return os.path.join(self.directory, name)
+
+    def cached(self, spec):
+        """Whether spec can be returned without generating it"""
+        with self.lock:
+            if spec in self.memory:
+                return True
+        return os.path.exists(self.path(spec))
+
+    def get(self, spec, progress=None):
+        """The dataset for spec; progress(fraction, text) follows a generation"""
+        while True:
+            with self.lock:
+                if spec in self.memory:
+                    self.memory.move_to_end(spec)
+                    return self.memory[spec]
+                job = self.jobs.get(spec)
+                owner = job is None
+                if owner:
+                    job = self.jobs[spec] = Job(spec)
+                else:
+                    # Already prefetching: take over its progress reports
+                    job.cancelled = False
+                job.progress = progress
+            if owner:
+                self.build(job)
+            job.done.wait()
+            if isinstance(job.error, Cancelled):
+                # Cancelled just before we took it over; start again
+                continue
+            if job.error is not None:
+                raise job.error
+            return job.values
+
+    def prefetch(self, spec):
+        """Start building spec in the background; supersedes older prefetches"""
+        with self.lock:
+            for job in self.jobs.values():
+                if job.progress is None and job.spec != spec:
+                    job.cancelled = True
+            if spec in self.memory or spec in self.jobs:
+                return
+            job = self.jobs[spec] = Job(spec)
+        thread = threading.Thread(target=self.build, args=(job,))
+        thread.daemon = True
+        thread.start()
+
+    def build(self, job):
+        """Load spec from disk, or generate and persist it"""
+        spec = job.spec
+        try:
+            path = self.path(spec)
+            if os.path.exists(path):
+                values = datasets.load_binary(path, 'int64')
+            else:
+                values = datasets.generate(
+                    spec.distribution, spec.size, spec.seed, spec.sorted,
+                    progress=lambda fraction: job.report((1 - SAVE_SHARE) * fraction)
+                )
+                job.report(1 - SAVE_SHARE, "Saving")
+                values = self.save(path, values)
+            job.report(1.0, "Done")
+            job.values = values
+            with self.lock:
+                self.memory[spec] = values
+                while len(self.memory) > MAX_CACHED:
+                    self.memory.popitem(last=False)
+        except Exception as e:  # handed to whoever waits on the job
+            job.error = e
+        finally:
+            with self.lock:
+                self.jobs.pop(spec, None)
+            job.done.set()
+
+    def save(self, path, values):
+        """Write values atomically and return them memory-mapped; the
+        in-memory copy if the cache directory is not writable"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(suffix='.part', dir=self.directory)
+            os.close(fd)
+            try:
+                datasets.save_binary(tmp, values)
+                os.replace(tmp, path)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        except OSError:
+            return values
+        return datasets.load_binary(path, 'int64')
+
+
+class GeneratorDialog:
+    """Small dialog for configuring, generating and prefetching datasets"""
+
+    def __init__(self, root, colors, cache, on_generate):
+        self.root = root
+        self.cache = cache
+        self.on_generate = on_generate
+        self.job = None
+        self.window = tk.Toplevel(root)
+        self.window.title("🎲 Generate Dataset")
+        self.window.configure(bg=colors['bg'])
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.distribution = tk.StringVar(value=datasets.DISTRIBUTIONS[0])
+        self.size = tk.StringVar(value="1000000")
+        self.seed = tk.StringVar(value="0")
+        self.sorted = tk.BooleanVar(value=True)
+
+        form = tk.Frame(self.window, bg=colors['bg'])
+        form.pack(padx=16, pady=(14, 4))
+        rows = (
+            ("Distribution", ttk.Combobox(form, textvariable=self.distribution,
+                                          values=datasets.DISTRIBUTIONS, state="readonly", width=14)),
+            ("Size", tk.Entry(form, textvariable=self.size, width=16, bg=colors['entry_bg'],
+                              fg=colors['text'], insertbackground=colors['text'], relief=tk.FLAT)),
+            ("Seed", tk.Entry(form, textvariable=self.seed, width=16, bg=colors['entry_bg'],
+                              fg=colors['text'], insertbackground=colors['text'], relief=tk.FLAT))
+        )
+        for row, (text, widget) in enumerate(rows):
+            tk.Label(
+                form,
+                text=text,
+                font=("Segoe UI", 10),
+                bg=colors['bg'],
+                fg=colors['text']
+            ).grid(row=row, column=0, sticky="w", padx=(0, 12), pady=3)
+            widget.grid(row=row, column=1, sticky="w", pady=3)
+        tk.Checkbutton(
+            form,
+            text="Sorted",
+            variable=self.sorted,
+            font=("Segoe UI", 10),
+            bg=colors['bg'],
+            fg=colors['text'],
+            selectcolor=colors['entry_bg'],
+            activebackground=colors['bg'],
+            activeforeground=colors['text']
+        ).grid(row=len(rows), column=1, sticky="w")
+
+        self.progress = ttk.Progressbar(self.window, length=240, maximum=1.0)
+        self.progress.pack(padx=16, pady=(8, 2))
+        self.status = tk.Label(
+            self.window,
+            text="",
+            font=("Segoe UI", 9),
+            bg=colors['bg'],
+            fg=colors['muted_text']
+        )
+        self.status.pack()
+
+        self.generate_btn = tk.Button(
+            self.window,
+            text="🎲 Generate",
+            font=("Segoe UI", 10, "bold"),
+            bg=colors['success'],
+            fg=colors['button_text'],
+            activebackground=colors['success'],
+            relief=tk.FLAT,
+            cursor="hand2",
+            command=self.generate
+        )
+        self.generate_btn.pack(pady=14)
+
+        for var in (self.distribution, self.size, self.seed, self.sorted):
+            var.trace_add('write', self.changed)
+        self.show_cached()
+
+    def spec(self):
+        """The configured Spec, or None if a field is invalid"""
+        try:
+            size = int(self.size.get().replace(',', '').replace('_', ''))
+            seed = int(self.seed.get())
+        except ValueError:
+            return None
+        if not 1 <= size <= MAX_SIZE:
+            return None
+        return Spec(self.distribution.get(), size, seed, self.sorted.get())
+
+    def generate(self):
+        spec = self.spec()
+        if spec is None:
+            messagebox.showwarning(
+                "Generate Dataset",
+                f"Size must be a whole number between 1 and {MAX_SIZE:,}; the seed must be an integer",
+                parent=self.window
+            )
+            return
+        self.generate_btn.config(state=tk.DISABLED)
+        self.show_progress(0.0, "Loading" if self.cache.cached(spec) else "Generating")
+        self.on_generate(spec)
+
+    def finished(self, spec=None):
+        """Re-enable the dialog; after a success, move on to the next seed and
+        prefetch it so generating again is instant"""
+        if self.window is None:
+            return
+        self.generate_btn.config(state=tk.NORMAL)
+        if spec is None:
+            self.show_progress(0.0, "")
+            return
+        self.show_progress(1.0, f"Loaded {describe(spec)}")
+        if self.spec() == spec:
+            self.seed.set(str(spec.seed + 1))
+
+    def show_progress(self, fraction, text):
+        if self.window is None:
+            return
+        self.progress.config(value=fraction)
+        self.status.config(text=f"{text}… {fraction:.0%}" if 0 < fraction < 1 else text)
+
+    def changed(self, *args):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.job = self.root.after(PREFETCH_DELAY_MS, self.prefetch)
+
+    def prefetch(self):
+        self.job = None
+        spec = self.spec()
+        if spec is not None and str(self.generate_btn.cget('state')) == tk.NORMAL:
+            self.cache.prefetch(spec)
+        self.show_cached()
+
+    def show_cached(self):
+        spec = self.spec()
+        if spec is not None and self.cache.cached(spec) and str(self.generate_btn.cget('state')) == tk.NORMAL:
+            self.status.config(text="Cached — loads instantly")
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.window.destroy()
+        self.window = None
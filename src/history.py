@@ -0,0 +1,221 @@
+"""
+Run History
+Keeps every search in a local SQLite database: which dataset (by content
+fingerprint), algorithm, target, result, comparisons and wall time.
+Writes are queued and committed in bulk by one background thread, so
+neither the GUI nor a long benchmark waits on the disk. Aggregates such
+as mean comparisons per algorithm per dataset are answered from a
+covering index.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+# Rows committed per transaction, and the longest a queued row waits
+BATCH_SIZE = 1000
+FLUSH_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    name TEXT,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    session TEXT NOT NULL,
+    dataset INTEGER NOT NULL REFERENCES datasets(id),
+    algorithm TEXT NOT NULL,
+    target INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    comparisons INTEGER NOT NULL,
+    seconds REAL,
+    source TEXT NOT NULL
+);
+-- Covers the per-dataset, per-algorithm aggregates without touching the table
+CREATE INDEX IF NOT EXISTS runs_by_algorithm ON runs (dataset, algorithm, comparisons, seconds, result);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (created);
+"""
+
+# One run to store; seconds may be None (e.g. a cached replay)
+Run = namedtuple('Run', 'fingerprint name size algorithm target result comparisons seconds source')
+
+# One row of summary(): runs of an algorithm on a dataset
+Aggregate = namedtuple('Aggregate', 'dataset name size algorithm runs found '
+                                    'mean_comparisons min_comparisons max_comparisons mean_seconds')
+
+_STOP = object()
+
+
+def default_path():
+    """Where the history lives; SEARCH_VISUALIZER_HISTORY overrides it"""
+    return os.environ.get('SEARCH_VISUALIZER_HISTORY') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'search-visualizer', 'history.sqlite3')
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class ResultStore:
+    """SQLite run history with a batching writer thread
+
+    record() and record_many() only enqueue; the writer commits whatever
+    has queued up, BATCH_SIZE rows per transaction. Queries open their own
+    read connection, so they can run on any thread while writes continue.
+    """
+
+    def __init__(self, path=None, session=None):
+        self.path = path or default_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.session = session or uuid.uuid4().hex[:12]
+        with _connect(self.path) as connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+        self.pending = queue.Queue()
+        self.error = None
+        self.writer = threading.Thread(target=self.write_loop)
+        self.writer.daemon = True
+        self.writer.start()
+        # Commit what is still queued when the interpreter exits
+        atexit.register(self.close)
+
+    def record(self, run):
+        """Queue one Run for writing"""
+        self.pending.put((time.time(), run))
+
+    def record_many(self, runs):
+        """Queue many Runs (e.g. a batch) as one item; they commit together"""
+        self.pending.put((time.time(), list(runs)))
+
+    def write_loop(self):
+        connection = _connect(self.path)
+        datasets = {}
+        try:
+            while True:
+                item = self.pending.get()
+                if item is _STOP:
+                    self.pending.task_done()
+                    return
+                items = [item]
+                rows = len(item[1]) if isinstance(item[1], list) else 1
+                deadline = time.monotonic() + FLUSH_INTERVAL
+                stop = False
+                # Gather more rows until the batch is full or the oldest has waited long enough
+                while rows < BATCH_SIZE:
+                    try:
+                        item = self.pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    items.append(item)
+                    rows += len(item[1]) if isinstance(item[1], list) else 1
+                try:
+                    self.write(connection, datasets, items)
+                except Exception as e:
+                    # Keep the writer (and the GUI) going; flush() re-raises it
+                    self.error = e
+                finally:
+                    for _ in items:
+                        self.pending.task_done()
+                if stop:
+                    self.pending.task_done()
+                    return
+        finally:
+            connection.close()
+
+    def write(self, connection, datasets, items):
+        rows = []
+        # Ids of dataset rows inserted by this transaction; they only join
+        # the cache once it commits, so a rollback cannot leave dangling ids
+        added = {}
+        with connection:
+            for created, runs in items:
+                for run in runs if isinstance(runs, list) else (runs,):
+                    dataset = datasets.get(run.fingerprint, added.get(run.fingerprint))
+                    if dataset is None:
+                        connection.execute(
+                            "INSERT OR IGNORE INTO datasets (fingerprint, name, size) VALUES (?, ?, ?)",
+                            (run.fingerprint, run.name, run.size))
+                        (dataset,) = connection.execute(
+                            "SELECT id FROM datasets WHERE fingerprint = ?", (run.fingerprint,)).fetchone()
+                        added[run.fingerprint] = dataset
+                    rows.append((created, self.session, dataset, run.algorithm, int(run.target),
+                                 int(run.result), int(run.comparisons), run.seconds, run.source))
+            connection.executemany(
+                "INSERT INTO runs (created, session, dataset, algorithm, target, result, "
+                "comparisons, seconds, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        datasets.update(added)
+
+    def flush(self):
+        """Block until everything queued so far is written; re-raises the
+        last error that made the writer drop a batch"""
+        self.pending.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        if self.writer.is_alive():
+            self.pending.put(_STOP)
+            self.writer.join()
+        atexit.unregister(self.close)
+
+    # ---- Queries -----------------------------------------------------
+
+    def query(self, sql, parameters=()):
+        connection = _connect(self.path)
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def summary(self, fingerprint=None, algorithm=None):
+        """Aggregate runs per dataset and algorithm: largest datasets first,
+        fewest mean comparisons first within each"""
+        where, parameters = [], []
+        if fingerprint is not None:
+            where.append("d.fingerprint = ?")
+            parameters.append(fingerprint)
+        if algorithm is not None:
+            where.append("r.algorithm = ?")
+            parameters.append(algorithm)
+        rows = self.query(
+            "SELECT d.fingerprint, d.name, d.size, r.algorithm, COUNT(*), "
+            "SUM(r.result >= 0), AVG(r.comparisons), MIN(r.comparisons), MAX(r.comparisons), "
+            "AVG(r.seconds) "
+            "FROM runs r JOIN datasets d ON d.id = r.dataset "
+            + ("WHERE " + " AND ".join(where) + " " if where else "")
+            + "GROUP BY r.dataset, r.algorithm "
+            "ORDER BY d.size DESC, d.name, AVG(r.comparisons)", parameters)
+        return [Aggregate(*row) for row in rows]
+
+    def recent(self, limit=100, fingerprint=None):
+        """The latest runs, newest first, as dicts"""
+        rows = self.query(
+            "SELECT r.created, d.name, d.size, r.algorithm, r.target, r.result, r.comparisons, "
+            "r.seconds, r.source FROM runs r JOIN datasets d ON d.id = r.dataset "
+            + ("WHERE d.fingerprint = ? " if fingerprint is not None else "")
+            + "ORDER BY r.id DESC LIMIT ?",
+            ((fingerprint,) if fingerprint is not None else ()) + (limit,))
+        keys = ('created', 'name', 'size', 'algorithm', 'target', 'result', 'comparisons', 'seconds', 'source')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def count(self):
+        (total,) = self.query("SELECT COUNT(*) FROM runs")[0]
+        return total
@@ -0,0 +1,136 @@
+"""
+History Panel
+Window over the run history: per dataset and algorithm, how many runs,
+how many found their target, and the mean / min / max comparisons and
+mean wall time. Queries run on a worker thread against the indexed
+store, so a long history never blocks the Tk loop.
+"""
+
+import queue
+import tkinter as tk
+from threading import Thread
+from tkinter import ttk
+
+# How often the window checks for a finished query
+POLL_MS = 50
+
+COLUMNS = (
+    ("name", "Dataset", 200, "w"),
+    ("size", "Size", 90, "e"),
+    ("algorithm", "Algorithm", 170, "w"),
+    ("runs", "Runs", 70, "e"),
+    ("found", "Found", 70, "e"),
+    ("mean", "Mean Comparisons", 130, "e"),
+    ("min", "Min", 60, "e"),
+    ("max", "Max", 60, "e"),
+    ("us", "Mean µs", 90, "e")
+)
+
+
+class HistoryWindow:
+    """Aggregated run history, optionally limited to the current dataset"""
+
+    def __init__(self, root, colors, store, fingerprint):
+        self.root = root
+        self.store = store
+        # Called on the worker: the current array's fingerprint
+        self.fingerprint = fingerprint
+        self.results = queue.Queue()
+        self.job = None
+        self.window = tk.Toplevel(root)
+        self.window.title("🕘 Run History")
+        self.window.configure(bg=colors['bg'])
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        header = tk.Frame(self.window, bg=colors['bg'])
+        header.pack(fill=tk.X, padx=12, pady=(12, 6))
+        self.status = tk.Label(
+            header,
+            text="Loading…",
+            font=("Segoe UI", 11, "bold"),
+            bg=colors['bg'],
+            fg=colors['text']
+        )
+        self.status.pack(side=tk.LEFT)
+        tk.Button(
+            header,
+            text="↻ Refresh",
+            font=("Segoe UI", 10, "bold"),
+            bg=colors['primary'],
+            fg=colors['button_text'],
+            activebackground=colors['primary'],
+            relief=tk.FLAT,
+            cursor="hand2",
+            command=self.refresh
+        ).pack(side=tk.RIGHT)
+        self.current_only = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            header,
+            text="This dataset only",
+            variable=self.current_only,
+            command=self.refresh,
+            font=("Segoe UI", 10),
+            bg=colors['bg'],
+            fg=colors['text'],
+            selectcolor=colors['entry_bg'],
+            activebackground=colors['bg'],
+            activeforeground=colors['text']
+        ).pack(side=tk.RIGHT, padx=12)
+
+        self.table = ttk.Treeview(self.window, columns=[key for key, *_ in COLUMNS],
+                                  show="headings", height=18)
+        for key, heading, width, anchor in COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor=anchor)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
+
+        self.refresh()
+
+    def refresh(self):
+        """Re-run the summary query on a worker thread"""
+        self.status.config(text="Loading…")
+        thread = Thread(target=self.load, args=(self.current_only.get(),))
+        thread.daemon = True
+        thread.start()
+        if self.job is None:
+            self.job = self.root.after(POLL_MS, self.poll)
+
+    def load(self, current_only):
+        """Worker: commit pending runs, then aggregate them"""
+        try:
+            self.store.flush()
+            rows = self.store.summary(self.fingerprint() if current_only else None)
+            total = self.store.count()
+        except Exception as e:
+            # flush() re-raises whatever made the writer drop a batch
+            self.results.put((None, str(e)))
+        else:
+            self.results.put((rows, total))
+
+    def poll(self):
+        self.job = None
+        try:
+            rows, total = self.results.get_nowait()
+        except queue.Empty:
+            self.job = self.root.after(POLL_MS, self.poll)
+            return
+        if rows is None:
+            self.status.config(text=f"History unavailable: {total}")
+            return
+        self.show(rows, total)
+
+    def show(self, rows, total):
+        self.table.delete(*self.table.get_children())
+        for row in rows:
+            mean_us = "—" if row.mean_seconds is None else f"{row.mean_seconds * 1e6:,.1f}"
+            self.table.insert("", tk.END, values=(
+                row.name, f"{row.size:,}", row.algorithm, f"{row.runs:,}", f"{row.found:,}",
+                f"{row.mean_comparisons:,.2f}", row.min_comparisons, row.max_comparisons, mean_us
+            ))
+        shown = sum(row.runs for row in rows)
+        self.status.config(text=f"{shown:,} of {total:,} recorded runs")
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.window.destroy()
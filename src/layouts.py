@@ -0,0 +1,374 @@
+"""
+Search Layouts
+Precomputed index structures over a sorted array: Eytzinger (BFS) order,
+a static B-tree of cache-line-sized blocks and a piecewise-linear learned
+index. Each is built once per array, cached, and searched through the
+normal registry so traces, batch mode and benchmarks see them like any
+other algorithm. Trace indices always refer to the original array.
+"""
+
+import time
+from array import array
+from collections import OrderedDict
+
+from search_engine import CURRENT, VISITED, FOUND, DEFAULT, register
+
+# Keys per B-tree node: 8 x 8-byte (int64) keys fill one 64-byte cache line
+BTREE_BLOCK = 8
+
+# Elements per learned-index segment
+SEGMENT_SIZE = 256
+
+# Built layouts for the most recently searched arrays
+CACHE_SIZE = 8
+_cache = OrderedDict()
+
+
+class EytzingerLayout:
+    """Array stored in BFS order: the children of slot k are 2k and 2k + 1"""
+
+    def __init__(self, values):
+        n = len(values)
+        # order[k] = original index stored at slot k (slot 0 unused)
+        self.order = array('q', bytes(8 * (n + 1)))
+        self.keys = array('q', bytes(8 * (n + 1)))
+        # slots[i] = slot holding original index i, for the cache simulator
+        self.slots = array('q', bytes(8 * n))
+        stack = []
+        i = 0
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            self.order[k] = i
+            self.keys[k] = values[i]
+            self.slots[i] = k
+            i += 1
+            k = 2 * k + 1
+        self.n = n
+
+    def search(self, target, trace=None):
+        keys = self.keys
+        order = self.order
+        n = self.n
+        comparisons = 0
+        k = 1
+        while k <= n:
+            comparisons += 1
+            if trace is not None:
+                trace.add(order[k], CURRENT, comparisons, 5, 800)
+            if keys[k] < target:
+                if trace is not None:
+                    trace.add(order[k], VISITED, comparisons, 6, 400)
+                k = 2 * k + 1
+            else:
+                if trace is not None:
+                    trace.add(order[k], VISITED, comparisons, 8, 400)
+                k = 2 * k
+
+        # Strip the trailing right turns (and the last left one)
+        k >>= (~k & (k + 1)).bit_length()
+        if k > 0:
+            comparisons += 1
+            if trace is not None:
+                trace.add(order[k], CURRENT, comparisons, 11, 800)
+            if keys[k] == target:
+                if trace is not None:
+                    trace.add(order[k], FOUND, comparisons, 12)
+                return order[k], comparisons
+            if trace is not None:
+                trace.add(order[k], VISITED, comparisons, 11, 300)
+
+        if trace is not None:
+            trace.add(-1, DEFAULT, comparisons, 14, 500)
+        return -1, comparisons
+
+    def addresses(self, trace, element_size, region):
+        """Byte address of every probe: the key's slot in the BFS copy"""
+        slots = self.slots
+        return [region + slots[index] * element_size
+                for index, state in zip(trace.indices, trace.states)
+                if state == CURRENT and index >= 0]
+
+
+class BTreeLayout:
+    """Static B+-tree: leaves are the array itself, inner keys are block maxima"""
+
+    def __init__(self, values, block=BTREE_BLOCK):
+        self.values = values
+        self.block = block
+        n = len(values)
+        # levels[0] is the root; each level stores original indices of its keys
+        levels = []
+        level = array('q', (min((j + 1) * block, n) - 1 for j in range(-(-n // block))))
+        while len(level) > 1:
+            levels.append(level)
+            if len(level) <= block:
+                break
+            level = array('q', (level[min((j + 1) * block, len(level)) - 1]
+                                for j in range(-(-len(level) // block))))
+        levels.reverse()
+        self.levels = levels
+
+    def search(self, target, trace=None):
+        values = self.values
+        block = self.block
+        n = len(values)
+        comparisons = 0
+        node = 0
+
+        for level in self.levels:
+            start = node * block
+            for j in range(start, min(start + block, len(level))):
+                index = level[j]
+                comparisons += 1
+                if trace is not None:
+                    trace.add(index, CURRENT, comparisons, 5, 600)
+                if values[index] >= target:
+                    if trace is not None:
+                        trace.add(index, VISITED, comparisons, 8, 300)
+                    node = j
+                    break
+                if trace is not None:
+                    trace.add(index, VISITED, comparisons, 5, 200)
+            else:
+                if trace is not None:
+                    trace.add(-1, DEFAULT, comparisons, 7, 500)
+                return -1, comparisons
+
+        start = node * block
+        for index in range(start, min(start + block, n)):
+            comparisons += 1
+            value = values[index]
+            if trace is not None:
+                trace.add(index, CURRENT, comparisons, 11, 600)
+            if value >= target:
+                if value == target:
+                    if trace is not None:
+                        trace.add(index, FOUND, comparisons, 13)
+                    return index, comparisons
+                if trace is not None:
+                    trace.add(index, VISITED, comparisons, 14, 300)
+                    trace.add(-1, DEFAULT, comparisons, 14, 500)
+                return -1, comparisons
+            if trace is not None:
+                trace.add(index, VISITED, comparisons, 11, 200)
+
+        if trace is not None:
+            trace.add(-1, DEFAULT, comparisons, 15, 500)
+        return -1, comparisons
+
+    def addresses(self, trace, element_size, region):
+        """Byte address of every probe, as if inner keys were stored in their
+        nodes (level by level, after the leaves) instead of as indices"""
+        bases = []
+        offset = region
+        node = self.block * element_size
+        for level in self.levels:
+            bases.append(offset)
+            # Every level starts on a node boundary, so no node straddles two lines
+            offset += -(-len(level) // self.block) * node
+        addresses = []
+        depth = 0
+        j = 0
+        for index, state, line in zip(trace.indices, trace.states, trace.lines):
+            if index < 0:
+                continue
+            if line in (5, 8) and depth < len(self.levels):
+                # Inner node key j of the current level (see search())
+                if state == CURRENT:
+                    addresses.append(bases[depth] + j * element_size)
+                elif line == 8:
+                    depth += 1
+                    j *= self.block
+                else:
+                    j += 1
+            elif state == CURRENT:
+                addresses.append(index * element_size)
+        return addresses
+
+
+class LearnedLayout:
+    """Piecewise-linear model key -> position with a per-segment error bound"""
+
+    def __init__(self, values, segment_size=SEGMENT_SIZE):
+        self.values = values
+        n = len(values)
+        self.starts = array('q')
+        self.ends = array('q')
+        self.first_keys = array('q')
+        self.slopes = array('d')
+        self.intercepts = array('d')
+        self.errors = array('q')
+        for start in range(0, n, segment_size):
+            end = min(start + segment_size, n) - 1
+            k0, k1 = values[start], values[end]
+            slope = (end - start) / (k1 - k0) if k1 != k0 else 0.0
+            intercept = start - slope * k0
+            error = 0
+            for i in range(start, end + 1):
+                error = max(error, abs(round(slope * values[i] + intercept) - i))
+            self.starts.append(start)
+            self.ends.append(end)
+            self.first_keys.append(k0)
+            self.slopes.append(slope)
+            self.intercepts.append(intercept)
+            self.errors.append(error)
+
+    def search(self, target, trace=None):
+        values = self.values
+        comparisons = 0
+
+        # Root model: last segment whose first key <= target
+        lo, hi = 0, len(self.first_keys) - 1
+        segment = -1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if trace is not None:
+                trace.add(self.starts[mid], CURRENT, comparisons, 3, 500)
+                trace.add(self.starts[mid], VISITED, comparisons, 3, 200)
+            if self.first_keys[mid] <= target:
+                segment = mid
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if segment < 0:
+            if trace is not None:
+                trace.add(-1, DEFAULT, comparisons, 17, 500)
+            return -1, comparisons
+
+        pos = round(self.slopes[segment] * target + self.intercepts[segment])
+        lo = max(pos - self.errors[segment], self.starts[segment])
+        hi = min(pos + self.errors[segment], self.ends[segment])
+
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            value = values[mid]
+            if trace is not None:
+                trace.add(mid, CURRENT, comparisons, 10, 800)
+            if value == target:
+                if trace is not None:
+                    trace.add(mid, FOUND, comparisons, 11)
+                return mid, comparisons
+            elif value < target:
+                if trace is not None:
+                    trace.add(mid, VISITED, comparisons, 13, 400)
+                lo = mid + 1
+            else:
+                if trace is not None:
+                    trace.add(mid, VISITED, comparisons, 15, 400)
+                hi = mid - 1
+
+        if trace is not None:
+            trace.add(-1, DEFAULT, comparisons, 17, 500)
+        return -1, comparisons
+
+    def addresses(self, trace, element_size, region):
+        """Byte address of every probe: segment keys live in the model's own
+        table, window probes in the array"""
+        segments = {start: s for s, start in enumerate(self.starts)}
+        return [region + segments[index] * element_size if line == 3 else index * element_size
+                for index, state, line in zip(trace.indices, trace.states, trace.lines)
+                if state == CURRENT and index >= 0]
+
+
+# Registry name -> layout class
+LAYOUTS = {
+    "Eytzinger Search": EytzingerLayout,
+    "B-Tree Search": BTreeLayout,
+    "Learned Index Search": LearnedLayout
+}
+
+
+def get(name, values):
+    """Built layout of the given kind for values, from the cache when possible"""
+    key = (name, id(values), len(values))
+    entry = _cache.get(key)
+    # The cache holds a reference to values so its id cannot be reused
+    if entry is not None and entry[0] is values:
+        _cache.move_to_end(key)
+        return entry[1]
+    layout = LAYOUTS[name](values)
+    _cache[key] = (values, layout)
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return layout
+
+
+def clear():
+    """Drop every cached layout (and the arrays they keep alive)"""
+    _cache.clear()
+
+
+def prepare(name, values):
+    """Build (or fetch) the layout ahead of time; returns build seconds"""
+    if name not in LAYOUTS:
+        return 0.0
+    start = time.perf_counter()
+    get(name, values)
+    return time.perf_counter() - start
+
+
+@register("Eytzinger Search", """function eytzingerSearch(arr, target):
+    // b[1..n] holds arr in BFS order; children of k are 2k, 2k + 1
+    k = 1
+    while k <= n:
+        if b[k] < target:
+            k = 2k + 1 // Go right
+        else:
+            k = 2k // Go left
+
+    k = k >> (trailing ones of k + 1) // Undo the final right turns
+    if k > 0 and b[k] == target:
+        return original index of b[k] // Found!
+
+    return -1 // Not found""")
+def eytzinger_search(arr, target, trace=None):
+    """Eytzinger Search: branch-free descent over a BFS-ordered copy"""
+    return get("Eytzinger Search", arr).search(target, trace)
+
+
+@register("B-Tree Search", """function bTreeSearch(arr, target):
+    // Static B-tree: 8 keys per node, each key = max of its child
+    node = root
+    while node is internal:
+        j = first key in node with key >= target
+        if there is no such key:
+            return -1 // Not found
+        node = child j of node
+
+    for key in leaf node:
+        if key >= target:
+            if key == target:
+                return index of key // Found!
+            return -1 // Not found
+    return -1 // Not found""")
+def btree_search(arr, target, trace=None):
+    """B-Tree Search: scan one cache-line-sized node per level"""
+    return get("B-Tree Search", arr).search(target, trace)
+
+
+@register("Learned Index Search", """function learnedIndexSearch(arr, target):
+    // Segments of 256 keys, each with a line and its max error
+    s = last segment with firstKey[s] <= target // search the segments
+    pos = round(slope[s] * target + intercept[s])
+    lo = max(pos - err[s], start[s])
+    hi = min(pos + err[s], end[s])
+
+    while lo <= hi:
+        mid = floor((lo + hi) / 2)
+        if arr[mid] == target:
+            return mid // Found!
+        else if arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    return -1 // Not found""")
+def learned_index_search(arr, target, trace=None):
+    """Learned Index Search: predict the position, then search a bounded window"""
+    return get("Learned Index Search", arr).search(target, trace)
@@ -0,0 +1,274 @@
+"""
+Parallel Linear Search
+Splits an unsorted array into one shard per worker process over shared
+memory. Shards scan in chunks and stop early once an earlier shard has
+found the target, so the result is still the first occurrence. The
+registered "Parallel Linear Search" replays the same shard schedule in
+lockstep for the visualizer; without a trace it scans each shard a block
+at a time and works out the lockstep comparison count from where the
+shards hit.
+"""
+
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; chunks are scanned with array.index
+    np = None
+
+from search_engine import (CURRENT, VISITED, FOUND, DEFAULT, INDEX_NUMPY, INDEX_PYTHON,
+                           BatchResult, register, scan)
+
+DEFAULT_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+# Elements a worker scans between checks of the shared "best" index
+CHUNK = 1 << 16
+
+# Worker-process globals, set once by _attach()
+_worker = {}
+
+
+def shard_bounds(n, shards):
+    """[lo, hi) ranges of `shards` nearly equal contiguous shards"""
+    return [(n * s // shards, n * (s + 1) // shards) for s in range(shards)]
+
+
+def _attach(name, n, best):
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    _worker['shm'] = shm
+    _worker['n'] = n
+    _worker['best'] = best
+    if np is not None:
+        _worker['view'] = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+
+
+def _find(lo, hi, target):
+    """First index of target in [lo, hi), or -1"""
+    if np is not None:
+        hits = np.flatnonzero(_worker['view'][lo:hi] == target)
+        return lo + int(hits[0]) if len(hits) else -1
+    chunk = array('q')
+    chunk.frombytes(_worker['shm'].buf[lo * 8:hi * 8])
+    try:
+        return lo + chunk.index(target)
+    except ValueError:
+        return -1
+
+
+def _scan_shard(lo, hi, target):
+    """Worker: scan one shard; returns (first index or -1, elements examined)"""
+    best = _worker['best']
+    pos = lo
+    examined = 0
+    while pos < hi:
+        # Everything from here on lies after a hit some other shard already has
+        if pos > best.value:
+            break
+        end = min(pos + CHUNK, hi)
+        index = _find(pos, end, target)
+        if index >= 0:
+            with best.get_lock():
+                if index < best.value:
+                    best.value = index
+            return index, examined + index - pos + 1
+        examined += end - pos
+        pos = end
+    return -1, examined
+
+
+class ParallelScanner:
+    """Reusable process pool + shared-memory copy of an array"""
+
+    def __init__(self, values, workers=DEFAULT_WORKERS):
+        # Imported here: multiprocessing costs ~40 ms, which the GUI's
+        # lockstep simulation never needs at startup
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import Value, shared_memory
+        self.n = len(values)
+        self.workers = workers
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8, self.n * 8))
+        if np is not None:
+            np.ndarray((self.n,), dtype=np.int64, buffer=self.shm.buf)[:] = values
+        else:
+            self.shm.buf[:self.n * 8] = array('q', values).tobytes()
+        self.best = Value('q', self.n)
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(self.shm.name, self.n, self.best)
+        )
+
+    def search(self, target):
+        """First index of target (or -1) and the total elements examined"""
+        self.best.value = self.n
+        futures = [self.pool.submit(_scan_shard, lo, hi, target)
+                   for lo, hi in shard_bounds(self.n, self.workers) if hi > lo]
+        index = -1
+        comparisons = 0
+        for future in futures:
+            found, examined = future.result()
+            comparisons += examined
+            if found >= 0 and (index < 0 or found < index):
+                index = found
+        return index, comparisons
+
+    def close(self):
+        self.pool.shutdown()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@register("Parallel Linear Search", """function parallelLinearSearch(arr, target):
+    split arr into P shards, one per core
+    best = arr.length
+
+    in parallel, for each shard [lo, hi):
+        for i = lo to hi - 1:
+            if i > best:
+                stop // An earlier shard already found it
+            if arr[i] == target:
+                best = min(best, i) // Found!
+                stop
+
+    return best < arr.length ? best : -1""")
+def parallel_linear_search(arr, target, trace=None, shards=DEFAULT_WORKERS):
+    """Parallel Linear Search: the worker schedule replayed with all shards in lockstep"""
+    n = len(arr)
+    if trace is None:
+        return _lockstep_scan(arr, target, shards)
+    cursors = [lo for lo, hi in shard_bounds(n, shards) if hi > lo]
+    ends = [hi for lo, hi in shard_bounds(n, shards) if hi > lo]
+    best = n
+    comparisons = 0
+    active = list(range(len(cursors)))
+
+    while active:
+        round_start = len(trace) if trace is not None else 0
+        probed = []
+        still = []
+        for s in active:
+            i = cursors[s]
+            if i > best:
+                continue
+            comparisons += 1
+            if trace is not None:
+                trace.add(i, CURRENT, comparisons, 9)
+            if arr[i] == target:
+                best = min(best, i)
+                if trace is not None:
+                    trace.add(i, FOUND, comparisons, 10)
+                continue
+            probed.append(i)
+            cursors[s] = i + 1
+            if cursors[s] < ends[s]:
+                still.append(s)
+        if trace is not None:
+            # Hold the frame once per round so all cursors move together
+            if len(trace) > round_start:
+                trace.delays[-1] = 800
+            for i in probed:
+                trace.add(i, VISITED, comparisons, 6)
+            if probed:
+                trace.delays[-1] = 300
+        active = still
+
+    index = best if best < n else -1
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 13, 500)
+    return index, comparisons
+
+
+def _lockstep_scan(arr, target, shards):
+    """Result and comparison count of the lockstep schedule, without running it
+
+    In round r every live shard compares its element r. A shard stops
+    after its own hit, at its end, or in the round an earlier shard hits
+    (earlier shards go first within a round), so with `stop` the first
+    round any earlier shard hit, shard s compares min(length, hit + 1,
+    stop) elements. Each shard is only scanned as far as it can get.
+    """
+    index = -1
+    stop = None
+    comparisons = 0
+    for lo, hi in shard_bounds(len(arr), shards):
+        end = hi if stop is None else min(hi, lo + stop)
+        hit = scan(arr, target, lo, end) if end > lo else -1
+        if hit < 0:
+            comparisons += end - lo
+            continue
+        comparisons += hit - lo + 1
+        if index < 0:
+            index = hit
+        stop = hit - lo if stop is None else min(stop, hit - lo)
+    return index, comparisons
+
+
+def _parallel_index_numpy(arr, shards=DEFAULT_WORKERS):
+    """_lockstep_scan for every target: one first-occurrence table per shard"""
+    values = np.asarray(arr)
+    tables = []
+    for lo, hi in shard_bounds(len(values), shards):
+        if hi > lo:
+            tables.append((lo, hi) + np.unique(values[lo:hi], return_index=True))
+
+    def evaluate(targets):
+        targets = np.asarray(targets, dtype=np.int64)
+        indices = np.full(len(targets), -1, dtype=np.int64)
+        comparisons = np.zeros(len(targets), dtype=np.int64)
+        # First round an earlier shard hit; len(values) stands for "never"
+        stop = np.full(len(targets), len(values), dtype=np.int64)
+        for lo, hi, unique, first in tables:
+            pos = np.minimum(np.searchsorted(unique, targets), len(unique) - 1)
+            hit = unique[pos] == targets
+            offset = np.where(hit, first[pos], hi - lo)
+            comparisons += np.minimum(np.minimum(offset + hit, hi - lo), stop)
+            hit &= offset < stop
+            indices = np.where(hit & (indices < 0), lo + offset, indices)
+            stop = np.where(hit, offset, stop)
+        return BatchResult(targets, indices, comparisons)
+    return evaluate
+
+
+def _parallel_index_python(arr, shards=DEFAULT_WORKERS):
+    """_lockstep_scan for every target: one first-occurrence dict per shard"""
+    tables = []
+    for lo, hi in shard_bounds(len(arr), shards):
+        first = {}
+        for i in range(lo, hi):
+            first.setdefault(arr[i], i - lo)
+        tables.append((lo, hi, first))
+
+    def evaluate(targets):
+        targets = array('q', targets)
+        indices = array('q')
+        comparisons = array('q')
+        for target in targets:
+            index = -1
+            stop = None
+            count = 0
+            for lo, hi, first in tables:
+                end = hi - lo if stop is None else min(hi - lo, stop)
+                offset = first.get(target, -1)
+                if offset < 0 or offset >= end:
+                    count += end
+                    continue
+                count += offset + 1
+                if index < 0:
+                    index = lo + offset
+                stop = offset
+            indices.append(index)
+            comparisons.append(count)
+        return BatchResult(targets, indices, comparisons)
+    return evaluate
+
+
+INDEX_NUMPY["Parallel Linear Search"] = _parallel_index_numpy
+INDEX_PYTHON["Parallel Linear Search"] = _parallel_index_python
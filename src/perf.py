@@ -0,0 +1,188 @@
+"""
+Performance Monitor
+Samples the cost of every playback frame: compute (applying trace steps
+to the state model), render (canvas updates and Tk's redraw) and idle
+time between frames. A small HUD on the canvas shows the live numbers,
+and the raw samples can be exported as JSON.
+"""
+
+import json
+import platform
+import time
+from array import array
+
+# Frames kept; the oldest half is dropped once this many are stored
+MAX_SAMPLES = 20_000
+
+# Frames summarized by the live HUD, and how often it refreshes
+HUD_WINDOW = 120
+HUD_REFRESH_MS = 500
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class FrameMonitor:
+    """Column-oriented per-frame timings (seconds, perf_counter clock)"""
+
+    def __init__(self, capacity=MAX_SAMPLES):
+        self.capacity = capacity
+        self.runs = []
+        self.reset()
+
+    def reset(self):
+        self.starts = array('d')
+        self.steps = array('q')
+        self.compute = array('d')
+        self.render = array('d')
+        self.idle = array('d')
+        self.runs.clear()
+        self.last_end = None
+
+    def restart(self):
+        """A new playback begins: the gap since the last frame is not idle time"""
+        self.last_end = None
+
+    def record(self, start, computed, rendered, steps):
+        """One frame: started at start, model updated by computed, drawn by rendered"""
+        self.starts.append(start)
+        self.steps.append(steps)
+        self.compute.append(computed - start)
+        self.render.append(rendered - computed)
+        self.idle.append(start - self.last_end if self.last_end is not None else 0.0)
+        self.last_end = rendered
+        if len(self.starts) > self.capacity:
+            drop = len(self.starts) // 2
+            for column in (self.starts, self.steps, self.compute, self.render, self.idle):
+                del column[:drop]
+
+    def record_run(self, algorithm, size, seconds, steps):
+        """Time spent recording a whole trace on the worker thread"""
+        self.runs.append({
+            'algorithm': algorithm,
+            'size': size,
+            'compute_ms': seconds * 1000,
+            'steps': steps
+        })
+
+    def __len__(self):
+        return len(self.starts)
+
+    def summary(self, window=None):
+        """FPS, frame time stats and the mean of each phase over the last `window` frames"""
+        n = len(self.starts)
+        lo = max(0, n - window) if window else 0
+        count = n - lo
+        if not count:
+            return {'frames': 0, 'fps': 0.0, 'mean_frame_ms': 0.0, 'p99_frame_ms': 0.0,
+                    'mean_compute_ms': 0.0, 'mean_render_ms': 0.0, 'mean_idle_ms': 0.0,
+                    'steps_per_frame': 0.0}
+        compute = sum(self.compute[lo:n])
+        render = sum(self.render[lo:n])
+        idle = sum(self.idle[lo:n])
+        frames = sorted(c + r for c, r in zip(self.compute[lo:n], self.render[lo:n]))
+        elapsed = compute + render + idle
+        return {
+            'frames': count,
+            'fps': count / elapsed if elapsed > 0 else 0.0,
+            'mean_frame_ms': (compute + render) / count * 1000,
+            'p99_frame_ms': percentile(frames, 99) * 1000,
+            'mean_compute_ms': compute / count * 1000,
+            'mean_render_ms': render / count * 1000,
+            'mean_idle_ms': idle / count * 1000,
+            'steps_per_frame': sum(self.steps[lo:n]) / count
+        }
+
+    def export(self, path, **metadata):
+        """Write the summary, worker runs and every frame sample as JSON"""
+        origin = self.starts[0] if self.starts else 0.0
+        frames = [
+            {
+                't_ms': (start - origin) * 1000,
+                'steps': steps,
+                'compute_ms': compute * 1000,
+                'render_ms': render * 1000,
+                'idle_ms': idle * 1000
+            }
+            for start, steps, compute, render, idle
+            in zip(self.starts, self.steps, self.compute, self.render, self.idle)
+        ]
+        metadata.setdefault('python', platform.python_version())
+        metadata.setdefault('platform', platform.platform())
+        metadata.setdefault('created', time.strftime('%Y-%m-%dT%H:%M:%S'))
+        with open(path, 'w') as f:
+            json.dump({
+                'metadata': metadata,
+                'summary': self.summary(),
+                'runs': self.runs,
+                'frames': frames
+            }, f, indent=2)
+
+
+class PerfHud:
+    """Toggleable text overlay in the canvas corner showing live frame stats"""
+
+    def __init__(self, root, canvas, monitor, colors, width=1160):
+        self.root = root
+        self.canvas = canvas
+        self.monitor = monitor
+        self.colors = colors
+        self.width = width
+        self.item = None
+        self.job = None
+        self.visible = False
+
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        self.visible = True
+        if self.item is None:
+            self.item = self.canvas.create_text(
+                self.width - 8, 6,
+                anchor='ne',
+                justify='right',
+                font=("Consolas", 9),
+                fill=self.colors['index_text'],
+                tags=('hud',)
+            )
+        self.canvas.itemconfig(self.item, state='normal')
+        self.refresh()
+
+    def hide(self):
+        self.visible = False
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.item is not None:
+            self.canvas.itemconfig(self.item, state='hidden')
+
+    def text(self):
+        stats = self.monitor.summary(HUD_WINDOW)
+        items = len(self.canvas.find_all())
+        return (f"FPS {stats['fps']:.1f}  frame {stats['mean_frame_ms']:.2f} ms  "
+                f"p99 {stats['p99_frame_ms']:.2f} ms\n"
+                f"compute {stats['mean_compute_ms']:.2f}  render {stats['mean_render_ms']:.2f}  "
+                f"idle {stats['mean_idle_ms']:.1f} ms  {items:,} items")
+
+    def refresh(self):
+        self.job = None
+        if not self.visible:
+            return
+        self.canvas.itemconfig(self.item, text=self.text())
+        # Bars created after the HUD would otherwise cover it
+        self.canvas.tag_raise('hud')
+        self.job = self.root.after(HUD_REFRESH_MS, self.refresh)
+
+    def set_colors(self, colors):
+        self.colors = colors
+        if self.item is not None:
+            self.canvas.itemconfig(self.item, fill=colors['index_text'])
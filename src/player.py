@@ -0,0 +1,178 @@
+"""
+Trace Player
+Replays a recorded step trace on the Tk event loop: a root.after tick
+advances a virtual clock by real elapsed time x speed, so playback never
+drifts with render cost and can be paused, stepped or scrubbed
+"""
+
+import bisect
+import time
+from array import array
+
+# Target frame rate of the playback tick
+FPS = 60
+
+
+class TracePlayer:
+    """Plays a search_engine.Trace into an ArrayRenderer"""
+
+    def __init__(self, root, renderer, on_update=None, on_finish=None, monitor=None):
+        self.root = root
+        self.renderer = renderer
+        # Optional perf.FrameMonitor sampling the cost of every frame
+        self.monitor = monitor
+        self.on_update = on_update
+        self.on_finish = on_finish
+        self.speed = 1.0
+        self.trace = None
+        self.starts = array('q')
+        self.position = 0
+        self.clock = 0.0
+        self.playing = False
+        self.job = None
+        self.last_tick = 0.0
+        # Whether on_finish has fired for the current pass through the trace
+        self.ended = False
+
+    def load(self, trace, starts=None):
+        """Prepare a trace for playback from its first step (paused)
+
+        starts may be passed in precomputed (e.g. a memory-mapped column of
+        a trace file) to avoid a pass over every step before playing.
+        """
+        self.stop()
+        self.trace = trace
+        # starts[i]: ms into the run (at 1.0x) when step i is shown
+        if starts is None:
+            starts = array('q')
+            elapsed = 0
+            for delay in trace.delays:
+                starts.append(elapsed)
+                elapsed += delay
+        self.starts = starts
+        self.position = 0
+        self.clock = 0.0
+        self.ended = False
+
+    def __len__(self):
+        return len(self.trace) if self.trace is not None else 0
+
+    @property
+    def finished(self):
+        return self.trace is not None and self.position >= len(self.trace)
+
+    # ---- Transport ---------------------------------------------------
+
+    def play(self):
+        if self.trace is None or self.playing:
+            return
+        if self.finished:
+            self.seek(0)
+        self.playing = True
+        if self.monitor is not None:
+            self.monitor.restart()
+        self.last_tick = time.perf_counter()
+        self.job = self.root.after(0, self.tick)
+
+    def pause(self):
+        self.playing = False
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def stop(self):
+        """Pause and forget the loaded trace"""
+        self.pause()
+        self.trace = None
+        self.position = 0
+
+    def step_forward(self):
+        self.pause()
+        if not self.finished and self.trace is not None:
+            self.seek(self.position + 1)
+
+    def step_back(self):
+        self.pause()
+        if self.position > 0:
+            self.seek(self.position - 1)
+
+    def skip_to_end(self):
+        """Instant mode: jump straight to the final state"""
+        self.pause()
+        if self.trace is not None:
+            self.seek(len(self.trace))
+
+    # ---- Playback ----------------------------------------------------
+
+    def tick(self):
+        self.job = None
+        if not self.playing:
+            return
+        now = time.perf_counter()
+        self.clock += (now - self.last_tick) * 1000 * self.speed
+        self.last_tick = now
+        # Show every step whose start time has passed in one coalesced frame
+        target = bisect.bisect_right(self.starts, self.clock)
+        if target > self.position:
+            self.apply(self.position, target)
+        if self.finished:
+            self.end()
+            return
+        self.job = self.root.after(max(1, 1000 // FPS), self.tick)
+
+    def apply(self, start, end):
+        """Apply steps [start, end) with one canvas update per changed slot"""
+        if self.monitor is None:
+            self.renderer.sync(self.renderer.model.apply(self.trace, start, end))
+        else:
+            began = time.perf_counter()
+            changed = self.renderer.model.apply(self.trace, start, end)
+            computed = time.perf_counter()
+            self.renderer.sync(changed)
+            # Paint now so the redraw is part of this frame's render time
+            self.renderer.canvas.update_idletasks()
+            self.monitor.record(began, computed, time.perf_counter(), end - start)
+        self.position = end
+        self.notify()
+
+    def seek(self, position):
+        """Show the state right after `position` steps have been applied"""
+        if self.trace is None:
+            return
+        position = max(0, min(position, len(self.trace)))
+        if position >= self.position:
+            if position > self.position:
+                self.apply(self.position, position)
+        else:
+            # Going backwards: rebuild the states from the start of the trace,
+            # then recolor only the slots that differ from what is drawn
+            model = self.renderer.model
+            model.clear()
+            model.apply(self.trace, 0, position)
+            self.renderer.sync(None)
+            self.position = position
+            self.notify()
+        self.clock = float(self.starts[position]) if position < len(self.starts) else float(self.trace.total_delay())
+        if self.finished:
+            self.end()
+        else:
+            self.ended = False
+
+    def end(self):
+        """Stop at the last step and fire on_finish once per pass"""
+        self.pause()
+        if not self.ended:
+            self.ended = True
+            if self.on_finish is not None:
+                self.on_finish()
+
+    def notify(self):
+        if self.on_update is not None:
+            step = self.trace[self.position - 1] if self.position else None
+            self.on_update(self.position, step)
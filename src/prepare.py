@@ -0,0 +1,223 @@
+"""
+Array Preparation
+Makes arbitrary input searchable: one vectorized pass counts the
+ascending runs, then the cheapest strategy that sorts the data is picked
+- nothing, a reversal, a run merge, a full in-memory sort, or an external
+chunked merge sort for data that does not fit in memory.
+"""
+
+import atexit
+import heapq
+import operator
+import os
+import sys
+import tempfile
+import time
+from array import array
+from collections import namedtuple
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python paths use timsort
+    np = None
+
+import datasets
+
+# Elements compared per vectorized chunk, so a memory map is never
+# materialized as one giant boolean array
+CHECK_CHUNK = 1 << 22
+
+# Up to this many ascending runs a run-adaptive merge beats a full sort
+MAX_MERGE_RUNS = 64
+
+# Elements per sorted chunk (and per merge read buffer) of the external sort
+EXTERNAL_CHUNK = 1 << 24
+MERGE_BUFFER = 1 << 16
+
+STRATEGIES = ('none', 'reverse', 'merge', 'sort', 'external')
+
+Prepared = namedtuple('Prepared', 'values strategy runs seconds')
+
+
+def count_descents(values):
+    """Number of positions where the next value is smaller"""
+    n = len(values)
+    if n < 2:
+        return 0
+    if np is not None:
+        total = 0
+        for lo in range(0, n - 1, CHECK_CHUNK):
+            chunk = np.asarray(values[lo:min(n, lo + CHECK_CHUNK + 1)])
+            total += int(np.count_nonzero(chunk[1:] < chunk[:-1]))
+        return total
+    return sum(map(operator.gt, values, islice(values, 1, None)))
+
+
+def count_runs(values):
+    """Number of maximal ascending (non-decreasing) runs; 1 means sorted"""
+    return count_descents(values) + 1 if len(values) else 0
+
+
+def is_sorted(values):
+    return count_descents(values) == 0
+
+
+def available_memory():
+    """Bytes of physical memory currently free, or None if unknown"""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def plan(values, memory_limit=None):
+    """Pick the cheapest sorting strategy; returns (strategy, runs)"""
+    n = len(values)
+    descents = count_descents(values)
+    if descents == 0:
+        return 'none', min(n, 1)
+    runs = descents + 1
+    if descents == n - 1:
+        # Strictly decreasing
+        return 'reverse', runs
+    if memory_limit is None:
+        free = available_memory()
+        memory_limit = free // 2 if free else None
+    # An in-memory sort needs roughly a copy of the data
+    if memory_limit is not None and 8 * n > memory_limit:
+        return 'external', runs
+    if runs <= MAX_MERGE_RUNS:
+        return 'merge', runs
+    return 'sort', runs
+
+
+def prepare(values, memory_limit=None, out_path=None):
+    """Return a sorted version of values using the strategy plan() picks"""
+    start = time.perf_counter()
+    strategy, runs = plan(values, memory_limit)
+    if strategy == 'none':
+        result = values
+    elif strategy == 'reverse':
+        result = values[::-1] if np is not None and isinstance(values, np.ndarray) \
+            else array('q', reversed(values))
+    elif strategy == 'external':
+        result = external_sort(values, out_path)
+    elif np is not None:
+        # numpy's stable sort is a timsort, which merges existing runs
+        kind = 'stable' if strategy == 'merge' else None
+        result = np.sort(np.asarray(values, dtype=np.int64), kind=kind)
+    else:
+        # sorted() is a timsort too: it finds the runs and merges them
+        result = array('q', sorted(values))
+    return Prepared(result, strategy, runs, time.perf_counter() - start)
+
+
+def _write(f, data):
+    if sys.byteorder != 'little':
+        data = array('q', data)
+        data.byteswap()
+    f.write(data)
+
+
+def _read_sorted(path):
+    """Stream one sorted chunk file back in buffered blocks"""
+    with open(path, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, MERGE_BUFFER)
+            except EOFError:
+                pass
+            if sys.byteorder != 'little':
+                block.byteswap()
+            yield from block
+            if len(block) < MERGE_BUFFER:
+                return
+
+
+def external_sort(values, out_path=None, chunk=EXTERNAL_CHUNK, workdir=None):
+    """Sort chunks that fit in memory to temp files, then k-way merge them
+    into a raw int64 file; returns it memory-mapped
+
+    Without out_path the file is temporary: it is unlinked as soon as it
+    is mapped, so the space is freed when the map is released.
+    """
+    temporary = out_path is None
+    if temporary:
+        fd, out_path = tempfile.mkstemp(suffix='.i64', dir=workdir)
+        os.close(fd)
+    n = len(values)
+    parts = []
+    try:
+        for lo in range(0, n, chunk):
+            block = values[lo:min(n, lo + chunk)]
+            if np is not None:
+                block = array('q', np.sort(np.asarray(block, dtype=np.int64)).tobytes())
+            else:
+                block = array('q', sorted(block))
+            fd, part = tempfile.mkstemp(suffix='.part', dir=workdir)
+            with os.fdopen(fd, 'wb') as f:
+                _write(f, block)
+            parts.append(part)
+            del block
+
+        with open(out_path, 'wb') as f:
+            buffer = array('q')
+            for value in heapq.merge(*map(_read_sorted, parts)):
+                buffer.append(value)
+                if len(buffer) >= MERGE_BUFFER:
+                    _write(f, buffer)
+                    buffer = array('q')
+            _write(f, buffer)
+    except BaseException:
+        if temporary:
+            os.remove(out_path)
+        raise
+    finally:
+        for part in parts:
+            os.remove(part)
+    result = datasets.load_binary(out_path, 'int64')
+    if temporary:
+        try:
+            os.remove(out_path)
+        except OSError:
+            # Windows cannot delete a mapped file; try again at exit
+            atexit.register(_remove_quietly, out_path)
+    return result
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def run_bounds(values):
+    """Start of every ascending run, plus len(values) at the end"""
+    n = len(values)
+    if np is not None:
+        data = np.asarray(values)
+        starts = (np.flatnonzero(data[1:] < data[:-1]) + 1).tolist()
+    else:
+        starts = [i + 1 for i, descent in enumerate(map(operator.gt, values, islice(values, 1, None)))
+                  if descent]
+    return [0] + starts + [n] if n else [0]
+
+
+def merge_passes(values):
+    """Natural merge sort yielding the array after every pass, for visualizing"""
+    data = datasets.as_array(values)
+    bounds = run_bounds(data)
+    while len(bounds) > 2:
+        merged = array('q')
+        merged_bounds = [0]
+        for i in range(0, len(bounds) - 1, 2):
+            lo, mid = bounds[i], bounds[i + 1]
+            hi = bounds[i + 2] if i + 2 < len(bounds) else mid
+            merged.extend(heapq.merge(data[lo:mid], data[mid:hi]))
+            merged_bounds.append(hi)
+        data = merged
+        bounds = merged_bounds
+        yield data
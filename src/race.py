@@ -0,0 +1,201 @@
+"""
+Race Mode
+Runs two to four search algorithms on the same dataset side by side,
+advancing every lane by one probe per tick of a shared clock
+"""
+
+import tkinter as tk
+from tkinter import messagebox
+
+from search_engine import CURRENT
+from renderer import ArrayRenderer, value_bounds
+
+MIN_LANES = 2
+MAX_LANES = 4
+LANE_HEIGHT = 110
+
+# One probe per lane per tick, at 1.0x speed
+TICK_MS = 800
+
+
+class RacePicker:
+    """Small dialog for choosing which algorithms race"""
+
+    def __init__(self, root, colors, names, on_start):
+        self.on_start = on_start
+        self.window = tk.Toplevel(root)
+        self.window.title("🏁 Race Setup")
+        self.window.configure(bg=colors['bg'])
+        self.window.resizable(False, False)
+
+        tk.Label(
+            self.window,
+            text=f"Pick {MIN_LANES}–{MAX_LANES} algorithms",
+            font=("Segoe UI", 11, "bold"),
+            bg=colors['bg'],
+            fg=colors['text']
+        ).pack(anchor="w", padx=16, pady=(14, 8))
+
+        self.choices = {}
+        for i, name in enumerate(names):
+            var = tk.BooleanVar(value=i < MIN_LANES)
+            tk.Checkbutton(
+                self.window,
+                text=name,
+                variable=var,
+                font=("Segoe UI", 10),
+                bg=colors['bg'],
+                fg=colors['text'],
+                selectcolor=colors['entry_bg'],
+                activebackground=colors['bg'],
+                activeforeground=colors['text']
+            ).pack(anchor="w", padx=16)
+            self.choices[name] = var
+
+        tk.Button(
+            self.window,
+            text="🏁 Start Race",
+            font=("Segoe UI", 10, "bold"),
+            bg=colors['success'],
+            fg=colors['button_text'],
+            activebackground=colors['success'],
+            relief=tk.FLAT,
+            cursor="hand2",
+            command=self.start
+        ).pack(pady=14)
+
+    def start(self):
+        names = [name for name, var in self.choices.items() if var.get()]
+        if not MIN_LANES <= len(names) <= MAX_LANES:
+            messagebox.showwarning(
+                "Race Setup",
+                f"Select between {MIN_LANES} and {MAX_LANES} algorithms",
+                parent=self.window
+            )
+            return
+        self.window.destroy()
+        self.on_start(names)
+
+
+class Lane:
+    """One algorithm's canvas, counter and position in its trace"""
+
+    def __init__(self, name, result):
+        self.name = name
+        self.result = result
+        self.pos = 0
+        self.comparisons = 0
+        self.finish_tick = None
+
+    @property
+    def done(self):
+        return self.pos >= len(self.result.trace)
+
+    def advance(self):
+        """Apply steps up to and including the next probe frame"""
+        trace = self.result.trace
+        while self.pos < len(trace):
+            step = trace[self.pos]
+            self.pos += 1
+            if step.index >= 0:
+                self.renderer.set_state(step.index, step.state)
+            self.comparisons = step.comparisons
+            # Zero-delay probes share a frame with the next one (e.g. a whole block)
+            if step.state == CURRENT and step.delay:
+                break
+
+
+class RaceWindow:
+    """Stacked lanes sharing one animation clock, with a final leaderboard"""
+
+    def __init__(self, root, colors, array, target, results, speed, bounds=None):
+        self.root = root
+        self.colors = colors
+        self.speed = speed
+        self.tick = 0
+        self.window = tk.Toplevel(root)
+        self.window.title(f"🏁 Race — target {target}")
+        self.window.configure(bg=colors['bg'])
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.job = None
+
+        # Every lane scales its bars alike; work the bounds out once
+        bounds = bounds or value_bounds(array)
+        self.lanes = []
+        for name, result in results:
+            lane = Lane(name, result)
+            frame = tk.Frame(self.window, bg=colors['bg'])
+            frame.pack(fill=tk.X, padx=16, pady=(10, 0))
+            tk.Label(
+                frame,
+                text=name,
+                font=("Segoe UI", 11, "bold"),
+                bg=colors['bg'],
+                fg=colors['text']
+            ).pack(side=tk.LEFT)
+            lane.label = tk.Label(
+                frame,
+                text="Comparisons: 0",
+                font=("Segoe UI", 11),
+                bg=colors['bg'],
+                fg=colors['muted_text']
+            )
+            lane.label.pack(side=tk.RIGHT)
+            canvas = tk.Canvas(
+                self.window,
+                width=1160,
+                height=LANE_HEIGHT,
+                bg=colors['canvas_bg'],
+                highlightthickness=1,
+                highlightbackground=colors['card_border']
+            )
+            canvas.pack(padx=16, pady=(4, 0))
+            lane.renderer = ArrayRenderer(canvas, colors, height=LANE_HEIGHT)
+            lane.renderer.set_array(array, bounds)
+            self.lanes.append(lane)
+
+        self.leaderboard = tk.Label(
+            self.window,
+            text="",
+            font=("Consolas", 11),
+            justify=tk.LEFT,
+            bg=colors['bg'],
+            fg=colors['text']
+        )
+        self.leaderboard.pack(anchor="w", padx=16, pady=12)
+
+        self.job = self.root.after(TICK_MS // 2, self.step)
+
+    def interval(self):
+        return max(1, int(TICK_MS / self.speed()))
+
+    def step(self):
+        """One clock tick: every unfinished lane makes its next probe"""
+        self.job = None
+        self.tick += 1
+        for lane in self.lanes:
+            if lane.done:
+                continue
+            lane.advance()
+            lane.label.config(text=f"Comparisons: {lane.comparisons}")
+            if lane.done:
+                lane.finish_tick = self.tick
+                lane.label.config(fg=self.colors['found'] if lane.result.index >= 0 else self.colors['accent'])
+
+        if all(lane.done for lane in self.lanes):
+            self.show_leaderboard()
+        else:
+            self.job = self.root.after(self.interval(), self.step)
+
+    def show_leaderboard(self):
+        ranked = sorted(self.lanes, key=lambda lane: (lane.result.comparisons, lane.name))
+        rows = ["LEADERBOARD"]
+        for place, lane in enumerate(ranked, 1):
+            outcome = f"index {lane.result.index}" if lane.result.index >= 0 else "not found"
+            rows.append(f"{place}. {lane.name:<22} {lane.result.comparisons:>8,} comparisons   {outcome}")
+        self.leaderboard.config(text="\n".join(rows))
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+        self.window.destroy()
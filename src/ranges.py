@@ -0,0 +1,289 @@
+"""
+Range Queries
+Duplicate-aware searches over sorted data: lower_bound / upper_bound
+(first index not below / above a key), equal_range and counting the
+values in [low, high]. A range is found by two bound searches whose
+frontiers close in from both sides, one probe each per frame. The bound
+searches are registered like any other algorithm, and whole batches of
+ranges are evaluated in lockstep with NumPy when it is available.
+"""
+
+from array import array
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; batches fall back to one query at a time
+    np = None
+
+from search_engine import (CURRENT, VISITED, FOUND, DEFAULT, BATCH_NUMPY,
+                           BatchResult, Trace, register)
+
+# Matches up to this many elements are all marked found; longer runs only
+# get their two ends marked, so a huge count does not produce a huge trace
+RANGE_MARK_LIMIT = 1 << 12
+
+# One range query (start is the first index in range, count how many follow)
+RangeResult = namedtuple('RangeResult', 'start count comparisons trace')
+
+# Column-oriented result of many range queries
+RangeBatch = namedtuple('RangeBatch', 'lows highs starts counts comparisons')
+
+
+def parse_range(text):
+    """(low, high) from 'low..high', or None if text is not a range"""
+    low, sep, high = text.partition('..')
+    if not sep:
+        return None
+    low, high = int(low), int(high)
+    if low > high:
+        raise ValueError(f"Empty range: {text}")
+    return low, high
+
+
+def lower_bound(arr, target, trace=None):
+    """First index whose value is >= target (len(arr) if none); returns
+    (position, comparisons)"""
+    return _bound(arr, target, False, trace)
+
+
+def upper_bound(arr, target, trace=None):
+    """First index whose value is > target (len(arr) if none); returns
+    (position, comparisons)"""
+    return _bound(arr, target, True, trace)
+
+
+def _bound(arr, target, right, trace):
+    lo = 0
+    hi = len(arr)
+    comparisons = 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        comparisons += 1
+        value = arr[mid]
+        if trace is not None:
+            trace.add(mid, CURRENT, comparisons, 6, 800)
+        if value < target or (right and value == target):
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 8, 400)
+            lo = mid + 1
+        else:
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 10, 400)
+            hi = mid
+    return lo, comparisons
+
+
+def count_range(arr, low, high, trace=None):
+    """Values in [low, high]: returns (start, count, comparisons)
+
+    Both frontiers advance in the same round, so the trace shows them
+    converging on the two ends of the range at once.
+    """
+    # [lo, hi) brackets lower_bound(low); [lo2, hi2) brackets upper_bound(high)
+    lo, hi = 0, len(arr)
+    lo2, hi2 = 0, len(arr)
+    comparisons = 0
+    while lo < hi or lo2 < hi2:
+        probes = []
+        if lo < hi:
+            mid = (lo + hi) // 2
+            comparisons += 1
+            if arr[mid] < low:
+                lo = mid + 1
+            else:
+                hi = mid
+            probes.append((mid, 8, comparisons))
+        if lo2 < hi2:
+            mid2 = (lo2 + hi2) // 2
+            comparisons += 1
+            if arr[mid2] <= high:
+                lo2 = mid2 + 1
+            else:
+                hi2 = mid2
+            probes.append((mid2, 10, comparisons))
+        if trace is not None:
+            for i, (index, line, compared) in enumerate(probes):
+                # One frame per round: only the last probe holds it
+                trace.add(index, CURRENT, compared, line, 800 if i == len(probes) - 1 else 0)
+            for index, line, _ in probes:
+                trace.add(index, VISITED, comparisons, line, 200)
+
+    count = max(0, lo2 - lo)
+    if trace is not None:
+        if not count:
+            trace.add(-1, DEFAULT, comparisons, 15, 500)
+        elif count <= RANGE_MARK_LIMIT:
+            for index in range(lo, lo2):
+                trace.add(index, FOUND, comparisons, 14)
+        else:
+            trace.add(lo, FOUND, comparisons, 14)
+            trace.add(lo2 - 1, FOUND, comparisons, 14)
+    return lo, count, comparisons
+
+
+def equal_range(arr, target, trace=None):
+    """Every occurrence of target: returns (start, count, comparisons)"""
+    return count_range(arr, target, target, trace)
+
+
+def run_range(arr, low, high, record=True):
+    """Count the values in [low, high], recording the converging frontiers"""
+    trace = Trace() if record else None
+    start, count, comparisons = count_range(arr, low, high, trace)
+    return RangeResult(start, count, comparisons, trace)
+
+
+@register("Lower Bound", """function lowerBound(arr, target):
+    lo = 0
+    hi = arr.length // First index with arr[i] >= target is in [lo, hi]
+
+    while lo < hi:
+        mid = floor((lo + hi) / 2)
+        if arr[mid] < target:
+            lo = mid + 1 // Left frontier moves right
+        else:
+            hi = mid // Right frontier moves left
+
+    if lo < arr.length and arr[lo] == target:
+        return lo // First occurrence
+
+    return -1 // Not found""")
+def lower_bound_search(arr, target, trace=None):
+    """Lower Bound: the first occurrence of target, however many duplicates"""
+    lo, comparisons = lower_bound(arr, target, trace)
+    if lo < len(arr):
+        comparisons += 1
+        if arr[lo] == target:
+            if trace is not None:
+                trace.add(lo, FOUND, comparisons, 13)
+            return lo, comparisons
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 15, 500)
+    return -1, comparisons
+
+
+@register("Upper Bound", """function upperBound(arr, target):
+    lo = 0
+    hi = arr.length // First index with arr[i] > target is in [lo, hi]
+
+    while lo < hi:
+        mid = floor((lo + hi) / 2)
+        if arr[mid] <= target:
+            lo = mid + 1 // Left frontier moves right
+        else:
+            hi = mid // Right frontier moves left
+
+    if lo > 0 and arr[lo - 1] == target:
+        return lo - 1 // Last occurrence
+
+    return -1 // Not found""")
+def upper_bound_search(arr, target, trace=None):
+    """Upper Bound: the last occurrence of target, however many duplicates"""
+    lo, comparisons = upper_bound(arr, target, trace)
+    if lo > 0:
+        comparisons += 1
+        if arr[lo - 1] == target:
+            if trace is not None:
+                trace.add(lo - 1, FOUND, comparisons, 13)
+            return lo - 1, comparisons
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 15, 500)
+    return -1, comparisons
+
+
+@register("Equal Range", """function equalRange(arr, low, high = low):
+    // Two frontiers close in on both ends, one probe each per round
+    lo, hi = 0, arr.length // lowerBound(low) is in [lo, hi]
+    lo2, hi2 = 0, arr.length // upperBound(high) is in [lo2, hi2]
+
+    while lo < hi or lo2 < hi2:
+        mid = floor((lo + hi) / 2)
+        if arr[mid] < low: lo = mid + 1 else: hi = mid
+        mid2 = floor((lo2 + hi2) / 2)
+        if arr[mid2] <= high: lo2 = mid2 + 1 else: hi2 = mid2
+
+    count = lo2 - lo
+    if count > 0:
+        return [lo, lo2) // Found count values!
+    return -1 // Not found""")
+def equal_range_search(arr, target, trace=None):
+    """Equal Range: every occurrence of target; returns the first"""
+    start, count, comparisons = equal_range(arr, target, trace)
+    return (start if count else -1), comparisons
+
+
+def _bounds_numpy(values, keys, right):
+    """lower_bound (or upper_bound) of every key in lockstep; returns
+    (positions, comparisons) counted exactly like _bound"""
+    m = len(keys)
+    lo = np.zeros(m, dtype=np.int64)
+    hi = np.full(m, len(values), dtype=np.int64)
+    comparisons = np.zeros(m, dtype=np.int64)
+    active = np.flatnonzero(lo < hi)
+    while active.size:
+        mid = (lo[active] + hi[active]) // 2
+        comparisons[active] += 1
+        probe = values[mid]
+        wanted = keys[active]
+        go_right = probe <= wanted if right else probe < wanted
+        lo[active[go_right]] = mid[go_right] + 1
+        hi[active[~go_right]] = mid[~go_right]
+        active = active[lo[active] < hi[active]]
+    return lo, comparisons
+
+
+def _lower_bound_batch_numpy(arr, targets):
+    values = np.asarray(arr)
+    targets = np.asarray(targets, dtype=np.int64)
+    n = len(values)
+    pos, comparisons = _bounds_numpy(values, targets, False)
+    inside = pos < n
+    hit = inside & (values[np.minimum(pos, max(n - 1, 0))] == targets) if n else inside
+    return BatchResult(targets, np.where(hit, pos, -1), comparisons + inside)
+
+
+def _upper_bound_batch_numpy(arr, targets):
+    values = np.asarray(arr)
+    targets = np.asarray(targets, dtype=np.int64)
+    n = len(values)
+    pos, comparisons = _bounds_numpy(values, targets, True)
+    inside = pos > 0
+    hit = inside & (values[np.maximum(pos - 1, 0)] == targets) if n else inside
+    return BatchResult(targets, np.where(hit, pos - 1, -1), comparisons + inside)
+
+
+def _equal_range_batch_numpy(arr, targets):
+    values = np.asarray(arr)
+    targets = np.asarray(targets, dtype=np.int64)
+    start, first = _bounds_numpy(values, targets, False)
+    end, second = _bounds_numpy(values, targets, True)
+    return BatchResult(targets, np.where(end > start, start, -1), first + second)
+
+
+def batch_range(arr, lows, highs):
+    """Count the values in every [lows[i], highs[i]] without tracing"""
+    if np is not None:
+        values = np.asarray(arr)
+        lows = np.asarray(lows, dtype=np.int64)
+        highs = np.asarray(highs, dtype=np.int64)
+        start, first = _bounds_numpy(values, lows, False)
+        end, second = _bounds_numpy(values, highs, True)
+        return RangeBatch(lows, highs, start, np.maximum(end - start, 0), first + second)
+
+    lows = array('q', lows)
+    highs = array('q', highs)
+    starts = array('q')
+    counts = array('q')
+    comparisons = array('q')
+    for low, high in zip(lows, highs):
+        start, count, compared = count_range(arr, low, high)
+        starts.append(start)
+        counts.append(count)
+        comparisons.append(compared)
+    return RangeBatch(lows, highs, starts, counts, comparisons)
+
+
+BATCH_NUMPY["Lower Bound"] = _lower_bound_batch_numpy
+BATCH_NUMPY["Upper Bound"] = _upper_bound_batch_numpy
+BATCH_NUMPY["Equal Range"] = _equal_range_batch_numpy
@@ -0,0 +1,347 @@
+"""
+Array Renderer
+Draws an array of any size onto a Tk canvas: small arrays get the classic
+labelled boxes, larger ones plain bars, and anything wider than the canvas
+is binned so each pixel column stands for a range of elements
+"""
+
+from search_engine import (DEFAULT, CURRENT, VISITED, FOUND, HIT, MISS, STATE_NAMES, SearchState,
+                           _numpy_view)
+
+# Layout of the classic labelled view (matches the original 10-box layout).
+# Vertical positions are for a 200px canvas and scale with the real height.
+LAYOUT_HEIGHT = 200
+MARGIN_X = 50
+MAX_SLOT = 100
+BOX_Y = 100
+BOX_HEIGHT = 60
+
+# Below this slot width value/index labels are no longer readable
+LABEL_MIN_SLOT = 36
+
+# Bars in dense mode grow from this baseline
+BASELINE_Y = 185
+MIN_BAR_HEIGHT = 6
+MAX_BAR_HEIGHT = 150
+
+# Arrays up to this size always get an exact min/max scan
+EXACT_BOUNDS_LIMIT = 4096
+
+
+def looks_sorted(array):
+    """Cheap sortedness probe used to avoid a full min/max scan"""
+    n = len(array)
+    step = max(1, n // 64)
+    samples = [array[i] for i in range(0, n, step)] + [array[-1]]
+    return all(a <= b for a, b in zip(samples, samples[1:]))
+
+
+def value_bounds(array):
+    """(min, max) for scaling bars: the two ends of sorted-looking data,
+    otherwise a full scan (vectorized when numpy can view the array).
+    Slow on huge unsorted lists, so callers work it out off the Tk thread."""
+    if not len(array):
+        return 0, 0
+    if len(array) > EXACT_BOUNDS_LIMIT and looks_sorted(array):
+        return min(array[0], array[-1]), max(array[0], array[-1])
+    view = _numpy_view(array)
+    if view is not None:
+        return int(view.min()), int(view.max())
+    return min(array), max(array)
+
+
+class ArrayRenderer:
+    """Canvas view over a SearchState with a zoomable window"""
+
+    def __init__(self, canvas, colors, width=1160, height=200):
+        self.width = width
+        self.height = height
+        self.sy = height / LAYOUT_HEIGHT
+        self.model = SearchState()
+        # State each drawn slot currently shows, diffed before touching Tk
+        self.shown = bytearray()
+        self.view_lo = 0
+        self.view_hi = 0
+        self.vmin = 0
+        self.vmax = 0
+        # Persistent item pools, reused across redraws instead of delete("all")
+        self.bar_items = []
+        self.value_items = []
+        self.index_items = []
+        self.axis_items = []
+        self.slots_drawn = 0
+        self.attach(canvas, colors)
+
+    def attach(self, canvas, colors):
+        """Bind to a (possibly new) canvas and color scheme"""
+        self.canvas = canvas
+        self.colors = colors
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom(0.5, e.x))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom(2.0, e.x))
+        self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.set_view(0, len(self.array)))
+
+    @property
+    def array(self):
+        return self.model.values
+
+    @property
+    def states(self):
+        return self.model.states
+
+    def set_array(self, array, bounds=None):
+        """Show a new array, clearing all states and the zoom window;
+        bounds is its value_bounds() if already known"""
+        self.model = SearchState(array)
+        self.vmin, self.vmax = bounds or value_bounds(array)
+        self.set_view(0, len(array))
+
+    # ---- View window -------------------------------------------------
+
+    def set_view(self, lo, hi):
+        """Show elements [lo, hi) and redraw"""
+        n = len(self.array)
+        lo = max(0, min(lo, n))
+        hi = max(lo, min(hi, n))
+        if hi - lo < 1 and n:
+            hi = min(n, lo + 1)
+        self.view_lo, self.view_hi = lo, hi
+        self.draw()
+
+    def zoom(self, factor, x):
+        """Zoom the window by factor around canvas x-coordinate x"""
+        count = self.view_hi - self.view_lo
+        if not count:
+            return
+        anchor = self.index_at(x)
+        new_count = max(1, min(len(self.array), int(count * factor)))
+        if new_count == count:
+            return
+        frac = (anchor - self.view_lo) / count
+        lo = int(anchor - frac * new_count)
+        lo = max(0, min(lo, len(self.array) - new_count))
+        self.set_view(lo, lo + new_count)
+
+    def on_wheel(self, event):
+        self.zoom(0.5 if event.delta > 0 else 2.0, event.x)
+
+    def on_drag_start(self, event):
+        self.drag_x = event.x
+        self.drag_lo = self.view_lo
+
+    def on_drag(self, event):
+        count = self.view_hi - self.view_lo
+        if not count:
+            return
+        per_pixel = count / (self.width - 2 * MARGIN_X)
+        lo = int(self.drag_lo - (event.x - self.drag_x) * per_pixel)
+        lo = max(0, min(lo, len(self.array) - count))
+        if lo != self.view_lo:
+            self.set_view(lo, lo + count)
+
+    # ---- Geometry ----------------------------------------------------
+
+    def slot_count(self):
+        """Number of drawn slots: one per element, or one per pixel column"""
+        return min(self.view_hi - self.view_lo, self.width - 2 * MARGIN_X)
+
+    def slot_width(self):
+        slots = self.slot_count()
+        if not slots:
+            return 0
+        return min(MAX_SLOT, (self.width - 2 * MARGIN_X) / slots)
+
+    def slot_range(self, slot):
+        """Array index range [a, b) covered by a slot"""
+        count = self.view_hi - self.view_lo
+        slots = self.slot_count()
+        a = self.view_lo + slot * count // slots
+        b = self.view_lo + (slot + 1) * count // slots
+        return a, max(b, a + 1)
+
+    def slot_of(self, index):
+        """Slot showing array index, or None when it is outside the window"""
+        if not self.view_lo <= index < self.view_hi:
+            return None
+        # Exact inverse of slot_range(): the last slot starting at or before index
+        return ((index - self.view_lo + 1) * self.slot_count() - 1) // (self.view_hi - self.view_lo)
+
+    def index_at(self, x):
+        slot_w = self.slot_width()
+        if not slot_w:
+            return self.view_lo
+        slot = int((x - MARGIN_X) // slot_w)
+        slot = max(0, min(slot, self.slot_count() - 1))
+        return self.slot_range(slot)[0]
+
+    def bar_height(self, value):
+        span = self.vmax - self.vmin
+        if span <= 0:
+            return MAX_BAR_HEIGHT * self.sy
+        return (MIN_BAR_HEIGHT + (value - self.vmin) * (MAX_BAR_HEIGHT - MIN_BAR_HEIGHT) / span) * self.sy
+
+    def slot_state(self, slot):
+        """Most important state among the elements of a slot"""
+        a, b = self.slot_range(slot)
+        if b - a == 1:
+            return self.states[a]
+        segment = self.states[a:b]
+        for state in (FOUND, CURRENT, MISS, HIT, VISITED):
+            if state in segment:
+                return state
+        return DEFAULT
+
+    def state_color(self, state):
+        return self.colors[STATE_NAMES[state]]
+
+    # ---- Drawing -----------------------------------------------------
+
+    def pooled(self, pool, i, kind, coords, **options):
+        """Reuse pool item i (or create it) with new coords and options"""
+        if i < len(pool):
+            item = pool[i]
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, state='normal', **options)
+        else:
+            create = self.canvas.create_rectangle if kind == 'rect' else self.canvas.create_text
+            item = create(*coords, **options)
+            pool.append(item)
+        return item
+
+    def hide(self, pool, start):
+        for item in pool[start:]:
+            self.canvas.itemconfig(item, state='hidden')
+
+    def draw(self):
+        """Lay out the visible window, reusing pooled canvas items"""
+        slots = self.slot_count()
+        self.slots_drawn = slots
+        self.shown = bytearray(slots)
+        slot_w = self.slot_width()
+        labelled = slots and slot_w >= LABEL_MIN_SLOT
+
+        for slot in range(slots):
+            a, b = self.slot_range(slot)
+            x = MARGIN_X + slot * slot_w
+            state = self.slot_state(slot)
+            self.shown[slot] = state
+            if labelled:
+                bar_w = slot_w * 0.8
+                box_y = BOX_Y * self.sy
+                box_h = BOX_HEIGHT * self.sy
+                self.pooled(
+                    self.bar_items, slot, 'rect',
+                    (x, box_y, x + bar_w, box_y + box_h),
+                    fill=self.state_color(state),
+                    outline=self.colors['bar_outline'],
+                    width=2,
+                    tags=('bar', f'state-{STATE_NAMES[state]}')
+                )
+                self.pooled(
+                    self.value_items, slot, 'text',
+                    (x + bar_w / 2, box_y + box_h / 2),
+                    text=str(self.array[a]),
+                    font=("Segoe UI", 16 if slot_w >= 80 else 10, "bold"),
+                    fill=self.colors['canvas_text'],
+                    tags=('value',)
+                )
+                self.pooled(
+                    self.index_items, slot, 'text',
+                    (x + bar_w / 2, box_y - 15),
+                    text=str(a),
+                    font=("Segoe UI", 11 if slot_w >= 80 else 8),
+                    fill=self.colors['index_text'],
+                    tags=('index',)
+                )
+            else:
+                bar_w = slot_w * 0.8 if slot_w >= 4 else slot_w
+                baseline = BASELINE_Y * self.sy
+                top = baseline - self.bar_height(self.array[b - 1])
+                self.pooled(
+                    self.bar_items, slot, 'rect',
+                    (x, top, x + bar_w, baseline),
+                    fill=self.state_color(state),
+                    outline=self.colors['bar_outline'],
+                    width=0,
+                    tags=('bar', f'state-{STATE_NAMES[state]}')
+                )
+
+        self.hide(self.bar_items, slots)
+        self.hide(self.value_items, slots if labelled else 0)
+        self.hide(self.index_items, slots if labelled else 0)
+        if slots and not labelled:
+            self.draw_axis()
+        else:
+            self.hide(self.axis_items, 0)
+
+    def draw_axis(self):
+        """Index ticks for the dense view, where per-bar labels are skipped"""
+        ticks = 6
+        span = self.width - 2 * MARGIN_X
+        for t in range(ticks):
+            x = MARGIN_X + span * t / (ticks - 1)
+            index = self.index_at(min(x, self.width - MARGIN_X - 1))
+            self.pooled(
+                self.axis_items, t, 'text',
+                (x, 15 * self.sy),
+                text=f"{index:,}",
+                font=("Segoe UI", 9),
+                fill=self.colors['index_text'],
+                tags=('axis',)
+            )
+
+    def recolor_slot(self, slot):
+        state = self.slot_state(slot)
+        if state == self.shown[slot]:
+            return
+        self.shown[slot] = state
+        self.canvas.itemconfig(self.bar_items[slot],
+                               fill=self.state_color(state),
+                               tags=('bar', f'state-{STATE_NAMES[state]}'))
+
+    def set_state(self, index, state):
+        """Record a bar state and recolor the slot that shows it"""
+        self.model.set(index, state)
+        slot = self.slot_of(index)
+        if slot is not None:
+            self.recolor_slot(slot)
+
+    def sync(self, changed):
+        """Recolor the slots of changed indices (None: every visible slot)"""
+        if changed is None:
+            slots = range(self.slots_drawn)
+        else:
+            slots = {self.slot_of(index) for index in changed}
+            slots.discard(None)
+        for slot in slots:
+            self.recolor_slot(slot)
+
+    def reset(self):
+        """Clear every state back to default, touching only dirty bars"""
+        changed = self.model.clear()
+        if changed is None:
+            # Too much changed to track: clear all bars with a few tag calls
+            for name in STATE_NAMES[1:]:
+                self.canvas.dtag('bar', f'state-{name}')
+            self.canvas.addtag_withtag('state-default', 'bar')
+            self.canvas.itemconfig('bar', fill=self.colors['default'])
+            self.shown = bytearray(self.slots_drawn)
+        else:
+            self.sync(changed)
+
+    def set_colors(self, colors):
+        """Switch palette by rewriting colors per tag, not per item"""
+        self.colors = colors
+        for name in STATE_NAMES:
+            self.canvas.itemconfig(f'state-{name}', fill=colors[name])
+        self.canvas.itemconfig('bar', outline=colors['bar_outline'])
+        self.canvas.itemconfig('value', fill=colors['canvas_text'])
+        self.canvas.itemconfig('index', fill=colors['index_text'])
+        self.canvas.itemconfig('axis', fill=colors['index_text'])
+
+    def set_states(self, states):
+        """Replace every state at once (e.g. when scrubbing)"""
+        self.model.replace(states)
+        self.sync(None)
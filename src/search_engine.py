@@ -0,0 +1,864 @@
+"""
+Search Engine - headless core
+Runs the search algorithms without Tk and records a compact step trace
+that the GUI (or anything else) can replay
+"""
+
+import math
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; batch mode falls back to pure Python
+    np = None
+
+# Bar states, stored as small ints so a trace costs one byte per state.
+# HIT / MISS replace VISITED when a run is colored by the cache simulator.
+DEFAULT, CURRENT, VISITED, FOUND, HIT, MISS = 0, 1, 2, 3, 4, 5
+STATE_NAMES = ('default', 'current', 'visited', 'found', 'hit', 'miss')
+
+# A single step event: which bar, what it becomes, the running comparison
+# count, the 1-based pseudocode line being executed and how long (in ms at
+# 1.0x speed) the visualizer should hold the frame afterwards
+Step = namedtuple('Step', 'index state comparisons line delay')
+
+SearchResult = namedtuple('SearchResult', 'index comparisons trace')
+
+# Column-oriented result of a batch run, one entry per target
+BatchResult = namedtuple('BatchResult', 'targets indices comparisons')
+
+# Past this many non-default elements a SearchState stops tracking them
+# individually and a clear resets the whole state array instead
+MAX_DIRTY = 4096
+
+# Elements compared per vectorized block by scan()
+SCAN_BLOCK = 1 << 16
+
+# Block width of the visual Block Linear Search: 8 x int64 = one 512-bit vector
+VISUAL_BLOCK = 8
+
+# Trace steps a ResultCache may hold in total (~20 bytes each, so ~40 MB)
+CACHE_MAX_STEPS = 2_000_000
+
+# Algorithm registry: display name -> search function / pseudocode text.
+# Search functions take (arr, target, trace=None) and return
+# (index, comparisons), recording step events into trace when given one.
+ALGORITHMS = {}
+PSEUDOCODE = {}
+
+
+def register(name, pseudocode):
+    """Decorator adding a search function to the algorithm registry"""
+    def decorator(search):
+        ALGORITHMS[name] = search
+        PSEUDOCODE[name] = pseudocode
+        return search
+    return decorator
+
+
+class Trace:
+    """Column-oriented list of step events (one array per field)"""
+
+    __slots__ = ('indices', 'states', 'comparisons', 'lines', 'delays')
+
+    def __init__(self):
+        self.indices = array('q')
+        self.states = bytearray()
+        self.comparisons = array('q')
+        self.lines = bytearray()
+        self.delays = array('H')
+
+    def add(self, index, state, comparisons, line, delay=0):
+        """Append one step event"""
+        self.indices.append(index)
+        self.states.append(state)
+        self.comparisons.append(comparisons)
+        self.lines.append(line)
+        self.delays.append(delay)
+
+    def __len__(self):
+        return len(self.states)
+
+    def __getitem__(self, i):
+        return Step(self.indices[i], self.states[i], self.comparisons[i],
+                    self.lines[i], self.delays[i])
+
+    def __iter__(self):
+        return map(Step, self.indices, self.states, self.comparisons,
+                   self.lines, self.delays)
+
+    def total_delay(self):
+        """Animation time of the whole trace in ms at 1.0x speed"""
+        return sum(self.delays)
+
+
+class SearchState:
+    """Values being searched plus one state byte per element
+
+    The whole visual state of a run lives in `states`; views compare it
+    against what they last drew instead of keeping per-element objects.
+    """
+
+    __slots__ = ('values', 'states', 'dirty')
+
+    def __init__(self, values=()):
+        self.values = values
+        self.states = bytearray(len(values))
+        # Indices whose state is not DEFAULT; None once too many to track
+        self.dirty = set()
+
+    def __len__(self):
+        return len(self.states)
+
+    def set(self, index, state):
+        self.states[index] = state
+        if self.dirty is not None and state != DEFAULT:
+            self.dirty.add(index)
+            if len(self.dirty) > MAX_DIRTY:
+                self.dirty = None
+
+    def apply(self, trace, start, end):
+        """Apply steps [start, end) of a trace; returns the indices that changed"""
+        states = self.states
+        changed = set()
+        for i in range(start, end):
+            index = trace.indices[i]
+            if index >= 0 and states[index] != trace.states[i]:
+                self.set(index, trace.states[i])
+                changed.add(index)
+        return changed
+
+    def clear(self):
+        """Reset every state to DEFAULT; returns the indices that changed (None: all)"""
+        dirty = self.dirty
+        if dirty is None:
+            self.states[:] = bytes(len(self.states))
+        else:
+            for index in dirty:
+                self.states[index] = DEFAULT
+        self.dirty = set()
+        return dirty
+
+    def replace(self, states):
+        """Take over a whole state array (e.g. a snapshot while scrubbing)"""
+        self.states[:] = states
+        self.dirty = None if any(states) else set()
+
+
+@register("Binary Search", """function binarySearch(arr, target):
+    left = 0
+    right = arr.length - 1
+
+    while left <= right:
+        mid = floor((left + right) / 2)
+
+        if arr[mid] == target:
+            return mid // Found!
+
+        else if arr[mid] < target:
+            left = mid + 1 // Search right
+
+        else:
+            right = mid - 1 // Search left
+
+    return -1 // Not found""")
+def binary_search(arr, target, trace=None):
+    """Binary Search Algorithm"""
+    left = 0
+    right = len(arr) - 1
+    comparisons = 0
+
+    while left <= right:
+        mid = (left + right) // 2
+        comparisons += 1
+        value = arr[mid]
+
+        if trace is not None:
+            trace.add(mid, CURRENT, comparisons, 8, 800)
+
+        if value == target:
+            if trace is not None:
+                trace.add(mid, FOUND, comparisons, 9)
+            return mid, comparisons
+        elif value < target:
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 12, 400)
+            left = mid + 1
+        else:
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 15, 400)
+            right = mid - 1
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 17, 500)
+    return -1, comparisons
+
+
+@register("Linear Search", """function linearSearch(arr, target):
+    for i = 0 to arr.length - 1:
+
+        if arr[i] == target:
+            return i // Found!
+
+    return -1 // Not found""")
+def linear_search(arr, target, trace=None):
+    """Linear Search Algorithm"""
+    if trace is None:
+        # Nothing to animate: scan whole blocks instead of element by element
+        index = scan(arr, target)
+        return index, index + 1 if index >= 0 else len(arr)
+
+    comparisons = 0
+
+    for i in range(len(arr)):
+        comparisons += 1
+
+        if trace is not None:
+            trace.add(i, CURRENT, comparisons, 4, 800)
+
+        if arr[i] == target:
+            if trace is not None:
+                trace.add(i, FOUND, comparisons, 5)
+            return i, comparisons
+        elif trace is not None:
+            trace.add(i, VISITED, comparisons, 4, 300)
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 7, 500)
+    return -1, comparisons
+
+
+def _numpy_view(arr):
+    """Zero-copy ndarray over arr, or None when that is not possible"""
+    if np is None:
+        return None
+    if isinstance(arr, np.ndarray):
+        return arr
+    code = getattr(arr, 'typecode', None) or getattr(arr, 'format', None)
+    if code in ('q', 'i', 'l', 'h', 'b'):
+        return np.frombuffer(arr, dtype=np.dtype(code))
+    return None
+
+
+def scan(arr, target, lo=0, hi=None):
+    """First index of target in arr[lo:hi], or -1, compared a block at a time
+
+    With numpy each block is one vectorized equality; otherwise the C-level
+    list/array .index() does the block's loop.
+    """
+    hi = len(arr) if hi is None else hi
+    view = _numpy_view(arr)
+    if view is not None:
+        for start in range(lo, hi, SCAN_BLOCK):
+            hits = np.flatnonzero(view[start:min(hi, start + SCAN_BLOCK)] == target)
+            if len(hits):
+                return start + int(hits[0])
+        return -1
+    if isinstance(arr, memoryview):
+        for start in range(lo, hi, SCAN_BLOCK):
+            block = array(arr.format)
+            block.frombytes(arr[start:min(hi, start + SCAN_BLOCK)].cast('B'))
+            try:
+                return start + block.index(target)
+            except ValueError:
+                continue
+        return -1
+    try:
+        return arr.index(target, lo, hi)
+    except ValueError:
+        return -1
+
+
+@register("Block Linear Search", """function blockLinearSearch(arr, target):
+    // B elements are compared at once (one vector instruction)
+    for start = 0 to arr.length - 1 step B:
+        block = arr[start .. start + B - 1]
+        mask = (block == target)
+        if any(mask):
+            return start + firstSetBit(mask) // Found!
+
+    return -1 // Not found""")
+def block_linear_search(arr, target, trace=None, block=VISUAL_BLOCK):
+    """Block Linear Search: vectorized blocks, animated one block per frame"""
+    n = len(arr)
+    if trace is None:
+        index = scan(arr, target)
+        return index, index + 1 if index >= 0 else n
+
+    comparisons = 0
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        # The whole block lights up in a single frame
+        for i in range(start, end):
+            trace.add(i, CURRENT, comparisons, 5)
+        trace.delays[-1] = 800
+
+        hit = -1
+        for i in range(start, end):
+            if arr[i] == target:
+                hit = i
+                break
+
+        if hit >= 0:
+            # Counted like a scalar scan: everything up to the first match
+            comparisons += hit - start + 1
+            for i in range(start, end):
+                if i != hit:
+                    trace.add(i, VISITED if i < hit else DEFAULT, comparisons, 6)
+            trace.add(hit, FOUND, comparisons, 7)
+            return hit, comparisons
+
+        comparisons += end - start
+        for i in range(start, end):
+            trace.add(i, VISITED, comparisons, 6)
+        trace.delays[-1] = 300
+
+    trace.add(-1, DEFAULT, comparisons, 9, 500)
+    return -1, comparisons
+
+
+@register("Interpolation Search", """function interpolationSearch(arr, target):
+    low = 0
+    high = arr.length - 1
+
+    while low <= high and arr[low] <= target <= arr[high]:
+        pos = low + (target - arr[low]) * (high - low)
+                  / (arr[high] - arr[low])
+
+        if arr[pos] == target:
+            return pos // Found!
+
+        else if arr[pos] < target:
+            low = pos + 1 // Search right
+
+        else:
+            high = pos - 1 // Search left
+
+    return -1 // Not found""")
+def interpolation_search(arr, target, trace=None):
+    """Interpolation Search: probe where the target should be if keys were uniform"""
+    low = 0
+    high = len(arr) - 1
+    comparisons = 0
+
+    while low <= high:
+        # int() keeps the position arithmetic exact for numpy scalars
+        low_value = int(arr[low])
+        high_value = int(arr[high])
+        if not low_value <= target <= high_value:
+            break
+        if high_value == low_value:
+            pos = low
+        else:
+            pos = low + (target - low_value) * (high - low) // (high_value - low_value)
+        comparisons += 1
+        value = arr[pos]
+
+        if trace is not None:
+            trace.add(pos, CURRENT, comparisons, 9, 800)
+
+        if value == target:
+            if trace is not None:
+                trace.add(pos, FOUND, comparisons, 10)
+            return pos, comparisons
+        elif value < target:
+            if trace is not None:
+                trace.add(pos, VISITED, comparisons, 13, 400)
+            low = pos + 1
+        else:
+            if trace is not None:
+                trace.add(pos, VISITED, comparisons, 16, 400)
+            high = pos - 1
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 18, 500)
+    return -1, comparisons
+
+
+@register("Exponential Search", """function exponentialSearch(arr, target):
+    if arr[0] == target:
+        return 0 // Found!
+
+    bound = 1
+    while bound < arr.length and arr[bound] < target:
+        bound = bound * 2 // Gallop right
+
+    left = bound / 2 + 1
+    right = min(bound, arr.length - 1)
+    while left <= right:
+        mid = floor((left + right) / 2)
+        if arr[mid] == target:
+            return mid // Found!
+        else if arr[mid] < target:
+            left = mid + 1 // Search right
+        else:
+            right = mid - 1 // Search left
+
+    return -1 // Not found""")
+def exponential_search(arr, target, trace=None):
+    """Exponential (galloping) Search: double a bound, then binary search behind it"""
+    n = len(arr)
+    comparisons = 0
+    if not n:
+        if trace is not None:
+            trace.add(-1, DEFAULT, comparisons, 20, 500)
+        return -1, comparisons
+
+    comparisons += 1
+    if trace is not None:
+        trace.add(0, CURRENT, comparisons, 2, 800)
+    if arr[0] == target:
+        if trace is not None:
+            trace.add(0, FOUND, comparisons, 3)
+        return 0, comparisons
+    if trace is not None:
+        trace.add(0, VISITED, comparisons, 2, 300)
+
+    bound = 1
+    while bound < n:
+        comparisons += 1
+        if trace is not None:
+            trace.add(bound, CURRENT, comparisons, 6, 800)
+        if not arr[bound] < target:
+            break
+        if trace is not None:
+            trace.add(bound, VISITED, comparisons, 7, 300)
+        bound *= 2
+
+    left = bound // 2 + 1
+    right = min(bound, n - 1)
+    while left <= right:
+        mid = (left + right) // 2
+        comparisons += 1
+        value = arr[mid]
+
+        if trace is not None:
+            trace.add(mid, CURRENT, comparisons, 13, 800)
+
+        if value == target:
+            if trace is not None:
+                trace.add(mid, FOUND, comparisons, 14)
+            return mid, comparisons
+        elif value < target:
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 16, 400)
+            left = mid + 1
+        else:
+            if trace is not None:
+                trace.add(mid, VISITED, comparisons, 18, 400)
+            right = mid - 1
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 20, 500)
+    return -1, comparisons
+
+
+@register("Jump Search", """function jumpSearch(arr, target):
+    step = floor(sqrt(arr.length))
+    prev = 0
+
+    while prev < arr.length and arr[min(prev + step, arr.length) - 1] < target:
+        prev = prev + step // Jump ahead
+
+    for i = prev to min(prev + step, arr.length) - 1:
+        if arr[i] == target:
+            return i // Found!
+        if arr[i] > target:
+            break // Overshot
+
+    return -1 // Not found""")
+def jump_search(arr, target, trace=None):
+    """Jump Search: skip ahead in sqrt(n) blocks, then scan the block linearly"""
+    n = len(arr)
+    step = math.isqrt(n)
+    prev = 0
+    comparisons = 0
+
+    while prev < n:
+        block_end = min(prev + step, n) - 1
+        comparisons += 1
+        if trace is not None:
+            trace.add(block_end, CURRENT, comparisons, 5, 800)
+        if not arr[block_end] < target:
+            break
+        if trace is not None:
+            trace.add(block_end, VISITED, comparisons, 6, 300)
+        prev += step
+
+    for i in range(prev, min(prev + step, n)):
+        comparisons += 1
+        value = arr[i]
+
+        if trace is not None:
+            trace.add(i, CURRENT, comparisons, 9, 800)
+
+        if value == target:
+            if trace is not None:
+                trace.add(i, FOUND, comparisons, 10)
+            return i, comparisons
+        if trace is not None:
+            trace.add(i, VISITED, comparisons, 11, 300)
+        if value > target:
+            break
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 14, 500)
+    return -1, comparisons
+
+
+@register("Ternary Search", """function ternarySearch(arr, target):
+    left = 0
+    right = arr.length - 1
+
+    while left <= right:
+        third = floor((right - left) / 3)
+        m1 = left + third
+        m2 = right - third
+
+        if arr[m1] == target:
+            return m1 // Found!
+        if arr[m2] == target:
+            return m2 // Found!
+
+        if target < arr[m1]:
+            right = m1 - 1 // Search first third
+        else if target > arr[m2]:
+            left = m2 + 1 // Search last third
+        else:
+            left = m1 + 1 // Search middle third
+            right = m2 - 1
+
+    return -1 // Not found""")
+def ternary_search(arr, target, trace=None):
+    """Ternary Search: split the interval with two probes per round"""
+    left = 0
+    right = len(arr) - 1
+    comparisons = 0
+
+    while left <= right:
+        third = (right - left) // 3
+        m1 = left + third
+        m2 = right - third
+
+        comparisons += 1
+        v1 = arr[m1]
+        if trace is not None:
+            trace.add(m1, CURRENT, comparisons, 10, 800)
+        if v1 == target:
+            if trace is not None:
+                trace.add(m1, FOUND, comparisons, 11)
+            return m1, comparisons
+
+        comparisons += 1
+        v2 = arr[m2]
+        if trace is not None:
+            trace.add(m2, CURRENT, comparisons, 12, 800)
+        if v2 == target:
+            if trace is not None:
+                trace.add(m2, FOUND, comparisons, 13)
+            return m2, comparisons
+
+        if target < v1:
+            line = 16
+            right = m1 - 1
+        elif target > v2:
+            line = 18
+            left = m2 + 1
+        else:
+            line = 20
+            left = m1 + 1
+            right = m2 - 1
+        if trace is not None:
+            trace.add(m1, VISITED, comparisons, line)
+            trace.add(m2, VISITED, comparisons, line, 400)
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 23, 500)
+    return -1, comparisons
+
+
+@register("Fibonacci Search", """function fibonacciSearch(arr, target):
+    fib2 = 0, fib1 = 1, fib = 1
+    while fib < arr.length:
+        fib2 = fib1, fib1 = fib, fib = fib1 + fib2
+
+    offset = -1
+    while fib > 1:
+        i = min(offset + fib2, arr.length - 1)
+
+        if arr[i] == target:
+            return i // Found!
+
+        else if arr[i] < target:
+            fib = fib1, fib1 = fib2, fib2 = fib - fib1
+            offset = i // Cut the front
+
+        else:
+            fib = fib2, fib1 = fib1 - fib2, fib2 = fib - fib1
+
+    if fib1 == 1 and arr[offset + 1] == target:
+        return offset + 1 // Found!
+
+    return -1 // Not found""")
+def fibonacci_search(arr, target, trace=None):
+    """Fibonacci Search: shrink the interval by Fibonacci numbers instead of halves"""
+    n = len(arr)
+    fib2, fib1 = 0, 1
+    fib = fib1 + fib2
+    while fib < n:
+        fib2, fib1 = fib1, fib
+        fib = fib1 + fib2
+
+    offset = -1
+    comparisons = 0
+    while fib > 1:
+        i = min(offset + fib2, n - 1)
+        comparisons += 1
+        value = arr[i]
+
+        if trace is not None:
+            trace.add(i, CURRENT, comparisons, 10, 800)
+
+        if value == target:
+            if trace is not None:
+                trace.add(i, FOUND, comparisons, 11)
+            return i, comparisons
+        elif value < target:
+            if trace is not None:
+                trace.add(i, VISITED, comparisons, 15, 400)
+            fib, fib1 = fib1, fib2
+            fib2 = fib - fib1
+            offset = i
+        else:
+            if trace is not None:
+                trace.add(i, VISITED, comparisons, 18, 400)
+            fib, fib1 = fib2, fib1 - fib2
+            fib2 = fib - fib1
+
+    if fib1 == 1 and offset + 1 < n:
+        comparisons += 1
+        if trace is not None:
+            trace.add(offset + 1, CURRENT, comparisons, 20, 800)
+        if arr[offset + 1] == target:
+            if trace is not None:
+                trace.add(offset + 1, FOUND, comparisons, 21)
+            return offset + 1, comparisons
+        if trace is not None:
+            trace.add(offset + 1, VISITED, comparisons, 20, 300)
+
+    if trace is not None:
+        trace.add(-1, DEFAULT, comparisons, 23, 500)
+    return -1, comparisons
+
+
+def run(algorithm, arr, target, record=True):
+    """Run a search by name; pass record=False to skip the trace entirely"""
+    try:
+        search = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}") from None
+    trace = Trace() if record else None
+    index, comparisons = search(arr, target, trace)
+    return SearchResult(index, comparisons, trace)
+
+
+class ResultCache:
+    """LRU cache of recorded runs keyed by (array version, algorithm, target)
+
+    The array version is an opaque token the caller bumps whenever the
+    searched array changes, so stale runs can never be hit. Besides the
+    entry count, the total number of trace steps held is bounded (a step
+    is ~20 bytes), and a run whose trace alone exceeds that budget is
+    never cached.
+    """
+
+    __slots__ = ('capacity', 'max_steps', 'steps', 'entries', 'hits', 'misses',
+                 'version', 'lock')
+
+    def __init__(self, capacity=256, max_steps=CACHE_MAX_STEPS):
+        self.capacity = capacity
+        self.max_steps = max_steps
+        self.steps = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self.lock = threading.Lock()
+
+    def invalidate(self, version):
+        """Forget every entry recorded for another array version"""
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.steps = 0
+                self.version = version
+
+    def lookup(self, algorithm, target):
+        """Cached SearchResult or None, counting the hit or miss"""
+        key = (self.version, algorithm, target)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return result
+
+    def store(self, version, algorithm, target, result):
+        size = len(result.trace)
+        if size > self.max_steps:
+            return
+        key = (version, algorithm, target)
+        with self.lock:
+            if version != self.version:
+                return
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.steps -= len(previous.trace)
+            self.entries[key] = result
+            self.steps += size
+            while len(self.entries) > self.capacity or self.steps > self.max_steps:
+                _, evicted = self.entries.popitem(last=False)
+                self.steps -= len(evicted.trace)
+
+    def run(self, algorithm, arr, target):
+        """Cached run(): returns (result, hit)"""
+        result = self.lookup(algorithm, target)
+        if result is not None:
+            return result, True
+        version = self.version
+        result = run(algorithm, arr, target)
+        self.store(version, algorithm, target, result)
+        return result, False
+
+
+def _binary_batch_numpy(arr, targets):
+    """Run binary search for every target in lockstep, one vector op per level"""
+    values = np.asarray(arr)
+    targets = np.asarray(targets, dtype=np.int64)
+    m = len(targets)
+    left = np.zeros(m, dtype=np.int64)
+    right = np.full(m, len(values) - 1, dtype=np.int64)
+    indices = np.full(m, -1, dtype=np.int64)
+    comparisons = np.zeros(m, dtype=np.int64)
+
+    # Positions (into targets) of queries that are still searching
+    active = np.arange(m)
+    while active.size:
+        live = left[active] <= right[active]
+        active = active[live]
+        if not active.size:
+            break
+        mid = (left[active] + right[active]) // 2
+        comparisons[active] += 1
+        probe = values[mid]
+        wanted = targets[active]
+
+        hit = probe == wanted
+        indices[active[hit]] = mid[hit]
+        lower = probe < wanted
+        left[active[lower]] = mid[lower] + 1
+        higher = ~(hit | lower)
+        right[active[higher]] = mid[higher] - 1
+        active = active[~hit]
+
+    return BatchResult(targets, indices, comparisons)
+
+
+def _linear_index_numpy(arr):
+    """First-occurrence lookup via one sort of the array"""
+    values = np.asarray(arr)
+    n = len(values)
+    unique, first = np.unique(values, return_index=True)
+
+    def evaluate(targets):
+        targets = np.asarray(targets, dtype=np.int64)
+        if not n:
+            zeros = np.zeros(len(targets), dtype=np.int64)
+            return BatchResult(targets, zeros - 1, zeros)
+        pos = np.minimum(np.searchsorted(unique, targets), len(unique) - 1)
+        hit = unique[pos] == targets
+        indices = np.where(hit, first[pos], -1)
+        # Linear search compares index + 1 elements on a hit and all n on a miss
+        comparisons = np.where(hit, indices + 1, n)
+        return BatchResult(targets, indices, comparisons)
+    return evaluate
+
+
+def _linear_index_python(arr):
+    """First-occurrence lookup via one pass over the array"""
+    first = {}
+    for i, value in enumerate(arr):
+        first.setdefault(value, i)
+    n = len(arr)
+
+    def evaluate(targets):
+        indices = array('q')
+        comparisons = array('q')
+        for target in targets:
+            i = first.get(target, -1)
+            indices.append(i)
+            comparisons.append(i + 1 if i >= 0 else n)
+        return BatchResult(array('q', targets), indices, comparisons)
+    return evaluate
+
+
+# Vectorized evaluators; algorithms without one are run target by target
+BATCH_NUMPY = {
+    "Binary Search": _binary_batch_numpy
+}
+
+BATCH_PYTHON = {}
+
+# Evaluators that first index the whole array: name -> build(arr), which
+# returns evaluate(targets). batcher() builds the index once per array
+INDEX_NUMPY = {
+    "Linear Search": _linear_index_numpy,
+    "Block Linear Search": _linear_index_numpy
+}
+
+INDEX_PYTHON = {
+    "Linear Search": _linear_index_python,
+    "Block Linear Search": _linear_index_python
+}
+
+
+def batcher(algorithm, arr):
+    """batch() bound to one array, for evaluating many lists of targets
+    (e.g. a stream in chunks): any index over the array is built once"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if np is not None and algorithm in INDEX_NUMPY:
+        return INDEX_NUMPY[algorithm](arr)
+    if np is not None and algorithm in BATCH_NUMPY:
+        return lambda targets: BATCH_NUMPY[algorithm](arr, targets)
+    if algorithm in INDEX_PYTHON:
+        return INDEX_PYTHON[algorithm](arr)
+    if algorithm in BATCH_PYTHON:
+        return lambda targets: BATCH_PYTHON[algorithm](arr, targets)
+    return lambda targets: _batch_each(ALGORITHMS[algorithm], arr, targets)
+
+
+def _batch_each(search, arr, targets):
+    targets = array('q', targets)
+    indices = array('q')
+    comparisons = array('q')
+    for target in targets:
+        index, count = search(arr, target)
+        indices.append(index)
+        comparisons.append(count)
+    return BatchResult(targets, indices, comparisons)
+
+
+def batch(algorithm, arr, targets):
+    """Search many targets without tracing; returns index and comparisons per target"""
+    return batcher(algorithm, arr)(targets)
+
+
+# Range, precomputed-layout and multi-process searches register themselves on import
+import ranges  # noqa: E402,F401
+import layouts  # noqa: E402,F401
+import parallel  # noqa: E402,F401
@@ -0,0 +1,227 @@
+"""
+Trace Files
+Saves recorded runs as compact binary files: a JSON header (algorithm,
+target, result and a fingerprint of the searched array) followed by
+fixed-width little-endian step columns. Loading memory-maps the file, so
+a replay pages steps in as the player reaches them instead of reading
+the whole trace up front.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only used to rebuild missing values faster
+    np = None
+
+import datasets
+from search_engine import Trace
+
+MAGIC = b'SVTRACE1'
+FORMAT_VERSION = 1
+
+# Arrays up to this many values are embedded so a replay draws the real
+# bars; larger ones are rebuilt from the values the steps touched
+EMBED_LIMIT = 1 << 20
+
+FINGERPRINT_CHUNK = 1 << 20
+
+# Step columns in file order; the 8-byte ones come first to keep alignment
+COLUMNS = (
+    ('starts', 'q'),
+    ('indices', 'q'),
+    ('comparisons', 'q'),
+    ('values', 'q'),
+    ('delays', 'H'),
+    ('states', 'B'),
+    ('lines', 'B')
+)
+
+_HEADER_SIZE = struct.Struct('<I')
+
+
+def fingerprint(values):
+    """Content hash of an integer array (as little-endian int64), hex"""
+    digest = hashlib.blake2b(digest_size=16)
+    n = len(values)
+    digest.update(n.to_bytes(8, 'little'))
+    for lo in range(0, n, FINGERPRINT_CHUNK):
+        hi = min(n, lo + FINGERPRINT_CHUNK)
+        if np is not None and isinstance(values, np.ndarray):
+            digest.update(np.ascontiguousarray(values[lo:hi], dtype='<i8').tobytes())
+            continue
+        chunk = array('q', values[lo:hi])
+        if sys.byteorder != 'little':
+            chunk.byteswap()
+        digest.update(chunk.tobytes())
+    return digest.hexdigest()
+
+
+def _pad(size):
+    return -size % 8
+
+
+def _write_column(f, data, code):
+    if not isinstance(data, array) or data.typecode != code:
+        data = array(code, data)
+    if sys.byteorder != 'little' and data.itemsize > 1:
+        data = array(code, data)
+        data.byteswap()
+    f.write(data)
+    f.write(bytes(_pad(len(data) * data.itemsize)))
+
+
+def save(path, result, values, algorithm, target, embed=None):
+    """Write a SearchResult recorded on values to path"""
+    trace = result.trace
+    if embed is None:
+        embed = len(values) <= EMBED_LIMIT
+    starts = array('q')
+    elapsed = 0
+    for delay in trace.delays:
+        starts.append(elapsed)
+        elapsed += delay
+    header = {
+        'format': FORMAT_VERSION,
+        'algorithm': algorithm,
+        'target': int(target),
+        'index': int(result.index),
+        'comparisons': int(result.comparisons),
+        'steps': len(trace),
+        'size': len(values),
+        'fingerprint': fingerprint(values),
+        'embedded': bool(embed),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+    columns = {
+        'starts': starts,
+        'indices': trace.indices,
+        'comparisons': trace.comparisons,
+        # The value probed by each step, so bars can be redrawn without the data
+        'values': array('q', (int(values[i]) if i >= 0 else 0 for i in trace.indices)),
+        'delays': trace.delays,
+        'states': trace.states,
+        'lines': trace.lines
+    }
+    encoded = json.dumps(header).encode()
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_SIZE.pack(len(encoded)))
+        f.write(encoded)
+        f.write(bytes(_pad(len(MAGIC) + _HEADER_SIZE.size + len(encoded))))
+        for name, code in COLUMNS:
+            _write_column(f, columns[name], code)
+        if embed:
+            _write_column(f, datasets.as_array(values), 'q')
+    return header
+
+
+class TraceFile:
+    """A saved run, memory-mapped: `trace` behaves like a recorded Trace"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a trace file: {path}")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self.map)
+        offset = len(MAGIC)
+        (size,) = _HEADER_SIZE.unpack_from(buffer, offset)
+        offset += _HEADER_SIZE.size
+        self.header = json.loads(bytes(buffer[offset:offset + size]))
+        if self.header.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trace format: {self.header.get('format')}")
+        offset += size + _pad(offset + size)
+
+        steps = self.header['steps']
+        self.columns = {}
+        for name, code in COLUMNS:
+            self.columns[name], offset = self._column(buffer, offset, code, steps)
+        self.embedded = None
+        if self.header['embedded']:
+            self.embedded, offset = self._column(buffer, offset, 'q', self.header['size'])
+
+        self.trace = Trace()
+        for name in ('indices', 'states', 'comparisons', 'lines', 'delays'):
+            setattr(self.trace, name, self.columns[name])
+
+    def _column(self, buffer, offset, code, count):
+        """Zero-copy view of one column; a byteswapped copy on big-endian hosts"""
+        nbytes = count * array(code).itemsize
+        if nbytes == 0:
+            return array(code), offset
+        if offset + nbytes > len(buffer):
+            raise ValueError("Truncated trace file")
+        view = buffer[offset:offset + nbytes].cast(code)
+        if sys.byteorder != 'little' and view.itemsize > 1:
+            view = array(code, view)
+            view.byteswap()
+        return view, offset + nbytes + _pad(nbytes)
+
+    @property
+    def starts(self):
+        """ms into the run (at 1.0x) when each step is shown"""
+        return self.columns['starts']
+
+    def matches(self, values):
+        """Whether values is the array this run was recorded on"""
+        return len(values) == self.header['size'] and fingerprint(values) == self.header['fingerprint']
+
+    def values(self):
+        """The searched array: embedded, or rebuilt from the probed values"""
+        if self.embedded is not None:
+            return self.embedded
+        return rebuild(self.header['size'], self.columns['indices'], self.columns['values'])
+
+    def close(self):
+        self.trace = None
+        self.columns.clear()
+        self.embedded = None
+        try:
+            self.map.close()
+        except BufferError:
+            # A player still holds the columns; the map goes with the last view
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(path):
+    """Open a saved run for replay"""
+    return TraceFile(path)
+
+
+def rebuild(n, indices, values):
+    """Stand-in for an array that was not embedded: the probed values,
+    linearly interpolated in between (exact at every probe)"""
+    known = {}
+    for index, value in zip(indices, values):
+        if index >= 0:
+            known[index] = value
+    if not known:
+        return array('q', bytes(8 * n))
+    xs = sorted(known)
+    ys = [known[x] for x in xs]
+    if np is not None:
+        data = array('q')
+        data.frombytes(np.rint(np.interp(np.arange(n), xs, ys)).astype(np.int64).tobytes())
+        return data
+    data = array('q', bytes(8 * n))
+    for i in range(0, xs[0]):
+        data[i] = ys[0]
+    for (x0, y0), (x1, y1) in zip(zip(xs, ys), zip(xs[1:], ys[1:])):
+        for i in range(x0, x1):
+            data[i] = y0 + (y1 - y0) * (i - x0) // (x1 - x0)
+    for i in range(xs[-1], n):
+        data[i] = ys[-1]
+    return data